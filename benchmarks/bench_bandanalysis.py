@@ -0,0 +1,48 @@
+""" Benchmark for weighted octave-band analysis.
+
+    Times BandAnalyzer.analyze on a 10 s capture with increasing
+    numbers of channels, at octave and third-octave resolution.
+
+    Run from the repository root:
+        python -m benchmarks.bench_bandanalysis
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import timeit
+
+# Import custom modules
+from models import bandanalysis
+
+
+#########
+# Funcs #
+#########
+def main():
+    fs = 48000
+    dur = 10
+    repeats = 3
+    rng = np.random.default_rng(0)
+
+    print(f"{'chans':>6} {'bands':>6} {'weight':>7} {'time (ms)':>10}")
+    for num_channels in [1, 8, 32, 64]:
+        capture = rng.standard_normal(
+            (dur * fs, num_channels), dtype=np.float32)
+        for fraction in [1, 3]:
+            analyzer = bandanalysis.BandAnalyzer(fs, fraction=fraction,
+                                                 weighting='A')
+            analyzer.analyze(capture[:fs]) # Warm up
+            elapsed = min(timeit.repeat(
+                lambda: analyzer.analyze(capture), number=1, 
+                repeat=repeats))
+            print(f"{num_channels:>6} {len(analyzer.centers):>6} "
+                  f"{'A':>7} {elapsed*1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
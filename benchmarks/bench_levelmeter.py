@@ -0,0 +1,57 @@
+""" Benchmark for the streaming level meter.
+
+    Feeds blocks of noise through LevelMeter.process at 96 kHz and
+    reports the real-time factor (audio time / processing time).
+    Anything above 1x keeps up with the input stream; the margin
+    is what remains for the audio driver and GUI.
+
+    Run from the repository root:
+        python -m benchmarks.bench_levelmeter
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import time
+
+# Import custom modules
+from models import levelmeter
+
+
+#########
+# Funcs #
+#########
+def run(num_channels, fs, blocksize, dur):
+    """ Return the real-time factor for DUR seconds of input. """
+    meter = levelmeter.LevelMeter(num_channels=num_channels, fs=fs,
+                                  max_blocksize=blocksize)
+    rng = np.random.default_rng(0)
+    block = rng.standard_normal((blocksize, num_channels), dtype=np.float32)
+    num_blocks = int(dur * fs / blocksize)
+
+    start = time.perf_counter()
+    for _ in range(num_blocks):
+        meter.process(block)
+    elapsed = time.perf_counter() - start
+    return (num_blocks * blocksize / fs) / elapsed, elapsed / num_blocks
+
+
+def main():
+    fs = 96000
+    dur = 10
+
+    print(f"{'chans':>6} {'block':>6} {'per block (us)':>15} "
+          f"{'realtime':>9}")
+    for num_channels in [1, 8, 32, 64]:
+        for blocksize in [256, 1024]:
+            factor, per_block = run(num_channels, fs, blocksize, dur)
+            print(f"{num_channels:>6} {blocksize:>6} "
+                  f"{per_block*1e6:>15.1f} {factor:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
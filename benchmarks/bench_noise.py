@@ -0,0 +1,62 @@
+""" Benchmark for white Gaussian noise generation.
+
+    Compares the original list comprehension approach (one 
+    random.gauss call per sample) against NoiseGenerator.
+
+    Run from the repository root:
+        python -m benchmarks.bench_noise
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import random
+import timeit
+
+# Import custom modules
+from models import noisemodel
+
+
+#########
+# Funcs #
+#########
+def legacy_wgn(dur, fs):
+    """ Original Application.wgn implementation.
+    """
+    r = int(dur * fs)
+    random.seed(4)
+    wgn = [random.gauss(0.0, 1.0) for i in range(r)]
+    wgn -= np.mean(wgn) # Remove DC offset
+    wgn = wgn / np.max(abs(wgn)) # Normalize
+    return wgn
+
+
+def main():
+    fs = 48000
+    repeats = 3
+    gen = noisemodel.NoiseGenerator(seed=4)
+
+    print(f"{'dur (s)':>8} {'chans':>6} {'legacy (ms)':>12} "
+          f"{'numpy (ms)':>11} {'speedup':>8}")
+    for dur in [3, 30, 120]:
+        legacy = min(timeit.repeat(
+            lambda: legacy_wgn(dur, fs), number=1, repeat=repeats))
+        new = min(timeit.repeat(
+            lambda: gen.wgn(dur, fs), number=1, repeat=repeats))
+        print(f"{dur:>8} {1:>6} {legacy*1000:>12.1f} "
+              f"{new*1000:>11.1f} {legacy/new:>7.0f}x")
+
+    # Multichannel output has no legacy equivalent
+    for chans in [8, 32]:
+        new = min(timeit.repeat(
+            lambda: gen.wgn(3, fs, num_channels=chans), 
+            number=1, repeat=repeats))
+        print(f"{3:>8} {chans:>6} {'-':>12} {new*1000:>11.1f} {'-':>8}")
+
+
+if __name__ == '__main__':
+    main()
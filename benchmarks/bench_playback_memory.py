@@ -0,0 +1,97 @@
+""" Benchmark for peak memory used to prepare audio for playback.
+
+    Compares the original Audio.play preparation (copy, astype and 
+    level scaling) against the current Audio.play with and without
+    a stream engine. Memory is measured with tracemalloc, which 
+    tracks numpy array allocations.
+
+    Run from the repository root:
+        python -m benchmarks.bench_playback_memory
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import contextlib
+import io
+import tracemalloc
+from unittest import mock
+
+# Import custom modules
+from models import audiomodel
+from models import streammodel
+
+
+#########
+# Funcs #
+#########
+def legacy_prep(signal, level, num_outputs):
+    """ Original Audio.play preparation steps. """
+    temp = signal.copy()
+    temp = temp.astype(np.float32)
+    temp = temp * 10**(level/20)
+    np.max(np.abs(temp))
+    temp = temp[:, 0:num_outputs]
+    return temp
+
+
+def measure(func):
+    """ Return peak traced memory (MB) while calling FUNC. """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024**2
+
+
+def main():
+    fs = 48000
+    dur = 60
+    num_channels = 16
+    rng = np.random.default_rng(0)
+    signal = rng.uniform(-0.5, 0.5, (dur * fs, num_channels))
+    signal32 = signal.astype(np.float32)
+    engine = streammodel.StreamEngine(backend='null', 
+        null_outputs=num_channels)
+    routing = list(range(1, num_channels + 1))
+
+    def new_sd_play(sig):
+        a = audiomodel.Audio(sig, sampling_rate=fs)
+        with mock.patch('models.audiomodel.sd.query_devices',
+                return_value={'name': 'bench', 
+                'max_output_channels': num_channels}):
+            a.play(level=-20, device_id=0, routing=routing)
+
+    def new_engine(sig):
+        a = audiomodel.Audio(sig, sampling_rate=fs)
+        a.play(level=-20, device_id=0, routing=routing, engine=engine)
+        engine.stop()
+
+    print(f"Signal: {dur} s, {num_channels} channels, " +
+          f"{signal.nbytes / 1024**2:.0f} MB (float64), " +
+          f"{signal32.nbytes / 1024**2:.0f} MB (float32)")
+    with mock.patch('models.audiomodel.sd.play'):
+        results = [
+            ('legacy, float64', 
+                measure(lambda: legacy_prep(signal, -20, num_channels))),
+            ('sd.play, float64', measure(lambda: new_sd_play(signal))),
+            ('engine, float64', measure(lambda: new_engine(signal))),
+            ('legacy, float32', 
+                measure(lambda: legacy_prep(signal32, -20, num_channels))),
+            ('sd.play, float32', measure(lambda: new_sd_play(signal32))),
+            ('engine, float32', measure(lambda: new_engine(signal32))),
+        ]
+    engine.close()
+
+    for name, peak in results:
+        print(f"{name:>18}: peak {peak:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
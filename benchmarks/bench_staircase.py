@@ -0,0 +1,108 @@
+""" Benchmark for long staircase runs.
+
+    Runs staircases of increasing length with a simulated listener
+    and reports the time per trial. With reversal counts kept
+    incrementally, time per trial stays flat as the number of
+    trials grows. Console output from the staircase is discarded.
+
+    Also compares simulating many listeners with one Staircase each
+    against a single BatchStaircase.
+
+    Run from the repository root:
+        python -m benchmarks.bench_staircase
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import contextlib
+import io
+import time
+
+# Import custom modules
+from models import staircase
+from models import staircasesim
+
+
+#########
+# Funcs #
+#########
+def run(num_trials, seed=0):
+    """ Return the seconds taken to present NUM_TRIALS trials. """
+    stair = staircase.Staircase(
+        start_val=60,
+        step_sizes=[8, 4, 2],
+        nUp=1,
+        nDown=2,
+        nTrials=num_trials,
+        nReversals=num_trials,
+        rapid_descend=True,
+        min_val=0,
+        max_val=100
+    )
+    rng = np.random.default_rng(seed)
+    # Listener with a 50 dB threshold
+    draws = rng.random(num_trials)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        for ii in range(num_trials):
+            p = 1 / (1 + np.exp(-(stair.current_level - 50) / 2))
+            stair.add_response(1 if draws[ii] < p else -1)
+            # Keep the discarded output from growing without bound
+            out.seek(0)
+            out.truncate()
+    return time.perf_counter() - start
+
+
+PARAMS = dict(start_val=80, step_sizes=[8, 4, 2], nUp=1, nDown=2,
+              nTrials=40, nReversals=8, rapid_descend=True, min_val=0,
+              max_val=100)
+
+
+def run_listeners(num_listeners, seed=0):
+    """ Return the seconds taken to simulate NUM_LISTENERS with one
+        Staircase each.
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(num_listeners):
+            stair = staircase.Staircase(**PARAMS)
+            while stair.status:
+                p = staircasesim.logistic(stair.current_level, 50)
+                stair.add_response(1 if rng.random() < p else -1)
+    return time.perf_counter() - start
+
+
+def run_batch(num_listeners, seed=0):
+    """ Return the seconds taken to simulate NUM_LISTENERS with a
+        BatchStaircase.
+    """
+    start = time.perf_counter()
+    batch = staircasesim.BatchStaircase(num_listeners, record=False, 
+                                        **PARAMS)
+    batch.simulate(50, seed=seed)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'trials':>8} {'total (s)':>10} {'per trial (us)':>15}")
+    for num_trials in [1000, 10000, 100000]:
+        elapsed = run(num_trials)
+        print(f"{num_trials:>8} {elapsed:>10.2f} "
+              f"{elapsed / num_trials * 1e6:>15.1f}")
+
+    print(f"\n{'listeners':>9} {'scalar (s)':>11} {'batch (s)':>10}")
+    for num_listeners in [100, 1000]:
+        print(f"{num_listeners:>9} {run_listeners(num_listeners):>11.2f} "
+              f"{run_batch(num_listeners):>10.3f}")
+    print(f"{10000:>9} {'':>11} {run_batch(10000):>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+""" Benchmark for Speaker Balancer cold-start time.
+
+    Measures module import time with "python -X importtime" and, if a
+    display is available, the time until the main window is drawn.
+    Each measurement runs in a fresh interpreter.
+
+    Run from the repository root:
+        python -m benchmarks.bench_startup
+        python -m benchmarks.bench_startup --window
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+#############
+# Constants #
+#############
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that should not load before the window appears
+DEFERRED = ['matplotlib', 'pandas', 'markdown', 'webbrowser', 'asyncio']
+
+WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import controller
+app = controller.Application()
+app.update()
+print(time.perf_counter() - start)
+app._quit()
+"""
+
+
+#########
+# Funcs #
+#########
+def import_times(module):
+    """ Return {module: cumulative import time (s)} for a fresh 
+        import of MODULE.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def time_to_window():
+    """ Return seconds from interpreter start of the import to the
+        first drawn main window.
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', WINDOW_SCRIPT],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--module', default='controller')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--window', action='store_true',
+                        help="Also measure time to window (needs a display)")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [run[args.module] for run in runs]
+    print(f"import {args.module}: median {statistics.median(totals)*1000:.1f}"
+          f" ms over {args.runs} runs")
+
+    last = runs[-1]
+    print(f"\nSlowest top-level imports (last run):")
+    top_level = {name: t for name, t in last.items() if '.' not in name}
+    for name, t in sorted(top_level.items(), key=lambda x: -x[1])[:args.top]:
+        print(f"  {name:<24} {t*1000:8.1f} ms")
+
+    loaded = [name for name in DEFERRED if name in last]
+    print(f"\nDeferred modules loaded at import: {loaded or 'none'}")
+
+    if args.window:
+        windows = [time_to_window() for _ in range(args.runs)]
+        print(f"\ntime to window: median "
+              f"{statistics.median(windows)*1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+""" Benchmark for start-to-sound latency.
+
+    Compares opening a new stream on every press (sd.play) against
+    presenting through the persistent StreamEngine. Use the null 
+    backend to measure engine overhead without audio hardware.
+
+    Run from the repository root:
+        python -m benchmarks.bench_stream_latency --backend null
+        python -m benchmarks.bench_stream_latency --device 2
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import argparse
+import time
+
+# Import custom modules
+from models import noisemodel
+from models import streammodel
+
+
+#########
+# Funcs #
+#########
+def bench_engine(backend, device, fs, sig, presses):
+    """ Return start-to-sound latency of each press (s). """
+    engine = streammodel.StreamEngine(backend=backend, null_outputs=2)
+    # Exclude the one-time stream open from the per-press latencies
+    engine.open(device, fs)
+    for _ in range(presses):
+        engine.play(sig, fs, device, [1], gain=0.03)
+        engine.wait()
+    engine.close()
+    return np.array(engine.latencies)
+
+
+def bench_sd_play(device, fs, sig, presses):
+    """ Return time to open a new stream on each press (s). This is
+        a lower bound on the sd.play start-to-sound latency.
+    """
+    import sounddevice as sd
+    sd.default.device = device
+    sd.default.samplerate = fs
+    times = []
+    for _ in range(presses):
+        start = time.perf_counter()
+        sd.play(sig * 0.03, mapping=[1])
+        times.append(time.perf_counter() - start)
+        sd.wait()
+    return np.array(times)
+
+
+def report(name, values):
+    print(f"{name:>10}: median {np.median(values)*1000:7.2f} ms, "
+          f"max {np.max(values)*1000:7.2f} ms (n={len(values)})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backend', default='sounddevice',
+                        choices=['sounddevice', 'null'])
+    parser.add_argument('--device', type=int, default=None)
+    parser.add_argument('--presses', type=int, default=20)
+    args = parser.parse_args()
+
+    fs = 48000
+    sig = noisemodel.NoiseGenerator().wgn(dur=0.1, fs=fs)
+
+    report('engine', bench_engine(
+        args.backend, args.device, fs, sig, args.presses))
+    if args.backend == 'sounddevice':
+        report('sd.play', bench_sd_play(args.device, fs, sig, args.presses))
+
+
+if __name__ == '__main__':
+    main()
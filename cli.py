@@ -0,0 +1,330 @@
+""" Headless command-line entry point for balancing speakers.
+
+    Runs the same models as the GUI (session parameters, noise
+    generation, playback, offset calculation and CSV export)
+    without Tk, so balancing can be scripted across booths. Session
+    parameters are read from the GUI's config.json; command-line
+    options override them for this run only, unless --save-config
+    is given.
+
+    Examples:
+        python cli.py balance --device 5 --speakers 8 -o booth1.csv
+        python cli.py balance --parallel
+        python cli.py manual --level -30
+        python cli.py sequence --gap 0.5
+        python cli.py config
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import argparse
+import sys
+
+# Import custom modules
+from models import sessionmodel
+
+
+#############
+# Constants #
+#############
+# Must match controller.Application so both use the same config.json
+APP_INFO = {
+    'name': 'Speaker Balancer',
+    'version': '2.0.0',
+    'last_edited': 'January 17, 2024'
+}
+
+FS = 48000
+
+# Command-line option: session parameter
+OVERRIDES = {
+    'device': 'audio_device',
+    'speakers': 'num_speakers',
+    'level': 'level',
+    'duration': 'duration',
+    'slm_offset': 'slm_offset',
+    'mic_channel': 'mic_channel',
+    'offsets_file': 'offsets_file',
+    'weighting': 'weighting',
+    'band_fraction': 'band_fraction',
+    'gap': 'test_gap',
+    'ramp': 'test_ramp',
+}
+
+
+#########
+# Funcs #
+#########
+def add_common_options(parser, default=None):
+    """ Add the options shared by every mode to PARSER. They are
+        added to the main parser and to each mode, so they can go
+        before or after the mode. Modes use a DEFAULT of 
+        argparse.SUPPRESS so they do not hide values given before 
+        the mode.
+    """
+    flag = False if default is None else default
+    parser.add_argument('--device', type=int, default=default,
+                        help="audio device ID")
+    parser.add_argument('--speakers', type=int, default=default,
+                        help="number of speakers")
+    parser.add_argument('--level', type=float, default=default,
+                        help="presentation level (dB FS)")
+    parser.add_argument('--duration', type=float, default=default,
+                        help="noise duration per speaker (s)")
+    parser.add_argument('--slm-offset', type=float, default=default,
+                        help="dB SPL of a 0 dB FS recording")
+    parser.add_argument('--offsets-file', default=default,
+                        help="saved offsets to apply during playback")
+    parser.add_argument('--no-offsets', action='store_true', default=flag,
+                        help="ignore any saved offsets file")
+    parser.add_argument('-o', '--output', default=default,
+                        help="CSV file for the offsets (default: "
+                        "speaker_offsets_<date>.csv)")
+    parser.add_argument('--save-config', action='store_true', default=flag,
+                        help="save the options to config.json")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="Balance speaker levels without the GUI."
+    )
+    add_common_options(parser)
+
+    modes = parser.add_subparsers(dest='mode', required=True)
+
+    balance = modes.add_parser('balance',
+        help="measure every speaker with the microphone")
+    balance.add_argument('--mic-channel', type=int,
+                         help="microphone input channel")
+    balance.add_argument('--parallel', action='store_true',
+                         help="measure all speakers at once")
+    balance.add_argument('--weighting', choices=['A', 'C', 'Z'])
+    balance.add_argument('--band-fraction', type=int, choices=[1, 3],
+                         help="bands per octave in the band offset "
+                         "report (not saved)")
+
+    manual = modes.add_parser('manual',
+        help="play to each speaker and type the SLM reading")
+
+    sequence = modes.add_parser('sequence',
+        help="play to every speaker back to back")
+    sequence.add_argument('--gap', type=float,
+                          help="silence between speakers (s)")
+    sequence.add_argument('--ramp', type=float,
+                          help="onset/offset ramp (s)")
+
+    config = modes.add_parser('config', help="print the session parameters")
+
+    for mode in [balance, manual, sequence, config]:
+        add_common_options(mode, default=argparse.SUPPRESS)
+    return parser
+
+
+def load_sessionpars(args):
+    """ Return (model, SessionParams) with command-line overrides
+        applied.
+    """
+    model = sessionmodel.SessionParsModel(APP_INFO)
+    for option, key in OVERRIDES.items():
+        value = getattr(args, option, None)
+        if value is not None:
+            vartype = sessionmodel.TYPES[model.fields[key]['type']]
+            model.set(key, vartype(value))
+    if args.no_offsets:
+        model.set('offsets_file', '')
+    if args.save_config:
+        model.save()
+    return model, model.to_params()
+
+
+def load_channel_gains(pars):
+    """ Return the saved offsets as channel gains, or None. """
+    if not pars.offsets_file:
+        return None
+    from models import offsetmodel
+    print(f"cli: Applying offsets from {pars.offsets_file}")
+    return offsetmodel.OffsetGains().load(pars.offsets_file)
+
+
+def make_noise(pars):
+    from models import noisemodel
+    return noisemodel.NoiseGenerator(seed=4).wgn(dur=pars.duration, fs=FS)
+
+
+def run_balance(args, pars, speakers, gains=None):
+    """ Measure every speaker with the microphone. """
+    from models import autobalance
+    from models import bandanalysis
+
+    balancer = autobalance.AutoBalancer(
+        backend=autobalance.SoundDeviceBackend(pars.audio_device),
+        speakers=speakers,
+        slm_offset=pars.slm_offset,
+        fs=FS,
+        input_channel=pars.mic_channel,
+        analyzer=bandanalysis.BandAnalyzer(
+            fs=FS, fraction=pars.band_fraction,
+            weighting=pars.weighting),
+        channel_gains=gains
+    )
+
+    def _progress(channel, slm_level, offset):
+        print(f"cli: Speaker {channel + 1}: {slm_level:.1f} dB SPL, " +
+              f"offset {offset} dB")
+
+    if args.parallel:
+        balancer.run_parallel(level=pars.level,
+                              num_speakers=pars.num_speakers,
+                              dur=pars.duration, progress=_progress)
+        print("cli: Band offsets are only reported without --parallel")
+    else:
+        balancer.run(signal=make_noise(pars), level=pars.level,
+                     num_speakers=pars.num_speakers, progress=_progress)
+        print(f"\ncli: Band offsets (dB, {pars.weighting}-weighted):")
+        print(balancer.band_report())
+
+
+def _open_engine(gains):
+    from models import streammodel
+    engine = streammodel.StreamEngine()
+    if gains is not None:
+        engine.set_channel_gains(gains)
+    return engine
+
+
+def run_manual(args, pars, speakers, gains=None):
+    """ Play noise to each speaker and read the SLM level from
+        standard input.
+    """
+    from exceptions import speaker_exceptions
+    from models import audiomodel
+    engine = _open_engine(gains)
+    noise = make_noise(pars)
+    try:
+        ii = 0
+        while ii < pars.num_speakers:
+            audio = audiomodel.Audio(audio=noise, sampling_rate=FS)
+            audio.play(level=pars.level,
+                       device_id=pars.audio_device,
+                       routing=[ii + 1], engine=engine)
+            engine.wait(pars.duration + 1)
+            reply = input(f"Speaker {ii + 1} SLM reading " +
+                          "(Enter to replay, s to skip): ").strip()
+            if reply.lower() == 's':
+                ii += 1
+                continue
+            if not reply:
+                continue
+            try:
+                # Remove any saved offsets applied by the engine
+                speakers.calc_offset(
+                    channel=ii, slm_level=float(reply),
+                    applied_db=engine.applied_db([ii + 1])[0])
+            except ValueError:
+                print("cli: Enter a number")
+                continue
+            except speaker_exceptions.MissingReference:
+                # Go back to speaker 1; readings so far are kept
+                print("cli: Speaker 1 sets the reference level; " +
+                      "measure it first")
+                ii = 0
+                continue
+            print(f"cli: Offset: {speakers.speaker_list[ii].offset} dB")
+            ii += 1
+    finally:
+        engine.close()
+
+
+def run_sequence(args, pars, gains=None):
+    """ Play noise to every speaker back to back. """
+    from models import audiomodel
+    from models import streammodel
+    engine = _open_engine(gains)
+    num = pars.num_speakers
+    sequence = streammodel.SequenceSource(
+        make_noise(pars), fs=FS, num_slots=num, gap=pars.test_gap,
+        ramp=pars.test_ramp)
+    try:
+        audio = audiomodel.Audio(audio=sequence)
+        audio.play(level=pars.level, device_id=pars.audio_device,
+                   routing=list(range(1, num + 1)), engine=engine)
+        engine.wait(num * (pars.duration + pars.test_gap) + 5)
+    finally:
+        engine.close()
+
+
+def save_offsets(args, pars, speakers):
+    """ Write the offsets to CSV. Returns the path. """
+    from models import csvmodel
+
+    missing = speakers.check_for_missing_offsets()
+    if missing:
+        print("cli: Speakers with missing offsets: " +
+              f"{[int(val) + 1 for val in missing]}", file=sys.stderr)
+
+    model = csvmodel.CSVModel(pars)
+    path = args.output or (model._create_file_name() + '.csv')
+    return model.save_record(speakers.get_data(), file_path=path)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    model, pars = load_sessionpars(args)
+
+    if args.mode == 'config':
+        for key in model.fields:
+            print(f"{key}: {getattr(pars, key)}")
+        return 0
+
+    from exceptions import audio_exceptions
+    from exceptions import speaker_exceptions
+    from models import speakermodel
+    speakers = speakermodel.SpeakerWrangler(num_speakers=pars.num_speakers)
+
+    try:
+        gains = load_channel_gains(pars)
+    except (OSError, ValueError) as e:
+        print(f"cli: Cannot load offsets file: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        if args.mode == 'balance':
+            run_balance(args, pars, speakers, gains)
+        elif args.mode == 'manual':
+            run_manual(args, pars, speakers, gains)
+        elif args.mode == 'sequence':
+            run_sequence(args, pars, gains)
+            return 0
+    except audio_exceptions.InvalidAudioDevice:
+        print(f"cli: Invalid audio device: {pars.audio_device}",
+              file=sys.stderr)
+        return 1
+    except audio_exceptions.InvalidRouting:
+        print("cli: The device does not have enough outputs",
+              file=sys.stderr)
+        return 1
+    except audio_exceptions.Clipping:
+        print("cli: The level is too high and caused clipping",
+              file=sys.stderr)
+        return 1
+    except speaker_exceptions.MissingReference as e:
+        print(f"cli: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\ncli: Stopped", file=sys.stderr)
+        return 1
+
+    try:
+        path = save_offsets(args, pars, speakers)
+    except OSError as e:
+        print(f"cli: Cannot save offsets: {e}", file=sys.stderr)
+        return 1
+    print(f"cli: Offsets saved to {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,31 +13,36 @@ from tkinter import messagebox
 
 # Import data science packages
 import numpy as np
-import random
-import math
 
 # Import system packages
 from pathlib import Path
 import time
 from threading import Thread
-import asyncio
 
 # Import misc packages
-import webbrowser
-import markdown
+# NOTE: markdown and webbrowser are imported when Help is first 
+# used, to keep them out of the startup path
 
 # Import custom modules
 # Menu imports
 from menus import mainmenu
 # Exception imports
 from exceptions import audio_exceptions
+from exceptions import speaker_exceptions
 # Model imports
 from models import sessionmodel
 from models import versionmodel
 from models import audiomodel
+from models import autobalance
 from models import calmodel
 from models import csvmodel
+from models import levelmeter
+from models import offsetmodel
 from models import speakermodel
+from models import stimulusbank
+from models import streammodel
+from models import tkbinding
+from models import uidispatcher
 # View imports
 from views import mainview
 from views import sessionview
@@ -94,6 +99,8 @@ class Application(tk.Tk):
         self._vars = {
             'selected_speaker': tk.IntVar(value=None),
             'slm_reading': tk.DoubleVar(value=None),
+            'live_meter': tk.BooleanVar(value=False),
+            'meter_reading': tk.StringVar(value="-- dB SPL"),
         }
 
         # Load current session parameters from file
@@ -106,10 +113,33 @@ class Application(tk.Tk):
         self.speakers = self._create_speakerwrangler()
 
         # Load CSV writer model
-        self.csvmodel = csvmodel.CSVModel(self.sessionpars)
+        self.csvmodel = csvmodel.CSVModel(self.params)
 
         # Load calibration model
-        self.calmodel = calmodel.CalModel(self.sessionpars)
+        self.calmodel = calmodel.CalModel(self.params)
+
+        # Load stimulus cache
+        self.stimulus_bank = stimulusbank.StimulusBank(max_bytes=256 * 1024**2)
+
+        # Create persistent output stream (opened on first play)
+        self.engine = streammodel.StreamEngine()
+
+        # Apply saved speaker offsets to playback
+        self.offset_gains = offsetmodel.OffsetGains()
+        self._apply_offsets_file()
+
+        # Live microphone level meter (started from the main view)
+        self.meter_stream = None
+
+        # Offset test sequence scheduler (created on first use)
+        self.scheduler = None
+
+        # Auto balance thread
+        self.t = None
+
+        # Run UI updates posted by worker threads on the main loop
+        self.ui = uidispatcher.UIDispatcher(self)
+        self.ui.start()
 
         # Load main view
         self.main_frame = mainview.MainFrame(self, self.sessionpars, self._vars)
@@ -130,6 +160,14 @@ class Application(tk.Tk):
             '<<ToolsAudioSettings>>': lambda _: self._show_audio_dialog(),
             '<<ToolsCalibration>>': lambda _: self._show_calibration_dialog(),
             '<<ToolsTestOffsets>>': lambda _: self._on_test_offsets(),
+            '<<ToolsTestOffsetsGapless>>': lambda _: self._on_test_offsets(
+                gapless=True),
+            '<<ToolsPauseTest>>': lambda _: self._on_pause_test(),
+            '<<ToolsAutoBalance>>': lambda _: self._on_auto_balance(),
+            '<<ToolsAutoBalanceParallel>>': lambda _: self._on_auto_balance(
+                parallel=True),
+            '<<ToolsLoadOffsets>>': lambda _: self._on_load_offsets(),
+            '<<ToolsClearOffsets>>': lambda _: self._on_clear_offsets(),
 
             # Help menu
             '<<HelpREADME>>': lambda _: self._show_help(),
@@ -146,11 +184,15 @@ class Application(tk.Tk):
             # Audio dialog commands
             '<<AudioDialogSubmit>>': lambda _: self._save_sessionpars(),
 
+            # Version check
+            '<<VersionCheckComplete>>': lambda _: self._on_version_check_complete(),
+
             # Main View commands
             '<<MainPlay>>': lambda _: self._on_play(),
             '<<MainStop>>': lambda _: self.stop_audio(),
             '<<MainSubmit>>': lambda _: self._on_submit(),
             '<<MainSave>>': lambda _: self._on_save(),
+            '<<MainMeterToggle>>': lambda _: self._on_meter_toggle(),
         }
 
         # Bind callbacks to sequences
@@ -160,41 +202,11 @@ class Application(tk.Tk):
         # Center main window
         self.center_window()
 
-        # Check for updates
-        if (self.sessionpars['check_for_updates'].get() == 'yes') and\
-        (self.sessionpars['config_file_status'].get() == 1):
-            _filepath = self.sessionpars['version_lib_path'].get()
-            u = versionmodel.VersionChecker(_filepath, self.NAME, self.VERSION)
-            if u.status == 'mandatory':
-                messagebox.showerror(
-                    title="New Version Available",
-                    message="A mandatory update is available. Please install " +
-                        f"version {u.new_version} to continue.",
-                    detail=f"You are using version {u.app_version}, but " +
-                        f"version {u.new_version} is available."
-                )
-                self.destroy()
-            elif u.status == 'optional':
-                messagebox.showwarning(
-                    title="New Version Available",
-                    message="An update is available.",
-                    detail=f"You are using version {u.app_version}, but " +
-                        f"version {u.new_version} is available."
-                )
-            elif u.status == 'current':
-                pass
-            elif u.status == 'app_not_found':
-                messagebox.showerror(
-                    title="Update Check Failed",
-                    message="Cannot retrieve version number!",
-                    detail=f"'{self.NAME}' does not exist in the version library."
-                 )
-            elif u.status == 'library_inaccessible':
-                messagebox.showerror(
-                    title="Update Check Failed",
-                    message="The version library is unreachable!",
-                    detail="Please check that you have access to Starfile."
-                )
+        # Check for updates in the background; the result is
+        # delivered with the <<VersionCheckComplete>> event
+        if (self.params.check_for_updates == 'yes') and\
+        (self.params.config_file_status == 1):
+            self._start_version_check()
 
 
     #####################
@@ -218,30 +230,89 @@ class Application(tk.Tk):
             the specified number of speakers.
         """
         # Get specified number of speakers
-        num_speakers = self.sessionpars['num_speakers'].get()
+        num_speakers = self.params.num_speakers
 
         # Instantiate and populate SpeakerWrangler
-        sw = speakermodel.SpeakerWrangler()
-        for ii in range(0,num_speakers):
-            sw.add_speaker(ii)
-
-        return sw
+        return speakermodel.SpeakerWrangler(num_speakers=num_speakers)
 
 
     def wgn(self, dur, fs):
         """ Function to generate white Gaussian noise.
         """
-        r = int(dur * fs)
-        random.seed(4)
-        wgn = [random.gauss(0.0, 1.0) for i in range(r)]
-        wgn -= np.mean(wgn) # Remove DC offset
-        wgn = wgn / np.max(abs(wgn)) # Normalize
-        return wgn
+        return self.stimulus_bank.get('wgn', dur=dur, fs=fs, seed=4)
+
+
+    def _start_version_check(self):
+        """ Start the version check on a worker thread and poll for
+            the result from the Tk main loop.
+        """
+        _filepath = self.params.version_lib_path
+        self.version_check = versionmodel.BackgroundVersionCheck(
+            lib_path=_filepath,
+            app_name=self.NAME,
+            app_version=self.VERSION,
+            cache_path=self.sessionpars_model.filepath.parent / 'version_check.json',
+            timeout=5.0
+        )
+        self.version_check.start()
+        self.after(100, self._poll_version_check)
+
+
+    def _poll_version_check(self):
+        """ Generate <<VersionCheckComplete>> once a result is ready.
+        """
+        self.version_result = self.version_check.poll()
+        if self.version_result is None:
+            self.after(100, self._poll_version_check)
+        else:
+            self.event_generate('<<VersionCheckComplete>>')
+
+
+    def _on_version_check_complete(self):
+        """ Display the version check result.
+        """
+        u = self.version_result
+        if u.status == 'mandatory':
+            messagebox.showerror(
+                title="New Version Available",
+                message="A mandatory update is available. Please install " +
+                    f"version {u.new_version} to continue.",
+                detail=f"You are using version {u.app_version}, but " +
+                    f"version {u.new_version} is available."
+            )
+            self._quit()
+        elif u.status == 'optional':
+            messagebox.showwarning(
+                title="New Version Available",
+                message="An update is available.",
+                detail=f"You are using version {u.app_version}, but " +
+                    f"version {u.new_version} is available."
+            )
+        elif u.status == 'current':
+            pass
+        elif u.status == 'app_not_found':
+            messagebox.showerror(
+                title="Update Check Failed",
+                message="Cannot retrieve version number!",
+                detail=f"'{self.NAME}' does not exist in the version library."
+             )
+        elif u.status in ('library_inaccessible', 'timeout'):
+            messagebox.showerror(
+                title="Update Check Failed",
+                message="The version library is unreachable!",
+                detail="Please check that you have access to Starfile."
+            )
 
 
     def _quit(self):
         """ Exit the application.
         """
+        self._stop_meter()
+        self.ui.stop()
+        if self.scheduler is not None:
+            self.scheduler.close()
+        self.engine.close()
+        self.sessionpars_model.flush()
         self.destroy()
 
 
@@ -261,16 +332,16 @@ class Application(tk.Tk):
     def _on_play(self):
         """ Generate and present WGN. """
         # Save latest duration and level values
-        self._save_sessionpars()
+        self._save_sessionpars(delay=2.0)
 
         # Generate WGN
         FS = 48000
-        _wgn = self.wgn(dur=self.sessionpars['duration'].get(), fs=FS)
+        _wgn = self.wgn(dur=self.params.duration, fs=FS)
 
         # Present WGN
         self.present_audio(
             audio=_wgn, 
-            pres_level=self.sessionpars['level'].get(),
+            pres_level=self.params.level,
             sampling_rate=FS
         )
 
@@ -279,20 +350,23 @@ class Application(tk.Tk):
         """ Save SLM Reading value and update Speaker object."""
         # Get current values
         current_speaker = self._vars['selected_speaker'].get()
-        slm_level = self._vars['slm_reading'].get()
 
-        # Calculate speaker offset
+        # Calculate speaker offset. The reading includes any saved
+        # offsets applied by the engine, so remove them to keep the
+        # new offsets absolute.
         try:
+            slm_level = self._vars['slm_reading'].get()
             self.speakers.calc_offset(
                 channel=current_speaker, 
-                slm_level=slm_level
+                slm_level=slm_level,
+                applied_db=self.engine.applied_db([current_speaker + 1])[0]
             )
 
             self.main_frame.update_offset_labels(
                 channel=current_speaker,
                 offset=self.speakers.speaker_list[current_speaker].offset
             )
-        except TypeError as e:
+        except speaker_exceptions.MissingReference as e:
             msg = "You must start with channel 1 to create a reference level!"
             print("\ncontroller: " + msg)
             messagebox.showwarning(
@@ -300,10 +374,75 @@ class Application(tk.Tk):
                 message=msg,
                 detail=e
             )
+        except (ValueError, tk.TclError) as e:
+            msg = "The SLM reading must be a number!"
+            print("\ncontroller: " + msg)
+            messagebox.showwarning(
+                title="Invalid SLM Reading",
+                message=msg,
+                detail=e
+            )
         
         # Print feedback to console
-        print(f"controller:"\
-              f"{self.speakers.speaker_list[current_speaker].__dict__}")
+        print(f"controller: {self.speakers.speaker_list[current_speaker]}")
+
+
+    def _on_meter_toggle(self):
+        """ Start or stop the live microphone level meter. """
+        if not self._vars['live_meter'].get():
+            self._stop_meter()
+            return
+
+        meter = levelmeter.LevelMeter(
+            num_channels=1,
+            fs=48000,
+            slm_offset=self.params.slm_offset
+        )
+        self.meter_stream = levelmeter.MeterStream(
+            meter=meter,
+            device_id=self.params.audio_device,
+            channels=[self.params.mic_channel]
+        )
+        try:
+            self.meter_stream.start()
+        except audio_exceptions.InvalidAudioDevice as e:
+            self.meter_stream = None
+            self._vars['live_meter'].set(False)
+            messagebox.showerror(
+                title="Invalid Device",
+                message="Invalid audio device! Go to Tools>Audio Settings " +
+                    "to select a valid audio device.",
+                detail = e
+            )
+            return
+        print("\ncontroller: Started live level meter")
+        self.main_frame.set_meter_state(live=True)
+        self._poll_meter()
+
+
+    def _poll_meter(self):
+        """ Copy the slow-weighted meter level to the SLM reading
+            every 200 ms while the meter is running.
+        """
+        if self.meter_stream is None:
+            return
+        meter = self.meter_stream.meter
+        level = meter.slow[0]
+        if np.isfinite(level):
+            self._vars['slm_reading'].set(np.round(level, 1))
+            self._vars['meter_reading'].set(
+                f"{level:.1f} dB SPL (peak {meter.peak[0]:.1f})")
+        self.after(200, self._poll_meter)
+
+
+    def _stop_meter(self):
+        """ Stop the live level meter, if running. """
+        if self.meter_stream is None:
+            return
+        self.meter_stream.stop()
+        self.meter_stream = None
+        self.main_frame.set_meter_state(live=False)
+        print("\ncontroller: Stopped live level meter")
 
 
     def _on_save(self):
@@ -351,31 +490,27 @@ class Application(tk.Tk):
     # Session Dialog Functions #
     ############################
     def _load_sessionpars(self):
-        """ Load parameters into self.sessionpars dict 
+        """ Load parameters into self.params, and bind them to the
+            Tk variables in self.sessionpars used by the views.
         """
-        vartypes = {
-        'bool': tk.BooleanVar,
-        'str': tk.StringVar,
-        'int': tk.IntVar,
-        'float': tk.DoubleVar
-        }
-
-        # Create runtime dict from session model fields
-        self.sessionpars = dict()
-        for key, data in self.sessionpars_model.fields.items():
-            vartype = vartypes.get(data['type'], tk.StringVar)
-            self.sessionpars[key] = vartype(value=data['value'])
+        self.params = self.sessionpars_model.to_params()
+        self.sessionpars = tkbinding.TkParams(self.params, master=self)
         print("\ncontroller: Loaded sessionpars model fields into " +
-            "running sessionpars dict")
+            "running params")
 
 
-    def _save_sessionpars(self, *_):
-        """ Save current runtime parameters to file 
+    def _save_sessionpars(self, *_, delay=None):
+        """ Save current runtime parameters to file. Only changed
+            values are written, once per call. If DELAY is given,
+            the write is debounced by DELAY seconds.
         """
         print("\ncontroller: Calling sessionpars model set and save funcs")
-        for key, variable in self.sessionpars.items():
-            self.sessionpars_model.set(key, variable.get())
+        self.sessionpars_model.update(self.params)
+
+        if delay is None:
             self.sessionpars_model.save()
+        else:
+            self.sessionpars_model.save_later(delay)
 
 
     ###################
@@ -433,11 +568,22 @@ class Application(tk.Tk):
         try:
             self.a.play(
                 level=pres_level,
-                device_id=self.sessionpars['audio_device'].get(),
+                device_id=self.params.audio_device,
                 routing=self._format_routing(
-                    self.sessionpars['channel_routing'].get())
+                    self.params.channel_routing),
+                engine=self.engine
             )
-        except audio_exceptions.InvalidAudioDevice as e:
+        except (audio_exceptions.InvalidAudioDevice,
+                audio_exceptions.InvalidRouting,
+                audio_exceptions.Clipping) as e:
+            self._show_play_error(e, self.a)
+
+
+    def _show_play_error(self, e, audio):
+        """ Report a playback exception E for AUDIO. Must run on
+            the Tk thread.
+        """
+        if isinstance(e, audio_exceptions.InvalidAudioDevice):
             print(e)
             messagebox.showerror(
                 title="Invalid Device",
@@ -447,7 +593,7 @@ class Application(tk.Tk):
             )
             # Open Audio Settings window
             self._show_audio_dialog()
-        except audio_exceptions.InvalidRouting as e:
+        elif isinstance(e, audio_exceptions.InvalidRouting):
             print(e)
             messagebox.showerror(
                 title="Invalid Routing",
@@ -458,7 +604,7 @@ class Application(tk.Tk):
             )
             # Open Audio Settings window
             self._show_audio_dialog()
-        except audio_exceptions.Clipping:
+        elif isinstance(e, audio_exceptions.Clipping):
             print("controller: Clipping has occurred! Aborting!")
             messagebox.showerror(
                 title="Clipping",
@@ -466,14 +612,13 @@ class Application(tk.Tk):
                 detail="The waveform will be plotted when this message is " +
                     "closed for visual inspection."
             )
-            self.a.plot_waveform("Clipped Waveform")
+            audio.plot_waveform("Clipped Waveform")
 
 
     def stop_audio(self):
-        try:
-            self.a.stop()
-        except AttributeError:
-            print("\ncontroller: Stop called, but there is no audio object!")
+        if self.scheduler is not None:
+            self.scheduler.cancel()
+        self.engine.stop()
 
 
     def _format_routing(self, routing):
@@ -489,89 +634,340 @@ class Application(tk.Tk):
     ########################
     # Tools Menu Functions #
     ########################
-    def _on_test_offsets(self):
-        """ Start automated offset test thread."""
-        # Delete existig instances of thread object
+    def _apply_offsets_file(self):
+        """ Load the offsets file from sessionpars, if any, and 
+            apply it to playback as per-channel gains.
+        """
+        path = self.params.offsets_file
+        if not path:
+            self.engine.set_channel_gains(None)
+            return
         try:
-            del self.t
-        except AttributeError:
-            print("\ncontroller: no Thread object to delete")
-            pass
+            gains = self.offset_gains.load(path)
+        except (OSError, ValueError) as e:
+            print(f"controller: Cannot load offsets: {e}")
+            self.sessionpars['offsets_file'].set('')
+            self.engine.set_channel_gains(None)
+            return
+        self.engine.set_channel_gains(gains)
+        print(f"controller: Applying offsets from {path}")
 
-        # Create and call Thread instance
-        try:
-            self.t = Thread(target=self._on_test_offsets_thread)
-            self.t.start()
-        except:
-            print("\ncontroller: Failed to start audio thread.")
+
+    def _on_load_offsets(self):
+        """ Choose an offsets file to apply to playback. """
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(
+            title="Select Offsets File",
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if not path:
             return
+        self.sessionpars['offsets_file'].set(path)
+        self._apply_offsets_file()
+        if not self.params.offsets_file:
+            messagebox.showerror(
+                title="Invalid File",
+                message="Cannot load offsets!",
+                detail=f"{path} is not a speaker offsets file."
+            )
+            return
+        self._save_sessionpars()
 
 
-    def _on_test_offsets_thread(self):
-        """ Automatically step through all speakers. """
-        import sounddevice as sd
-        fs = 48000
-        sd.default.device = self.sessionpars['audio_device'].get()
-        print(f"\ncontroller: Audio device: {sd.query_devices(sd.default.device)['name']}")
+    def _on_clear_offsets(self):
+        """ Stop applying saved offsets to playback. """
+        self.sessionpars['offsets_file'].set('')
+        self._apply_offsets_file()
+        self._save_sessionpars()
 
-        # Generate WGN
-        _wgn = self.wgn(dur=self.sessionpars['duration'].get(), fs=fs)
-        #mag = self.db2mag(self.sessionpars['level'].get())
-        #_wgn = _wgn * mag
-        #print(f"\ncontroller: Level from main view: {self.sessionpars['level'].get()}")
-        
-        # Get number of speakers/channels
-        num_speakers = self.sessionpars['num_speakers'].get()
+
+    def _on_test_offsets(self, gapless=False):
+        """ Start the automated offset test sequence. If GAPLESS is
+            True, all speakers are presented back to back as one
+            continuous stream.
+        """
+        if self.scheduler is None:
+            # Imported here to keep asyncio out of the startup path
+            from models import scheduler
+            self.scheduler = scheduler.MeasurementScheduler(self)
+        if self.scheduler.busy:
+            print("\ncontroller: Offset test already running")
+            return
+        if self._auto_balance_running():
+            print("\ncontroller: Auto balance is running")
+            return
+
+        self._save_sessionpars(delay=2.0)
+        params = {
+            'duration': self.params.duration,
+            'level': self.params.level,
+            'audio_device': self.params.audio_device,
+            'num_speakers': self.params.num_speakers,
+            'gap': self.params.test_gap,
+            'ramp': self.params.test_ramp,
+        }
+        _wgn = self.wgn(dur=params['duration'], fs=48000)
+
+        if gapless:
+            # One step for the whole sequence. The step can be paused
+            # part way through, so it times itself out instead.
+            steps = [lambda: self._test_sequence(_wgn, params)]
+            timeout = None
+        else:
+            # One step per speaker
+            steps = [
+                (lambda ii=ii: self._test_speaker(ii, _wgn, params))
+                for ii in range(0, params['num_speakers'])
+            ]
+            timeout = params['duration'] + 5
 
         # Update mainview: START TEST
         self.main_frame.start_auto_test()
+        self.scheduler.start(
+            steps,
+            timeout=timeout,
+            on_done=lambda *_: self.main_frame.end_auto_test()
+        )
 
-        # Create audio object
-        #sig = audiomodel.Audio(audio=_wgn, sampling_rate=fs)
 
+    def _on_pause_test(self):
+        """ Pause or resume the offset test sequence. """
+        if self.scheduler is None:
+            return
+        if self.scheduler.state == 'paused':
+            self.scheduler.resume()
+        else:
+            self.scheduler.pause()
 
-        # Present WGN to each speaker for the specified duration
-        for ii in range(0, num_speakers):
-            # Select speaker number
-            self._vars['selected_speaker'].set(ii)
 
-            # Enable current speaker button on mainframe
-            self.main_frame._update_single_speaker_button_state(ii, 'enabled')
+    async def _test_speaker(self, ii, audio, params, settle=0.1):
+        """ Present AUDIO to speaker II and wait for it to finish.
+            Runs on the Tk thread as a scheduler step.
+        """
+        # Select speaker number and enable its button
+        self._vars['selected_speaker'].set(ii)
+        self.main_frame._update_single_speaker_button_state(ii, 'enabled')
 
+        # Routing from the audioview is saved as a string
+        self.sessionpars['channel_routing'].set(str(ii + 1))
 
+        try:
+            # Stimulus
+            a = audiomodel.Audio(audio=audio, sampling_rate=48000)
+            try:
+                a.play(
+                    level=params['level'],
+                    device_id=params['audio_device'],
+                    routing=[ii + 1],
+                    engine=self.engine
+                )
+            except (audio_exceptions.InvalidAudioDevice,
+                    audio_exceptions.InvalidRouting,
+                    audio_exceptions.Clipping) as e:
+                self._show_play_error(e, a)
+                raise
+
+            # Measure: wait for the presentation to end
+            await self.scheduler.wait_for_event(self.engine.finished)
+            print("controller: Start-to-sound latency (s): " +
+                  f"{self.engine.last_latency}")
+
+            # Settle
+            await self.scheduler.sleep(settle)
+        finally:
+            # Silence the speaker if the step was cancelled
+            self.engine.stop()
+            # Disable current speaker button
+            self.main_frame._update_single_speaker_button_state(
+                ii, 'disabled')
 
 
-            # # Apply offset to channel number
-            # chan = ii + 1
+    async def _test_sequence(self, audio, params):
+        """ Present AUDIO to every speaker back to back as one 
+            stream, with params['gap'] seconds between speakers. 
+            Runs on the Tk thread as a scheduler step.
 
-            # # Present audio
-            # try:
-            #     print(f"controller: Iteration: {ii+1}")
-            #     sd.play(_wgn, fs, mapping=[chan])
-            #     sd.wait(self.sessionpars['duration'].get())
-            # except Exception as e:
-            #     print(e)
-            #     messagebox.showerror(
-            #         title="Audio Error",
-            #         message="Failed to play audio!",
-            #         detail=e
-            #     )
-            #     break
+            Pausing the scheduler stops the stream; on resume, the
+            sequence restarts from the speaker it was paused on.
+        """
+        num_speakers = params['num_speakers']
+        sequence = streammodel.SequenceSource(
+            audio, fs=48000, num_slots=num_speakers, gap=params['gap'],
+            ramp=params['ramp'])
+        a = audiomodel.Audio(audio=sequence)
 
+        slot = None
+        try:
+            while True:
+                try:
+                    a.play(
+                        level=params['level'],
+                        device_id=params['audio_device'],
+                        routing=list(range(1, num_speakers + 1)),
+                        engine=self.engine
+                    )
+                except (audio_exceptions.InvalidAudioDevice,
+                        audio_exceptions.InvalidRouting,
+                        audio_exceptions.Clipping) as e:
+                    self._show_play_error(e, a)
+                    raise
+                deadline = time.monotonic() + sequence.remaining + 5
+
+                # Follow the sequence with the speaker buttons
+                while not self.engine.finished.is_set():
+                    if self.scheduler.state == 'paused':
+                        break
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(
+                            "controller: Gapless sequence timed out")
+                    if sequence.current_slot != slot:
+                        if slot is not None:
+                            self.main_frame.\
+                                _update_single_speaker_button_state(
+                                    slot, 'disabled')
+                        slot = sequence.current_slot
+                        self._vars['selected_speaker'].set(slot)
+                        self.main_frame._update_single_speaker_button_state(
+                            slot, 'enabled')
+                    await self.scheduler.sleep(0.01)
+                else:
+                    break
+
+                # Paused: silence the speakers until resumed
+                sequence.start_slot = sequence.current_slot
+                self.engine.stop()
+                print("controller: Sequence paused at speaker " +
+                      f"{sequence.start_slot + 1}")
+                await self.scheduler.checkpoint()
+            print("controller: Start-to-sound latency (s): " +
+                  f"{self.engine.last_latency}")
+        finally:
+            self.engine.stop()
+            if slot is not None:
+                self.main_frame._update_single_speaker_button_state(
+                    slot, 'disabled')
+
+
+    def _on_auto_balance(self, parallel=False):
+        """ Start automatic balancing thread. If PARALLEL is True,
+            all speakers are measured at once.
+        """
+        # Only one measurement may use the audio device at a time
+        if self._auto_balance_running() or \
+            ((self.scheduler is not None) and self.scheduler.busy):
+            print("\ncontroller: A measurement is already running")
+            return
 
+        # Read settings on the Tk thread
+        names = ['audio_device', 'slm_offset', 'mic_channel', 'level',
+                 'num_speakers', 'duration', 'weighting', 'band_fraction']
+        params = {name: getattr(self.params, name) for name in names}
+        channel_gains = self.engine.channel_gains
 
-            # Routing from the audioview is saved as a string
-            chan=str(ii+1)
-            self.sessionpars['channel_routing'].set(chan)
+        # Release the output stream so the device can be opened
+        # for simultaneous playback and recording
+        self.engine.close()
 
-            self._on_play()
-            sd.wait(self.sessionpars['duration'].get())
+        try:
+            self.t = Thread(target=self._on_auto_balance_thread,
+                            args=(params, parallel, channel_gains))
+            self.t.start()
+        except:
+            print("\ncontroller: Failed to start auto balance thread.")
+            return
+        self.menu.set_auto_balance_state('disabled')
 
-            # Disable current speaker button
-            self.main_frame._update_single_speaker_button_state(ii, 'disabled')
 
-        # Update mainview: END TEST
-        self.main_frame.end_auto_test()
+    def _auto_balance_running(self):
+        return (self.t is not None) and self.t.is_alive()
+
+
+    def _on_auto_balance_thread(self, params, parallel=False,
+                                channel_gains=None):
+        """ Play WGN to each speaker while recording the measurement
+            microphone, and calculate offsets from the recordings.
+            If PARALLEL is True, play interleaved multitones to all
+            speakers at once instead. CHANNEL_GAINS (saved offsets)
+            are applied during the measurement. Runs on a worker 
+            thread: UI updates are posted to self.ui.
+        """
+        fs = 48000
+
+        print("\ncontroller: Starting auto balance...")
+        try:
+            # Frequency weighting and band levels
+            from models import bandanalysis
+            analyzer = bandanalysis.BandAnalyzer(
+                fs=fs,
+                fraction=params['band_fraction'],
+                weighting=params['weighting']
+            )
+
+            balancer = autobalance.AutoBalancer(
+                backend=autobalance.SoundDeviceBackend(params['audio_device']),
+                speakers=self.speakers,
+                slm_offset=params['slm_offset'],
+                fs=fs,
+                input_channel=params['mic_channel'],
+                analyzer=analyzer,
+                channel_gains=channel_gains
+            )
+            if channel_gains is not None:
+                print("controller: Measuring with saved offsets applied")
+
+            def _progress(channel, slm_level, offset):
+                self.ui.post(self._vars['selected_speaker'].set, channel)
+                self.ui.post(self._vars['slm_reading'].set, slm_level)
+                self.ui.post(self.main_frame.update_offset_labels, 
+                             channel=channel, offset=offset)
+
+            if parallel:
+                balancer.run_parallel(
+                    level=params['level'],
+                    num_speakers=params['num_speakers'],
+                    dur=params['duration'],
+                    progress=_progress
+                )
+                print("controller: Band offsets are only reported by " +
+                      "sequential auto balance")
+            else:
+                balancer.run(
+                    signal=self.wgn(dur=params['duration'], fs=fs),
+                    level=params['level'],
+                    num_speakers=params['num_speakers'],
+                    progress=_progress
+                )
+                print("\ncontroller: Band offsets (dB, " +
+                      f"{params['weighting']}-weighted):")
+                print(balancer.band_report())
+        except audio_exceptions.InvalidAudioDevice as e:
+            print(e)
+            self.ui.post(
+                messagebox.showerror,
+                title="Invalid Device",
+                message="Invalid audio device! Go to Tools>Audio Settings " +
+                    "to select a valid audio device.",
+                detail = e
+            )
+        except audio_exceptions.Clipping:
+            self.ui.post(
+                messagebox.showerror,
+                title="Clipping",
+                message="The level is too high and caused clipping.",
+                detail="Lower the level and try again."
+            )
+        except Exception as e:
+            print(e)
+            self.ui.post(
+                messagebox.showerror,
+                title="Audio Error",
+                message="Auto balance failed!",
+                detail=e
+            )
+        finally:
+            # Allow auto balance again
+            self.ui.post(self.menu.set_auto_balance_state, 'normal')
+        print("controller: Auto balance finished")
 
 
     # def db2mag(self, db):
@@ -605,20 +1001,40 @@ class Application(tk.Tk):
     def play_calibration_file(self):
         """ Load calibration file and present
         """
-        # Get calibration file
+        # Get decoded calibration signal (cached between presses)
         try:
-            self.calmodel.get_cal_file()
+            cal_audio = self.calmodel.get_cal_audio()
         except AttributeError:
             messagebox.showerror(
                 title="File Not Found",
                 message="Cannot find internal calibration file!",
                 detail="Please use a custom calibration file."
             )
+            return
+        except FileNotFoundError:
+            print("\ncontroller: Calibration file not found!")
+            messagebox.showerror(
+                title="File Not Found",
+                message="Cannot find the calibration file!",
+                detail=self.calmodel.cal_file
+            )
+            return
+
         # Present calibration signal
-        self.present_audio(
-            audio=Path(self.calmodel.cal_file), 
-            pres_level=self.sessionpars['cal_level_dB'].get()
-        )
+        if cal_audio is not None:
+            signal, fs = cal_audio
+            self.present_audio(
+                audio=signal,
+                pres_level=self.params.cal_level_dB,
+                sampling_rate=fs
+            )
+        else:
+            # Too large to cache: stream from disk
+            self.present_audio(
+                audio=Path(self.calmodel.cal_file), 
+                pres_level=self.params.cal_level_dB,
+                stream=True
+            )
 
 
     def _calc_offset(self):
@@ -626,6 +1042,7 @@ class Application(tk.Tk):
         """
         # Calculate new presentation level
         self.calmodel.calc_offset()
+        self.sessionpars.refresh('slm_offset')
         # Save level - this must be called here!
         self._save_sessionpars()
 
@@ -635,6 +1052,7 @@ class Application(tk.Tk):
         """
         # Calculate new presentation level
         self.calmodel.calc_level(desired_spl)
+        self.sessionpars.refresh('desired_level_dB', 'adjusted_level_dB')
         # Save level - this must be called here!
         self._save_sessionpars()
 
@@ -645,6 +1063,8 @@ class Application(tk.Tk):
     def _show_help(self):
         """ Create html help file and display in default browser
         """
+        import markdown
+        import webbrowser
         print(f"\ncontroller: Calling README file (will open in browser)")
         # Read markdown file and convert to html
         with open(README.README_MD, 'r') as f:
@@ -662,6 +1082,8 @@ class Application(tk.Tk):
     def _show_changelog(self):
         """ Create html help file and display in default browser
         """
+        import markdown
+        import webbrowser
         print(f"\ncontroller: Calling CHANGELOG file (will open in browser)")
         # Read markdown file and convert to html
         with open(README.CHANGELOG_MD, 'r') as f:
@@ -0,0 +1,16 @@
+""" Custom exceptions for the speakermodel class.
+"""
+
+
+class MissingReference(TypeError):
+    """ Offsets were requested before speaker 1 set the reference
+        level. Subclasses TypeError, which was raised before.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+
+
+    def __str__(self):
+        return 'Speaker Exception: Speaker 1 must be measured first ' \
+            'to set the reference level.'
@@ -94,7 +94,7 @@ class MainMenu(tk.Menu):
         ############## 
         # Tools menu #
         ##############
-        tools_menu = tk.Menu(self, tearoff=False)
+        tools_menu = self.tools_menu = tk.Menu(self, tearoff=False)
         tools_menu.add_command(
             label='Audio Settings...',
             command=self._event('<<ToolsAudioSettings>>'),
@@ -115,6 +115,37 @@ class MainMenu(tk.Menu):
             image=self.icons['file_start'],
             compound=tk.LEFT
         )
+        tools_menu.add_command(
+            label="Test Offsets (Gapless)",
+            command=self._event('<<ToolsTestOffsetsGapless>>'),
+            image=self.icons['file_start'],
+            compound=tk.LEFT
+        )
+        tools_menu.add_command(
+            label="Pause/Resume Test",
+            command=self._event('<<ToolsPauseTest>>'),
+        )
+        tools_menu.add_command(
+            label="Auto Balance",
+            command=self._event('<<ToolsAutoBalance>>'),
+            image=self.icons['file_start'],
+            compound=tk.LEFT
+        )
+        tools_menu.add_command(
+            label="Auto Balance (Parallel)",
+            command=self._event('<<ToolsAutoBalanceParallel>>'),
+            image=self.icons['file_start'],
+            compound=tk.LEFT
+        )
+        tools_menu.add_separator()
+        tools_menu.add_command(
+            label="Load Offsets...",
+            command=self._event('<<ToolsLoadOffsets>>'),
+        )
+        tools_menu.add_command(
+            label="Clear Offsets",
+            command=self._event('<<ToolsClearOffsets>>'),
+        )
         # Add Tools menu to the menubar
         self.add_cascade(label="Tools", menu=tools_menu)
 
@@ -173,6 +204,14 @@ class MainMenu(tk.Menu):
     # Menu Functions #
     ##################
     # HELP menu
+    def set_auto_balance_state(self, state):
+        """ Enable or disable the auto balance commands. STATE is
+            'normal' or 'disabled'.
+        """
+        for label in ["Auto Balance", "Auto Balance (Parallel)"]:
+            self.tools_menu.entryconfigure(label, state=state)
+
+
     def show_about(self):
         """ Show the about dialog """
         about_message = self._app_info['name']
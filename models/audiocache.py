@@ -0,0 +1,99 @@
+""" Class for caching decoded audio files between presentations.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+from collections import OrderedDict
+import os
+import threading
+
+# Import audio packages
+import soundfile as sf
+
+
+#########
+# BEGIN #
+#########
+class DecodedAudioCache:
+    """ Least-recently-used cache of decoded float32 audio.
+
+        Entries are keyed by file path and validated against the
+        file's modification time and size on every lookup, so an
+        edited file is decoded again. Cached arrays are read-only.
+    """
+    def __init__(self, max_bytes=256 * 1024**2):
+        # Memory budget for all cached files
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+        # Counters for tuning the budget
+        self.hits = 0
+        self.misses = 0
+
+        # Path: (mtime_ns, size, signal, fs)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, path):
+        """ Return (signal, fs) for the file at PATH. Returns None if
+            the decoded file would not fit in the cache budget, in
+            which case it should be streamed from disk instead.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self._cache.get(path)
+            if (entry is not None) and \
+                (entry[0] == stat.st_mtime_ns) and (entry[1] == stat.st_size):
+                self.hits += 1
+                self._cache.move_to_end(path)
+                print(f"audiocache: Using cached {os.path.basename(path)} " +
+                      f"(hits: {self.hits}, misses: {self.misses})")
+                return entry[2], entry[3]
+
+        # Check the decoded size before reading the file
+        info = sf.info(path)
+        nbytes = info.frames * info.channels * np.dtype(np.float32).itemsize
+        if nbytes > self.max_bytes:
+            print(f"audiocache: {os.path.basename(path)} exceeds the " +
+                  "cache budget")
+            return None
+
+        signal, fs = sf.read(path, dtype='float32')
+        signal.setflags(write=False)
+
+        with self._lock:
+            self.misses += 1
+            print(f"audiocache: Decoded {os.path.basename(path)} " +
+                  f"(hits: {self.hits}, misses: {self.misses})")
+            self._store(path, (stat.st_mtime_ns, stat.st_size, signal, fs))
+        return signal, fs
+
+
+    def _store(self, path, entry):
+        """ Add ENTRY to the cache and evict least recently used
+            entries until the cache fits within the budget.
+        """
+        if path in self._cache:
+            self.nbytes -= self._cache.pop(path)[2].nbytes
+        self._cache[path] = entry
+        self.nbytes += entry[2].nbytes
+
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self.nbytes -= evicted[2].nbytes
+
+
+    def clear(self):
+        """ Remove all cached files. Counters are preserved.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.nbytes = 0
@@ -6,14 +6,13 @@
 ###########
 # Import data science packages
 import numpy as np
-
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-rcParams.update({'figure.autolayout': True})
+# NOTE: matplotlib is imported in plot_waveform to keep it out of
+# the startup path
 
 # Import system packages
 import os
 from pathlib import Path
+from functools import cached_property
 
 # Import audio packages
 import soundfile as sf
@@ -21,6 +20,7 @@ import sounddevice as sd
 
 # Import custom modules
 from exceptions import audio_exceptions
+from models import streammodel
 
 
 #########
@@ -32,13 +32,16 @@ class Audio:
 
     def __init__(self, audio, **kwargs):
         """ Create audio object using file path or signal array
-            audio: a Path object from pathlib, or a numpy array
-            kwargs: must provide a sampling rate when passing an array
+            audio: a Path object from pathlib, a numpy array, or a
+                streammodel.SequenceSource
+            kwargs: must provide a sampling rate when passing an array;
+                pass stream=True with a Path to stream the file from 
+                disk during playback instead of loading it
         """
-        import sounddevice as sd
-        
         # Assign public attributes
         self.audio = audio
+        self.stream = kwargs.get('stream', False)
+        self.source = None
 
         # Print message to console
         self.msg = "Begin Audio Event"
@@ -51,6 +54,13 @@ class Audio:
         if isinstance(audio, Path):
             self._import_wav_file()
 
+        # If AUDIO is a SequenceSource, present it block by block
+        elif isinstance(audio, streammodel.SequenceSource):
+            print("audiomodel: Found speaker sequence")
+            self.source = audio
+            self.signal = None
+            self.fs = audio.fs
+
         # If AUDIO is an array, assign it to signal
         # and grab provided sampling rate
         elif isinstance(audio, np.ndarray):
@@ -82,53 +92,122 @@ class Audio:
         if not file_exists:
             print("audiomodel: Audio file not found!")
             raise FileNotFoundError
+        elif self.stream:
+            # Open the file for streaming; samples are read during playback
+            self.source = streammodel.FileSource(self.audio)
+            self.signal = None
+            self.fs = self.source.fs
+            print(f"audiomodel: Streaming from disk")
+            print(f"audiomodel: Sampling rate: {self.fs}")
         else:
-            self.signal, self.fs = sf.read(self.audio)
+            self.signal, self.fs = sf.read(self.audio, dtype='float32')
             print(f"audiomodel: Sampling rate: {self.fs}")
 
 
+    def _load_source(self):
+        """ Read a streamed file into memory. Used when the file 
+            cannot be presented block by block.
+        """
+        print("audiomodel: Loading streamed file into memory")
+        self.signal = self.source.load()
+        self.source.close()
+        self.source = None
+
+
     def _get_audio_details(self):
-        # Get number of channels
-        try:
-            self.num_channels = self.signal.shape[1]
-        except IndexError:
-            self.num_channels = 1
-        self.channels = np.array(range(1, self.num_channels+1))
+        """ Print audio details. Details are computed lazily by the
+            properties below and cached on first access.
+        """
         print(f"audiomodel: Number of channels in signal: {self.num_channels}")
-
-        # Assign audio file attributes
-        self.dur = len(self.signal) / self.fs
-        self.t = np.arange(0, self.dur, 1/self.fs)
         print(f"audiomodel: Duration: {np.round(self.dur, 2)} seconds " +
             f"({np.round(self.dur/60, 2)} minutes)")
-
-        # Get data type
-        self.data_type = self.signal.dtype
         print(f"audiomodel: Data type: {self.data_type}")
         print("audiomodel: Done")
 
 
+    def _num_frames(self):
+        """ Number of samples per channel. """
+        if self.source is not None:
+            return self.source.frames
+        return len(self.signal)
+
+
+    @cached_property
+    def num_channels(self):
+        """ Number of channels in the signal. """
+        if self.source is not None:
+            return self.source.num_channels
+        try:
+            return self.signal.shape[1]
+        except IndexError:
+            return 1
+
+
+    @cached_property
+    def channels(self):
+        """ Array of 1-based channel numbers. """
+        return np.arange(1, self.num_channels+1)
+
+
+    @cached_property
+    def dur(self):
+        """ Signal duration in seconds. """
+        return self._num_frames() / self.fs
+
+
+    @cached_property
+    def data_type(self):
+        """ Data type of the signal. """
+        if self.source is not None:
+            return np.dtype(np.float32)
+        return self.signal.dtype
+
+
+    @cached_property
+    def t(self):
+        """ Time base in seconds, one value per sample. Only 
+            allocated when first used (e.g., for plotting).
+        """
+        t = np.arange(self._num_frames(), dtype=np.float64)
+        t /= self.fs
+        return t
+
+
     def stop(self):
         """ Stop audio presentation.
         """
-        sd.stop()
+        if getattr(self, 'engine', None) is not None:
+            self.engine.stop()
+        else:
+            sd.stop()
 
 
-    def play(self, level=None, device_id=None, routing=None):
+    def play(self, level=None, device_id=None, routing=None, engine=None):
         """ Assign device id. Truncate audio/routing, if necessary,
             based on number of audio device channels. Set level.
+
+            If a streammodel.StreamEngine is provided as ENGINE, the
+            audio is presented through its open stream instead of 
+            opening a new stream with sd.play, and the level is 
+            applied inside the stream callback.
+
+            A single float32 working buffer (self._buffer) is kept per
+            Audio object and reused by every call to play. Float32 
+            signals presented through an engine are not copied at all.
         """
         # Initialization
         self.level = level
         self.device_id = device_id
         self.routing = routing
+        self.engine = engine
 
         print("\naudiomodel: Preparing for playback...")
 
-        # Create a temporary audio file to modify
-        self.temp = self.signal.copy()
-        self.temp = self.temp.astype(np.float32)
-        print(f"audiomodel: Data type converted to {self.temp.dtype}")
+        # Streamed files need an engine and a level to be presented
+        # block by block; otherwise load them into memory
+        if (self.source is not None) and \
+            ((self.engine is None) or (self.level is None)):
+            self._load_source()
 
         # Assign default sounddevice settings
         try:
@@ -153,6 +232,10 @@ class Audio:
             print("audiomodel: Level caused clipping!")
             raise
 
+        # sd.play cannot apply a gain, so scale the working buffer
+        if self.engine is None:
+            self._apply_gain()
+
         # Truncate audio file channels and routing, if necessary, 
         # based on available audio device channels
         self._check_channels_and_routing()
@@ -160,7 +243,11 @@ class Audio:
         # Present audio
         print("audiomodel: Attempting to present audio")
         try:
-            sd.play(self.temp, mapping=self.routing)
+            if self.engine is not None:
+                self.engine.play(self.temp, self.fs, self.device_id,
+                                 self.routing, gain=self.gain)
+            else:
+                sd.play(self.temp, mapping=self.routing)
         except sd.PortAudioError:
             print(f"audiomodel: Cannot route to: {self.routing}!")
             raise audio_exceptions.InvalidRouting(
@@ -176,6 +263,13 @@ class Audio:
     def _set_defaults(self):
         """ Set default sounddevice settings based on provided values.
         """
+        # A stream engine manages its own device and sampling rate
+        if self.engine is not None:
+            self.engine.open(self.device_id, self.fs)
+            self.num_outputs = self.engine.num_outputs
+            print(f"audiomodel: Device outputs: {self.num_outputs}")
+            return
+
         # Assign audio device default
         try:
             sd.default.device = self.device_id
@@ -202,47 +296,104 @@ class Audio:
                 f"{self.num_channels - self.num_outputs} audio file channels")
             
             # Update audio file and channel routing dimensions to 
-            # match number of available audio device outputs
-            self.temp = self.temp[:, 0:self.num_outputs]
-            self.routing = self.routing[:self.temp.shape[1]]
+            # match number of available audio device outputs. Extra
+            # channels of a streamed file are dropped by the engine.
+            if self.source is None:
+                self.temp = self.temp[:, 0:self.num_outputs]
+            self.routing = self.routing[:self.num_outputs]
         
         print(f"audiomodel: Audio shape: {self.temp.shape}")
 
 
+    def _get_buffer(self):
+        """ Return the float32 working buffer, allocating it on first
+            use. The buffer is reused for every presentation.
+        """
+        if getattr(self, '_buffer', None) is None:
+            self._buffer = np.empty(self.signal.shape, dtype=np.float32)
+        return self._buffer
+
+
+    def _as_float32(self):
+        """ Return the signal as float32 without copying when possible.
+        """
+        if self.signal.dtype == np.float32:
+            return self.signal
+        buffer = self._get_buffer()
+        np.copyto(buffer, self.signal, casting='same_kind')
+        print(f"audiomodel: Data type converted to {buffer.dtype}")
+        return buffer
+
+
+    def _peak(self, sig):
+        """ Return the largest absolute sample value without 
+            allocating a temporary array.
+        """
+        if sig.size == 0:
+            return 0.0
+        return max(float(sig.max()), -float(sig.min()))
+
+
     def _set_level(self):  
-        """ Set presentation level and check for clipping.
+        """ Set presentation level. Creates self.temp, the float32 
+            audio to present, and self.gain, the scaling factor still 
+            to be applied to self.temp.
         """
         if self.level == None:
             # Normalize if no level is provided
             print("audiomodel: No level provided; normalizing to +/-1")
-            if self.num_channels > 1:
-                for chan in range(0, self.num_channels):
-                    # Remove DC offset
-                    self.temp[:, chan] = self.temp[:, chan] - np.mean(self.temp[:, chan])
-                    # Normalize
-                    self.temp[:, chan] = self.temp[:, chan] / np.max(np.abs(self.temp[:, chan]))
-                    # account for num channels
-                    self.temp[:, chan] = self.temp[:, chan] / self.num_channels 
-            elif self.num_channels == 1:
-                # Remove DC offset
-                self.temp = self.temp - np.mean(self.temp)
-                # Normalize
-                self.temp = self.temp / np.max(np.abs(self.temp))
-                # account for num channels
-                self.temp = self.temp / 1
+            buffer = self._get_buffer()
+            np.copyto(buffer, self.signal, casting='same_kind')
+            # Remove DC offset
+            buffer -= buffer.mean(axis=0)
+            # Normalize
+            buffer /= np.maximum(buffer.max(axis=0), -buffer.min(axis=0))
+            # account for num channels
+            buffer /= self.num_channels
+            self.temp = buffer
+            self.gain = 1.0
         else:
             # Convert level in dB to magnitude
             mag = self.db2mag(self.level)
             print(f"audiomodel: Adjusted Level (dB): {self.level}")
             print(f"audiomodel: Multiplying signal by: {np.round(mag,2)}")
-            # Apply scaling factor to self.temp
-            self.temp = self.temp * mag
+            if self.source is not None:
+                self.temp = self.source
+            else:
+                self.temp = self._as_float32()
+            self.gain = mag
+
+
+    def _apply_gain(self):
+        """ Scale self.temp by self.gain into the working buffer.
+        """
+        if self.gain == 1:
+            return
+        buffer = self._get_buffer()
+        np.multiply(self.temp, self.gain, out=buffer, casting='same_kind')
+        self.temp = buffer
+        self.gain = 1.0
 
 
     def _check_clipping(self):
-        """ Plot clipped waveform for visual inspection.
+        """ Raise an exception if the level will cause clipping.
         """
-        if np.max(np.abs(self.temp)) > 1:
+        # Use the cached peak of the unmodified signal when possible
+        if self.source is not None:
+            peak = self.source.peak()
+        elif self.temp is self.signal:
+            if getattr(self, '_signal_peak', None) is None:
+                self._signal_peak = self._peak(self.signal)
+            peak = self._signal_peak
+        else:
+            peak = self._peak(self.temp)
+
+        # Include channel gains applied by the engine
+        gain = self.gain
+        if getattr(self, 'engine', None) is not None:
+            gain *= float(self.engine.routing_gains(self.routing).max())
+
+        if peak * gain > 1:
             # Raise exception to prevent playback
             raise audio_exceptions.Clipping
 
@@ -250,10 +401,14 @@ class Audio:
     def plot_waveform(self, title=None):
         """ Plot all channels overlaid.
         """
-        # Create time base
-        dur = len(self.temp) / self.fs
-        t = np.arange(0, dur, 1/self.fs)
-        plt.plot(t, self.temp)
+        import matplotlib.pyplot as plt
+        from matplotlib import rcParams
+        rcParams.update({'figure.autolayout': True})
+
+        if self.source is not None:
+            self._load_source()
+            self.temp = self.signal
+        plt.plot(self.t, self.temp * self.gain)
         plt.title(title)
         plt.xlabel("Time (s)")
         plt.ylabel("Amplitude")
@@ -265,7 +420,8 @@ class Audio:
     ###########################
     # Signal Processing Funcs #
     ###########################
-    def db2mag(self, db):
+    @staticmethod
+    def db2mag(db):
         """ 
             Convert decibels to magnitude. Takes a single
             value or a list of values.
@@ -279,7 +435,8 @@ class Audio:
             return mag
 
 
-    def mag2db(self, mag):
+    @staticmethod
+    def mag2db(mag):
         """ 
             Convert magnitude to decibels. Takes a single
             value or a list of values.
@@ -292,7 +449,8 @@ class Audio:
             return db
 
 
-    def rms(self, sig):
+    @staticmethod
+    def rms(sig):
         """ 
             Calculate the root mean square of a signal. 
             
@@ -0,0 +1,336 @@
+""" Classes for automatic speaker balancing by simultaneously
+    playing a stimulus and recording a measurement microphone.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from exceptions import audio_exceptions
+from exceptions import speaker_exceptions
+from models.audiomodel import Audio
+
+
+############
+# Backends #
+############
+class SoundDeviceBackend:
+    """ Play and record at the same time on one audio device.
+    """
+    def __init__(self, device_id):
+        self.device_id = device_id
+
+
+    def playrec(self, signal, fs, output_channels, input_channel):
+        """ Present SIGNAL (samples x channels) on OUTPUT_CHANNELS
+            (1-based) and return the recording from INPUT_CHANNEL
+            as a 1-D array of the same length.
+        """
+        import sounddevice as sd
+        try:
+            recording = sd.playrec(
+                signal,
+                samplerate=fs,
+                device=self.device_id,
+                output_mapping=output_channels,
+                input_mapping=[input_channel],
+                dtype='float32',
+                blocking=True
+            )
+        except sd.PortAudioError:
+            print("autobalance: Invalid audio device!")
+            raise audio_exceptions.InvalidAudioDevice(self.device_id)
+        return recording[:, 0]
+
+
+class SimulatedRoom:
+    """ Loopback backend for testing without hardware. Each output
+        channel reaches the microphone with its own gain (dB) after
+        a delay (samples), plus optional background noise. DELAY is
+        a single value or one value per channel.
+    """
+    def __init__(self, gains_db, delay=0, noise_db=None, seed=0):
+        self.gains_db = np.asarray(gains_db, dtype=np.float64)
+        self.delays = np.broadcast_to(delay, self.gains_db.shape)
+        self.noise_db = noise_db
+        self.rng = np.random.default_rng(seed)
+
+
+    def playrec(self, signal, fs, output_channels, input_channel):
+        if signal.ndim == 1:
+            signal = signal.reshape(-1, 1)
+        chans = np.asarray(output_channels) - 1
+        gains = np.asarray(Audio.db2mag(self.gains_db[chans]))
+
+        # Delay each channel and keep the recording the same length
+        # as the signal
+        recording = np.zeros(len(signal))
+        for col, (gain, delay) in enumerate(zip(gains, self.delays[chans])):
+            recording[delay:] += gain * signal[:len(signal) - delay, col]
+
+        if self.noise_db is not None:
+            recording += Audio.db2mag(self.noise_db) * \
+                self.rng.standard_normal(len(recording))
+        return recording
+
+
+class MultitoneExcitation:
+    """ Frequency-interleaved multitone signals for measuring several
+        speakers at once. 
+
+        FFT bins between F_LO and F_HI are dealt out to the channels
+        in turn, so no two channels share a frequency. Each channel's
+        contribution can then be separated from a single microphone
+        recording by reading its own bins. Signals are periodic with
+        a period of DUR seconds, and each channel uses Schroeder
+        phases to keep its crest factor low.
+    """
+    def __init__(self, num_channels, fs=48000, dur=1.0, f_lo=100, 
+                 f_hi=10000):
+        self.num_channels = num_channels
+        self.fs = fs
+        self.N = int(dur * fs)
+
+        # Assign bins to channels
+        k_lo = max(int(np.ceil(f_lo * self.N / fs)), 1)
+        k_hi = min(int(f_hi * self.N / fs), self.N // 2 - 1)
+        if (k_hi - k_lo + 1) < num_channels:
+            raise ValueError("autobalance: Not enough frequency bins " +
+                             f"for {num_channels} channels")
+        bins = np.arange(k_lo, k_hi + 1)
+        self.bins = [bins[ii::num_channels] for ii in range(num_channels)]
+
+        # One period of each channel's signal, normalized to +/-1
+        spectra = np.zeros((self.N // 2 + 1, num_channels), dtype=complex)
+        for ii, k in enumerate(self.bins):
+            m = np.arange(1, len(k) + 1)
+            spectra[k, ii] = np.exp(-1j * np.pi * m * (m - 1) / len(k))
+        self.signal = np.fft.irfft(spectra, n=self.N, axis=0)
+        self.signal /= np.abs(self.signal).max(axis=0)
+
+
+    def make(self, prefix):
+        """ Return one period preceded by PREFIX samples of cyclic
+            prefix. The prefix lets the room reach steady state
+            before the analyzed period starts.
+        """
+        prefix = min(prefix, self.N)
+        reps = np.concatenate([self.signal[self.N - prefix:], self.signal])
+        return reps.astype(np.float32)
+
+
+    def separate(self, recording, played):
+        """ Return the power gain (linear) from each channel to the 
+            microphone, using one period of RECORDING and the 
+            signals as PLAYED (one period, after any level gain).
+        """
+        rec = np.fft.rfft(recording[:self.N])
+        ref = np.fft.rfft(played[:self.N], axis=0)
+        gains = np.empty(self.num_channels)
+        for ii, k in enumerate(self.bins):
+            gains[ii] = np.sum(np.abs(rec[k])**2) / \
+                np.sum(np.abs(ref[k, ii])**2)
+        return gains
+
+
+##################
+# Auto Balancing #
+##################
+class AutoBalancer:
+    """ Measure each speaker with a microphone and feed the levels
+        to a SpeakerWrangler.
+
+        Levels are converted to dB SPL as dB FS + SLM_OFFSET (from
+        CalModel). Offsets are relative to the first speaker, so they
+        do not depend on the absolute accuracy of SLM_OFFSET.
+
+        If ANALYZER (a bandanalysis.BandAnalyzer) is given, levels
+        are frequency weighted and band levels of each speaker are
+        kept for band_offsets(). Band offsets are for reporting 
+        only: saved offsets and playback gains are broadband, and
+        run_parallel() does not measure bands.
+
+        CHANNEL_GAINS (from offsetmodel.OffsetGains) are applied to
+        each speaker, so previously saved offsets can be validated 
+        by measuring again. The applied gain is subtracted from each
+        measured level, so the SpeakerWrangler still gets absolute
+        offsets that can be saved as a new offsets file. What is
+        left to correct on top of the saved offsets is kept in 
+        residuals.
+    """
+    def __init__(self, backend, speakers, slm_offset, fs=48000,
+                 input_channel=1, settle=0.1, analyzer=None,
+                 channel_gains=None):
+        self.backend = backend
+        self.speakers = speakers
+        self.slm_offset = slm_offset
+        self.fs = fs
+        self.input_channel = input_channel
+        # Seconds of recording to discard (latency and onset)
+        self.settle = settle
+
+        self.channel_gains = channel_gains
+        self.analyzer = analyzer
+        if analyzer is not None:
+            analyzer.slm_offset = slm_offset
+        # Channel: band levels (dB SPL) of the last measurement
+        self.band_levels = {}
+        self._last_bands = None
+        # Channel: new offset minus applied offset (dB), when 
+        # measuring with CHANNEL_GAINS
+        self.residuals = {}
+
+
+    def _get_gains(self, num_speakers):
+        """ Return channel gains for NUM_SPEAKERS speakers. """
+        gains = np.ones(num_speakers, dtype=np.float32)
+        if self.channel_gains is not None:
+            n = min(num_speakers, len(self.channel_gains))
+            gains[:n] = self.channel_gains[:n]
+        return gains
+
+
+    def _update_residuals(self, channels, applied_db):
+        """ Store how far the new offsets of CHANNELS are from the
+            applied offsets APPLIED_DB.
+        """
+        if self.channel_gains is None:
+            return
+        for channel in channels:
+            residual = np.round(
+                self.speakers.offsets[channel] - applied_db[channel], 1)
+            self.residuals[channel] = residual
+            print(f"autobalance: Speaker {channel + 1}: residual " +
+                  f"{residual} dB")
+
+
+    def measure_level(self, recording):
+        """ Return the level of RECORDING in dB SPL. """
+        start = int(self.settle * self.fs)
+        if start >= len(recording):
+            start = 0
+        if self.analyzer is None:
+            return Audio.mag2db(Audio.rms(recording[start:])) + \
+                self.slm_offset
+
+        level, bands = self.analyzer.analyze(recording[start:])
+        self._last_bands = bands[:, 0]
+        return level[0]
+
+
+    def measure_channel(self, signal, channel):
+        """ Present SIGNAL on CHANNEL (1-based) and return the
+            measured level in dB SPL.
+        """
+        recording = self.backend.playrec(
+            signal.reshape(-1, 1), self.fs, [channel], self.input_channel)
+        return self.measure_level(recording)
+
+
+    def run(self, signal, level, num_speakers, progress=None):
+        """ Measure speakers 1 to NUM_SPEAKERS with SIGNAL presented
+            at LEVEL (dB FS) and update the SpeakerWrangler.
+
+            PROGRESS, if given, is called as progress(channel,
+            slm_level, offset) after each speaker (0-based channel).
+        """
+        gain = Audio.db2mag(level)
+        channel_gains = self._get_gains(num_speakers)
+        if np.max(np.abs(signal)) * gain * channel_gains.max() > 1:
+            print("autobalance: Level caused clipping!")
+            raise audio_exceptions.Clipping
+        signal = (signal * gain).astype(np.float32)
+        applied_db = 20 * np.log10(channel_gains)
+
+        for channel in range(0, num_speakers):
+            # Level without the applied gain
+            slm_level = np.round(self.measure_channel(
+                signal * channel_gains[channel], channel + 1) - 
+                applied_db[channel], 1)
+            print(f"autobalance: Speaker {channel + 1}: {slm_level} dB SPL")
+            self.speakers.calc_offset(channel=channel, slm_level=slm_level)
+            if self._last_bands is not None:
+                self.band_levels[channel] = \
+                    self._last_bands - applied_db[channel]
+            self._update_residuals([channel], applied_db)
+            if progress is not None:
+                progress(channel, slm_level,
+                         self.speakers.speaker_list[channel].offset)
+
+
+    def band_offsets(self):
+        """ Return per-band offsets (dB) of each measured speaker
+            relative to the first speaker, as an array of shape
+            (speakers, bands). Bands are listed in analyzer.centers.
+        """
+        if 0 not in self.band_levels:
+            # Speaker 1 has no band levels
+            raise speaker_exceptions.MissingReference
+        channels = sorted(self.band_levels)
+        levels = np.array([self.band_levels[chan] for chan in channels])
+        return np.round(levels[0] - levels, 1)
+
+
+    def band_report(self):
+        """ Return a table of per-band offsets for printing. """
+        offsets = self.band_offsets()
+        centers = self.analyzer.centers
+        lines = ["Speaker " + "".join(
+            f"{fc:>8.0f}" for fc in centers)]
+        for channel, row in zip(sorted(self.band_levels), offsets):
+            lines.append(f"{channel + 1:>7} " + "".join(
+                f"{val:>8.1f}" for val in row))
+        return "\n".join(lines)
+
+
+    def run_parallel(self, level, num_speakers, dur=1.0, progress=None):
+        """ Measure speakers 1 to NUM_SPEAKERS at the same time with
+            frequency-interleaved multitones presented at LEVEL 
+            (dB FS) and update the SpeakerWrangler.
+
+            Each level is reported as the dB SPL the speaker would 
+            produce playing its own multitone alone, so offsets 
+            match a sequential run in a flat room. Takes about 
+            DUR + SETTLE seconds regardless of NUM_SPEAKERS. Levels 
+            are unweighted; ANALYZER is only used by run().
+        """
+        excitation = MultitoneExcitation(num_speakers, fs=self.fs, dur=dur)
+        prefix = int(self.settle * self.fs)
+        signal = excitation.make(prefix) * Audio.db2mag(level)
+        channel_gains = self._get_gains(num_speakers)
+        signal *= channel_gains
+        if np.max(np.abs(signal)) > 1:
+            print("autobalance: Level caused clipping!")
+            raise audio_exceptions.Clipping
+
+        recording = self.backend.playrec(
+            signal, self.fs, list(range(1, num_speakers + 1)), 
+            self.input_channel)
+
+        if self.analyzer is not None:
+            print("autobalance: Band levels are not measured in " +
+                  "parallel mode")
+
+        # Analyze the period after the cyclic prefix
+        played = signal[prefix:]
+        power_gains = excitation.separate(recording[prefix:], played)
+        rms = np.sqrt(np.mean(np.square(played, dtype=np.float64), axis=0))
+        # Levels without the applied gains
+        levels = np.asarray(Audio.mag2db(np.sqrt(power_gains) * rms)) + \
+            self.slm_offset - 20 * np.log10(channel_gains)
+
+        # Update all speakers at once
+        slm_levels = np.round(levels, 1)
+        self.speakers.calc_offset(channel=np.arange(num_speakers),
+                                  slm_level=slm_levels)
+        self._update_residuals(range(num_speakers),
+                               20 * np.log10(channel_gains))
+        for channel in range(0, num_speakers):
+            print(f"autobalance: Speaker {channel + 1}: " +
+                  f"{slm_levels[channel]} dB SPL")
+            if progress is not None:
+                progress(channel, slm_levels[channel],
+                         self.speakers.offsets[channel])
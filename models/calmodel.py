@@ -12,6 +12,7 @@ import os
 
 # Import custom modules
 from app_assets import audio
+from models import audiocache
 
 
 #########
@@ -20,38 +21,51 @@ from app_assets import audio
 class CalModel:
     """ Write provided dictionary to .csv
     """
-    def __init__(self, sessionpars):
-        self.sessionpars = sessionpars
+    def __init__(self, params):
+        """ PARAMS: a sessionmodel.SessionParams object """
+        self.params = params
+
+        # Decoded calibration audio, reused between presentations
+        self.audio_cache = audiocache.DecodedAudioCache()
 
 
     def get_cal_file(self):
         """ Load specified calibration file
         """
         print("calmodel: Locating calibration file...")
-        if self.sessionpars['cal_file'].get() == 'cal_stim.wav':
+        if self.params.cal_file == 'cal_stim.wav':
             self.cal_file = audio.CALSTIM_WAV
             file_exists = os.access(self.cal_file, os.F_OK)
             if not file_exists:
                 raise AttributeError
         else: # Custom file was provided
-            self.cal_file = self.sessionpars['cal_file'].get()
+            self.cal_file = self.params.cal_file
 
         print(f"calmodel: Using {self.cal_file}")
 
 
+    def get_cal_audio(self):
+        """ Return (signal, fs) for the calibration file, decoding it
+            only if it is not cached or has changed on disk. Returns
+            None if the file is too large to cache.
+        """
+        self.get_cal_file()
+        return self.audio_cache.get(self.cal_file)
+
+
     def calc_offset(self):
         """ Calculate adjusted presentation level
         """
         # Calculate SLM offset
         print("\ncalmodel: Calculating new presentation level...")
-        slm_offset = self.sessionpars['slm_reading'].get() - self.sessionpars['cal_level_dB'].get()
-        self.sessionpars['slm_offset'].set(slm_offset)
+        slm_offset = self.params.slm_reading - self.params.cal_level_dB
+        self.params.slm_offset = slm_offset
         # Provide console feedback
         print(f"calmodel: Starting level (dB FS): " +
-              f"{self.sessionpars['cal_level_dB'].get()}")
+              f"{self.params.cal_level_dB}")
         print(f"calmodel: SLM reading (dB): " +
-              f"{self.sessionpars['slm_reading'].get()}")
-        print(f"calmodel: SLM offset: {self.sessionpars['slm_offset'].get()}")
+              f"{self.params.slm_reading}")
+        print(f"calmodel: SLM offset: {self.params.slm_offset}")
 
         # SLM offset not yet saved!
         # This must happen in controller using: self._save_sessionpars()
@@ -59,14 +73,14 @@ class CalModel:
 
     def calc_level(self, desired_level_dB):
         # Calculate presentation level
-        self.sessionpars['desired_level_dB'].set(desired_level_dB)
-        scaled_level = desired_level_dB - self.sessionpars['slm_offset'].get()
-        self.sessionpars['adjusted_level_dB'].set(scaled_level)
+        self.params.desired_level_dB = desired_level_dB
+        scaled_level = desired_level_dB - self.params.slm_offset
+        self.params.adjusted_level_dB = scaled_level
         print(f"\ncalmodel: Desired level in dB: " +
-              f"{self.sessionpars['desired_level_dB'].get()}")
-        print(f"calmodel: SLM offset: {self.sessionpars['slm_offset'].get()}")
+              f"{self.params.desired_level_dB}")
+        print(f"calmodel: SLM offset: {self.params.slm_offset}")
         print(f"calmodel: Adjusted level (dB): " +
-            f"{self.sessionpars['adjusted_level_dB'].get()}")
+            f"{self.params.adjusted_level_dB}")
 
         # Calculated level not yet saved! 
         # This must happen in controller using: self._save_sessionpars()
@@ -4,8 +4,8 @@
 ############
 # IMPORTS  #
 ############
-# GUI packages
-from tkinter import filedialog
+# NOTE: tkinter.filedialog is imported in _get_save_path so the
+# model can be used without a GUI
 
 # System packages
 import csv
@@ -20,9 +20,9 @@ import os
 class CSVModel:
     """ Write provided dictionary to .csv
     """
-    def __init__(self, sessionpars):
+    def __init__(self, params):
         # Assign attribute values
-        self.sessionpars = sessionpars
+        self.params = params
 
 
     def _create_file_name(self):
@@ -36,6 +36,8 @@ class CSVModel:
 
     def _get_save_path(self, file_name):
         """ Prompt user for save directory. """
+        from tkinter import filedialog
+
         # # Get file path
         # file_path = filedialog.asksaveasfile(
         #     initialfile = file_name,
@@ -75,16 +77,20 @@ class CSVModel:
             raise PermissionError(msg)
 
 
-    def save_record(self, data):
-        """ Save a dictionary of data to .csv file 
+    def save_record(self, data, file_path=None):
+        """ Save a dictionary of data to .csv file. If FILE_PATH is
+            not provided, the user is prompted for one. Returns the
+            path written, or None if the prompt was cancelled.
         """
-        # Create file name
-        file_name = self._create_file_name()
+        if file_path is None:
+            # Create file name
+            file_name = self._create_file_name()
 
-        # Get directory for saving the file
-        file_path = self._get_save_path(file_name=file_name)
-        if not file_path:
-            return
+            # Get directory for saving the file
+            file_path = self._get_save_path(file_name=file_name)
+            if not file_path:
+                return
+        file_path = Path(file_path)
 
         # Check write access
         self._check_write_access(file_path)
@@ -102,3 +108,4 @@ class CSVModel:
                 csvwriter.writerow([key, value])
 
         print("\ncsvmodel: Record successfully saved!")
+        return file_path
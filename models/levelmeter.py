@@ -0,0 +1,266 @@
+""" Streaming level meter for measurement microphone input.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import threading
+
+# Import custom modules
+from exceptions import audio_exceptions
+from models.audiomodel import Audio
+
+
+###############
+# Level Meter #
+###############
+class LevelMeter:
+    """ Running level statistics for one or more input channels.
+
+        Blocks of samples are written into a fixed-size ring buffer
+        of WINDOW seconds. Each block updates:
+            rms: RMS over the ring buffer window
+            leq: equivalent continuous level since reset
+            peak: largest absolute sample since reset
+            fast/slow: exponential time weighting (125 ms / 1 s)
+
+        All buffers are allocated up front, so process() does not
+        allocate for blocks up to MAX_BLOCKSIZE frames. Levels are
+        reported in dB SPL as dB FS + SLM_OFFSET.
+    """
+    # Time constants (s)
+    FAST = 0.125
+    SLOW = 1.0
+
+    # Recalculate the window sum after this many ring buffer wraps
+    # to stop floating point drift
+    RESUM_WRAPS = 16
+
+    def __init__(self, num_channels=1, fs=48000, window=1.0,
+                 slm_offset=0.0, max_blocksize=4096):
+        self.num_channels = num_channels
+        self.fs = fs
+        self.slm_offset = slm_offset
+
+        # Ring buffer of squared samples
+        self.size = int(window * fs)
+        self._ring = np.zeros((self.size, num_channels), dtype=np.float32)
+        self._scratch = np.zeros((max_blocksize, num_channels), 
+                                 dtype=np.float32)
+
+        # Per-channel working arrays
+        self._block_sum = np.zeros(num_channels)
+        self._tmp = np.zeros(num_channels)
+        self._lock = threading.Lock()
+
+        # Block size: (fast alpha, slow alpha)
+        self._alphas = {}
+
+        self.reset()
+
+
+    def reset(self):
+        """ Clear all running statistics. """
+        with self._lock:
+            self._ring.fill(0)
+            self._pos = 0
+            self._wraps = 0
+            self._filled = 0
+            self._window_sum = np.zeros(self.num_channels)
+            self._total_sum = np.zeros(self.num_channels)
+            self._total_frames = 0
+            self._peak_sq = np.zeros(self.num_channels)
+            self._fast = np.zeros(self.num_channels)
+            self._slow = np.zeros(self.num_channels)
+
+
+    def _get_alphas(self, frames):
+        """ Return exponential weighting coefficients for a block
+            of FRAMES samples.
+        """
+        try:
+            return self._alphas[frames]
+        except KeyError:
+            dt = frames / self.fs
+            alphas = (np.exp(-dt / self.FAST), np.exp(-dt / self.SLOW))
+            self._alphas[frames] = alphas
+            return alphas
+
+
+    def process(self, block):
+        """ Update statistics with BLOCK (frames x channels). """
+        frames = len(block)
+        if frames == 0:
+            return
+        if frames > len(self._scratch):
+            self._scratch = np.zeros((frames, self.num_channels),
+                                     dtype=np.float32)
+        sq = self._scratch[:frames]
+        tmp = self._tmp
+
+        with self._lock:
+            np.square(block, out=sq)
+            np.sum(sq, axis=0, dtype=np.float64, out=self._block_sum)
+
+            # Peak (stored squared)
+            np.max(sq, axis=0, out=tmp)
+            np.maximum(self._peak_sq, tmp, out=self._peak_sq)
+
+            # Leq
+            self._total_sum += self._block_sum
+            self._total_frames += frames
+
+            # Fast/slow: block mean square weighted at the block rate
+            a_fast, a_slow = self._get_alphas(frames)
+            self._fast *= a_fast
+            np.multiply(self._block_sum, (1 - a_fast) / frames, out=tmp)
+            self._fast += tmp
+            self._slow *= a_slow
+            np.multiply(self._block_sum, (1 - a_slow) / frames, out=tmp)
+            self._slow += tmp
+
+            # Window: replace the oldest squared samples in the ring
+            self._write_ring(sq)
+
+
+    def _write_ring(self, sq):
+        """ Copy squared samples into the ring buffer and update the
+            window sum. Only the latest SIZE samples are kept.
+        """
+        if len(sq) > self.size:
+            sq = sq[-self.size:]
+        frames = len(sq)
+        tmp = self._tmp
+
+        first = min(frames, self.size - self._pos)
+        segments = ((self._pos, 0, first), (0, first, frames - first))
+        for start, offset, n in segments:
+            if n == 0:
+                continue
+            ring = self._ring[start:start + n]
+            self._window_sum -= np.sum(ring, axis=0, dtype=np.float64, 
+                                       out=tmp)
+            ring[:] = sq[offset:offset + n]
+            self._window_sum += np.sum(ring, axis=0, dtype=np.float64, 
+                                       out=tmp)
+
+        self._filled = min(self._filled + frames, self.size)
+        wrapped = self._pos + frames >= self.size
+        self._pos = (self._pos + frames) % self.size
+        if wrapped:
+            self._wraps += 1
+            if self._wraps >= self.RESUM_WRAPS:
+                np.sum(self._ring, axis=0, dtype=np.float64, 
+                       out=self._window_sum)
+                self._wraps = 0
+
+
+    def _to_db(self, mag):
+        """ Convert magnitude to dB SPL. Silence is -inf. """
+        with np.errstate(divide='ignore'):
+            return np.asarray(Audio.mag2db(mag)) + self.slm_offset
+
+
+    @property
+    def rms(self):
+        """ RMS level over the window (dB SPL). """
+        with self._lock:
+            ms = self._window_sum / max(self._filled, 1)
+        return self._to_db(np.sqrt(np.maximum(ms, 0)))
+
+
+    @property
+    def leq(self):
+        """ Equivalent continuous level since reset (dB SPL). """
+        with self._lock:
+            ms = self._total_sum / max(self._total_frames, 1)
+        return self._to_db(np.sqrt(ms))
+
+
+    @property
+    def peak(self):
+        """ Largest absolute sample since reset (dB SPL). """
+        with self._lock:
+            return self._to_db(np.sqrt(self._peak_sq))
+
+
+    @property
+    def fast(self):
+        """ Fast (125 ms) time-weighted level (dB SPL). """
+        with self._lock:
+            return self._to_db(np.sqrt(self._fast))
+
+
+    @property
+    def slow(self):
+        """ Slow (1 s) time-weighted level (dB SPL). """
+        with self._lock:
+            return self._to_db(np.sqrt(self._slow))
+
+
+################
+# Input Stream #
+################
+class MeterStream:
+    """ Feed a LevelMeter from input channels of an audio device.
+
+        CHANNELS are 1-based device input channels.
+    """
+    def __init__(self, meter, device_id, channels, fs=48000, blocksize=1024):
+        self.meter = meter
+        self.device_id = device_id
+        self.channels = channels
+        self.fs = fs
+        self.blocksize = blocksize
+        self.stream = None
+
+        # Use a slice (a view) for consecutive channels; otherwise
+        # gather the channels into a preallocated buffer
+        cols = [chan - 1 for chan in channels]
+        if cols == list(range(cols[0], cols[-1] + 1)):
+            self._cols = slice(cols[0], cols[-1] + 1)
+            self._gather = None
+        else:
+            self._cols = np.array(cols, dtype=np.intp)
+            self._gather = np.zeros((blocksize, len(cols)), dtype=np.float32)
+
+
+    def _callback(self, indata, frames, time_info, status):
+        if self._gather is None:
+            self.meter.process(indata[:, self._cols])
+            return
+        if frames > len(self._gather):
+            self._gather = np.zeros((frames, len(self._cols)), 
+                                    dtype=np.float32)
+        block = self._gather[:frames]
+        np.take(indata, self._cols, axis=1, out=block)
+        self.meter.process(block)
+
+
+    def start(self):
+        """ Open the input stream and start metering. """
+        import sounddevice as sd
+        try:
+            self.stream = sd.InputStream(
+                samplerate=self.fs,
+                device=self.device_id,
+                channels=max(self.channels),
+                dtype='float32',
+                blocksize=self.blocksize,
+                callback=self._callback
+            )
+        except (sd.PortAudioError, ValueError):
+            print("levelmeter: Invalid audio device!")
+            raise audio_exceptions.InvalidAudioDevice(self.device_id)
+        self.stream.start()
+
+
+    def stop(self):
+        """ Stop metering and close the input stream. """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
@@ -0,0 +1,47 @@
+""" Class for generating seeded noise signals with NumPy.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+
+#########
+# BEGIN #
+#########
+class NoiseGenerator:
+    """ Generate reproducible noise signals as float32 arrays.
+
+        Each call creates a fresh generator from SEED, so repeated
+        calls with the same arguments return identical signals (the
+        same guarantee the original random.seed(4) approach gave).
+    """
+    def __init__(self, seed=4):
+        self.seed = seed
+
+
+    def wgn(self, dur, fs, num_channels=1):
+        """ Generate white Gaussian noise.
+
+            DUR: duration in seconds
+            FS: sampling rate
+            NUM_CHANNELS: number of independent noise channels
+
+            Returns a 1-D array for a single channel, or an array
+            of shape (samples, NUM_CHANNELS). Each channel has its
+            DC offset removed and is normalized to +/-1.
+        """
+        r = int(dur * fs)
+        rng = np.random.default_rng(self.seed)
+        noise = rng.standard_normal((r, num_channels), dtype=np.float32)
+
+        # Remove DC offset and normalize each channel in place
+        if r > 0:
+            noise -= noise.mean(axis=0)
+            noise /= np.maximum(noise.max(axis=0), -noise.min(axis=0))
+
+        if num_channels == 1:
+            return noise[:, 0]
+        return noise
@@ -0,0 +1,74 @@
+""" Class for loading saved speaker offsets as playback gains.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import csv
+import os
+import threading
+
+
+#########
+# BEGIN #
+#########
+def read_offsets(path):
+    """ Read an offsets file written by CSVModel.save_record. Returns
+        a dictionary of channel (0-based speaker number): offset (dB).
+        Missing offsets are None.
+    """
+    offsets = {}
+    with open(path, newline='') as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        if header != ["Channel", "Offset"]:
+            raise ValueError(f"offsetmodel: Not an offsets file: {path}")
+        for row in reader:
+            if not row:
+                continue
+            channel, offset = row
+            offsets[int(channel)] = float(offset) if offset.strip() else None
+    return offsets
+
+
+class OffsetGains:
+    """ Cache of per-channel gain vectors loaded from offsets files.
+
+        Each offset (dB) is converted to a linear gain once, and the
+        vector is reused until the file changes. Index 0 is the gain
+        of speaker 1 (output channel 1). Missing offsets have a gain
+        of 1. Returned vectors are read-only float32 arrays.
+    """
+    def __init__(self):
+        # Path: (mtime_ns, size, gains)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+
+    def load(self, path):
+        """ Return the gain vector for the offsets file at PATH. """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self._cache.get(path)
+            if (entry is not None) and \
+                (entry[0] == stat.st_mtime_ns) and (entry[1] == stat.st_size):
+                return entry[2]
+
+        offsets = read_offsets(path)
+        gains = np.ones(max(offsets, default=-1) + 1, dtype=np.float32)
+        for channel, offset in offsets.items():
+            if offset is not None:
+                gains[channel] = 10**(offset / 20)
+        gains.setflags(write=False)
+        print(f"offsetmodel: Loaded {len(offsets)} offsets from " +
+              f"{os.path.basename(path)}")
+
+        with self._lock:
+            self._cache[path] = (stat.st_mtime_ns, stat.st_size, gains)
+        return gains
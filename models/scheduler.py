@@ -0,0 +1,156 @@
+""" asyncio scheduler for multi-step measurement sequences.
+
+    Each step (e.g., one speaker's stimulus, measure and settle
+    phases) is a coroutine. Steps run one after another on an
+    asyncio event loop that the Tk main loop drives with after(),
+    so coroutines run on the Tk thread and may update the UI
+    directly. Waiting is done with awaits rather than blocking
+    calls, so the GUI stays responsive.
+
+    The sequence can be paused (before its next step), resumed
+    and cancelled, and each step can have a timeout.
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+import asyncio
+
+
+#########
+# BEGIN #
+#########
+class MeasurementScheduler:
+    """ Run a sequence of coroutine steps on an asyncio loop driven
+        by ROOT.after() every INTERVAL ms.
+
+        state: 'idle', 'running', 'paused', 'cancelled', 'failed'
+        or 'finished'
+    """
+    def __init__(self, root, interval=10):
+        self.root = root
+        self.interval = interval
+        self.loop = asyncio.new_event_loop()
+        self.task = None
+        self.state = 'idle'
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._after_id = None
+
+
+    @property
+    def busy(self):
+        return (self.task is not None) and (not self.task.done())
+
+
+    def start(self, steps, timeout=None, on_done=None):
+        """ Run STEPS, a list of coroutine functions taking no
+            arguments, in order. Each step is cancelled if it takes
+            longer than TIMEOUT seconds. ON_DONE(state, error) is
+            called when the sequence ends.
+        """
+        if self.busy:
+            raise RuntimeError("scheduler: A sequence is already running")
+        self._resume.set()
+        self.state = 'running'
+        self.task = self.loop.create_task(
+            self._run(steps, timeout, on_done))
+        self._schedule()
+
+
+    async def _run(self, steps, timeout, on_done):
+        error = None
+        try:
+            for step in steps:
+                await self.checkpoint()
+                await asyncio.wait_for(step(), timeout)
+            self.state = 'finished'
+        except asyncio.CancelledError:
+            self.state = 'cancelled'
+        except asyncio.TimeoutError as e:
+            print("scheduler: Step timed out!")
+            self.state = 'failed'
+            error = e
+        except Exception as e:
+            print(f"scheduler: Step failed: {e}")
+            self.state = 'failed'
+            error = e
+        print(f"scheduler: Sequence {self.state}")
+        if on_done:
+            on_done(self.state, error)
+
+
+    async def checkpoint(self):
+        """ Wait here while paused. """
+        await self._resume.wait()
+
+
+    async def wait_for_event(self, event, poll=0.01):
+        """ Wait without blocking until threading.Event EVENT is set. """
+        while not event.is_set():
+            await asyncio.sleep(poll)
+
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+    def pause(self):
+        """ Pause the sequence before its next step. Time spent
+            paused does not count toward step timeouts.
+        """
+        if self.busy and self.state == 'running':
+            self._resume.clear()
+            self.state = 'paused'
+            print("scheduler: Paused")
+
+
+    def resume(self):
+        if self.busy and self.state == 'paused':
+            self._resume.set()
+            self.state = 'running'
+            print("scheduler: Resumed")
+
+
+    def cancel(self):
+        """ Cancel the running step and the rest of the sequence. """
+        if self.busy:
+            self.task.cancel()
+            self._resume.set()
+
+
+    #############
+    # Tk Driver #
+    #############
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval, self._tick)
+
+
+    def _tick(self):
+        """ Run the callbacks that are ready, then reschedule while
+            the sequence is running.
+        """
+        self._after_id = None
+        # A step showing a dialog runs a nested Tk loop, which can
+        # call this while the event loop is still running
+        if self.loop.is_running():
+            self._schedule()
+            return
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if self.busy:
+            self._schedule()
+
+
+    def close(self):
+        """ Cancel any sequence and close the event loop. """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.busy:
+            self.task.cancel()
+            self.loop.run_until_complete(asyncio.gather(
+                self.task, return_exceptions=True))
+        self.loop.close()
@@ -5,8 +5,11 @@
 # IMPORTS  #
 ############
 # Import system packages
+import dataclasses
 from pathlib import Path
 import os
+import tempfile
+import threading
 
 # Import data handling packages
 import json
@@ -15,6 +18,10 @@ import json
 #########
 # BEGIN #
 #########
+# Python type for each field type name
+TYPES = {'bool': bool, 'str': str, 'int': int, 'float': float}
+
+
 class SessionParsModel:
     # Define dictionary items
     fields = {
@@ -28,6 +35,8 @@ class SessionParsModel:
         # Audio device variables
         'audio_device': {'type': 'int', 'value': 999},
         'channel_routing': {'type': 'str', 'value': '1'},
+        'mic_channel': {'type': 'int', 'value': 1},
+        'offsets_file': {'type': 'str', 'value': ''},
 
         # Calibration variables
         'cal_file': {'type': 'str', 'value': 'cal_stim.wav'},
@@ -39,6 +48,14 @@ class SessionParsModel:
         'adjusted_level_dB': {'type': 'float', 'value': -25.0},
         'desired_level_dB': {'type': 'float', 'value': 75},
 
+        # Gapless offset test variables
+        'test_gap': {'type': 'float', 'value': 0.0},
+        'test_ramp': {'type': 'float', 'value': 0.01},
+
+        # Analysis variables
+        'weighting': {'type': 'str', 'value': 'Z'},
+        'band_fraction': {'type': 'int', 'value': 1},
+
         # Version control variables
         'config_file_status': {'type': 'int', 'value': 0},
         'check_for_updates': {'type': 'str', 'value': 'yes'},
@@ -50,6 +67,13 @@ class SessionParsModel:
         # Assign variables
         self._app_info = _app_info
 
+        # Keys changed since the last save
+        self._dirty = set()
+
+        # Pending debounced save
+        self._timer = None
+        self._lock = threading.RLock()
+
         # Create session parameters file name
         filename = 'config.json'
 
@@ -98,17 +122,72 @@ class SessionParsModel:
                 self.fields[key]['value'] = raw_value
 
 
-    def save(self):
-        """ Save current session parameters to file 
+    @property
+    def dirty(self):
+        """ Set of keys changed since the last save. """
+        return set(self._dirty)
+
+
+    def save(self, force=False):
+        """ Save current session parameters to file, if any have 
+            changed since the last save, the file does not exist 
+            yet, or FORCE is True.
+
+            The file is written to a temporary file in the same 
+            directory and renamed over the old file, so a crash 
+            mid-write never leaves a truncated config file.
+        """
+        with self._lock:
+            self._cancel_timer()
+            if not (self._dirty or force or not self.filepath.exists()):
+                return False
+
+            print("sessionmodel: Writing changed session pars to file: " +
+                  f"{sorted(self._dirty)}")
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.filepath.parent, prefix='.config_', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as fh:
+                    json.dump(self.fields, fh)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                os.replace(temp_path, self.filepath)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            self._dirty.clear()
+            return True
+
+
+    def save_later(self, delay=1.0):
+        """ Save after DELAY seconds. Each call restarts the delay, so
+            a burst of changes results in a single write.
         """
-        # Write to JSON file
-        #print("sessionmodel: Writing session pars from model to file...")
-        with open(self.filepath, 'w') as fh:
-            json.dump(self.fields, fh)
+        with self._lock:
+            self._cancel_timer()
+            if not self._dirty:
+                return
+            self._timer = threading.Timer(delay, self.save)
+            self._timer.daemon = True
+            self._timer.start()
+
+
+    def flush(self):
+        """ Write any pending changes immediately. """
+        return self.save()
+
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
 
 
     def set(self, key, value):
-        """ Set a variable value.
+        """ Set a variable value. Changed values are marked dirty
+            and written on the next save.
         """
         #print("sessionmodel: Setting sessionpars model " +
         #    "fields with running vals...")
@@ -116,6 +195,35 @@ class SessionParsModel:
             key in self.fields and 
             type(value).__name__ == self.fields[key]['type']
         ):
-            self.fields[key]['value'] = value
+            with self._lock:
+                if self.fields[key]['value'] != value:
+                    self.fields[key]['value'] = value
+                    self._dirty.add(key)
         else:
             raise ValueError("sessionmodel: Bad key or wrong variable type")
+
+
+    def to_params(self):
+        """ Return the current values as a SessionParams object. """
+        return SessionParams(**{
+            key: TYPES[field['type']](field['value'])
+            for key, field in self.fields.items()
+        })
+
+
+    def update(self, params):
+        """ Set every field from a SessionParams object PARAMS. """
+        for key, field in self.fields.items():
+            self.set(key, TYPES[field['type']](getattr(params, key)))
+
+
+# Plain-Python session parameters: one typed attribute per field,
+# so models can read parameters without a Tk root
+SessionParams = dataclasses.make_dataclass(
+    'SessionParams',
+    [(key, TYPES[field['type']],
+      dataclasses.field(default=TYPES[field['type']](field['value'])))
+     for key, field in SessionParsModel.fields.items()],
+    slots=True
+)
+SessionParams.__module__ = __name__
@@ -11,75 +11,197 @@
 # Scientific
 import numpy as np
 
+# Custom
+from exceptions import speaker_exceptions
+
 
 ###########
 # Classes #
 ###########
 class Speaker:
-    """ Speaker object with position number, offset, and 
-    calibrated(boolean) attributes.
+    """ View of one speaker in a SpeakerWrangler, with channel, 
+    slm_level, offset, and calibrated(boolean) attributes. Missing 
+    values are None.
     """
-    def __init__(self, channel):
-        self.channel = channel
-        self.slm_level = None
-        self.offset = None
-        self.calibrated = False
+    __slots__ = ('_wrangler', '_index')
+
+    def __init__(self, wrangler, index):
+        self._wrangler = wrangler
+        self._index = index
+
+
+    @property
+    def channel(self):
+        return int(self._wrangler.channels[self._index])
+
+
+    @property
+    def slm_level(self):
+        value = self._wrangler.slm_levels[self._index]
+        return None if np.isnan(value) else value
+
+
+    @property
+    def offset(self):
+        value = self._wrangler.offsets[self._index]
+        return None if np.isnan(value) else value
+
+
+    @property
+    def calibrated(self):
+        return bool(self._wrangler.calibrated[self._index])
+
+
+    def __repr__(self):
+        return (f"Speaker(channel={self.channel}, "
+                f"slm_level={self.slm_level}, offset={self.offset}, "
+                f"calibrated={self.calibrated})")
 
 
 class SpeakerWrangler:
-    """ Class to handle Speaker objects. """
-    def __init__(self):
-        # Empty list to hold Speaker objects
+    """ Class to handle speakers. 
+
+    Speaker data are stored in NumPy arrays (channels, slm_levels,
+    offsets, calibrated) so offsets can be calculated for many 
+    channels at once. Missing levels and offsets are NaN. 
+    speaker_list provides Speaker views for single speakers.
+    """
+    def __init__(self, num_speakers=0):
+        # Speaker data (first NUM_SPEAKERS entries are in use)
+        self._channels = np.zeros(0, dtype=int)
+        self._slm_levels = np.zeros(0)
+        self._offsets = np.zeros(0)
+        self._calibrated = np.zeros(0, dtype=bool)
+        self.num_speakers = 0
+
+        # Speakers without an offset
+        self.num_missing = 0
+
+        # Speaker views
         self.speaker_list = []
 
         # Reference level: channel 0 slm_level
         self.ref_level = None 
 
+        if num_speakers:
+            self.add_speakers(num_speakers)
+
+
+    # Views of the speakers in use
+    @property
+    def channels(self):
+        return self._channels[:self.num_speakers]
+
+
+    @property
+    def slm_levels(self):
+        return self._slm_levels[:self.num_speakers]
+
+
+    @property
+    def offsets(self):
+        return self._offsets[:self.num_speakers]
+
+
+    @property
+    def calibrated(self):
+        return self._calibrated[:self.num_speakers]
+
+
+    def _reserve(self, size):
+        """ Grow the arrays (by doubling) to hold SIZE speakers. """
+        capacity = len(self._channels)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        n = self.num_speakers
+        for name, fill in [('_channels', 0), ('_slm_levels', np.nan),
+                           ('_offsets', np.nan), ('_calibrated', False)]:
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
+
+    def add_speakers(self, num_speakers, channels=None):
+        """ Add NUM_SPEAKERS speakers. CHANNELS defaults to the next
+        NUM_SPEAKERS positions.
+        """
+        start = self.num_speakers
+        stop = start + num_speakers
+        self._reserve(stop)
+        if channels is None:
+            channels = np.arange(start, stop)
+        self._channels[start:stop] = channels
+        self._slm_levels[start:stop] = np.nan
+        self._offsets[start:stop] = np.nan
+        self._calibrated[start:stop] = False
+        self.num_speakers = stop
+        self.num_missing += num_speakers
+        self.speaker_list.extend(
+            Speaker(self, index) for index in range(start, stop))
+        return self.speaker_list[start:stop]
+
 
     def add_speaker(self, channel):
-        """ Create new speaker obj and append to list."""
-        speaker = Speaker(channel=channel)
-        self.speaker_list.append(speaker)
-        return speaker
+        """ Add one speaker and return its Speaker view. """
+        return self.add_speakers(1, channels=[channel])[0]
 
 
-    def calc_offset(self, channel, slm_level):
-        """ Calculate and update offset. """
-        if channel == 0:
-            self.ref_level = slm_level
+    def calc_offset(self, channel, slm_level, applied_db=0.0):
+        """ Calculate and update offsets. CHANNEL and SLM_LEVEL are 
+        single values, or arrays to update many speakers at once.
+        Channel 0 sets the reference level.
 
-        # Calculate offset
-        try:
-            offset = np.round(self.ref_level - slm_level, 1)
-        except TypeError:
-            raise TypeError
-        
-        # Update Speaker attributes
-        self.speaker_list[channel].slm_level = slm_level
-        self.speaker_list[channel].offset = offset
-        self.speaker_list[channel].calibrated = True
+        APPLIED_DB is the gain (dB) that was applied to each speaker
+        during the measurement (e.g., saved offsets). It is removed
+        from SLM_LEVEL, so offsets stay absolute.
+        """
+        index = np.atleast_1d(channel)
+        if index.size == 0:
+            # No speakers to update
+            return
+        levels = np.broadcast_to(
+            np.asarray(slm_level, dtype=np.float64), index.shape)
+        levels = levels - np.broadcast_to(applied_db, index.shape)
+        if (index.min() < 0) or (index.max() >= self.num_speakers):
+            raise IndexError(f"speakermodel: No speaker at {channel}")
+        if not np.isfinite(levels).all():
+            raise ValueError(f"speakermodel: Invalid SLM level: {slm_level}")
+
+        ref = levels[index == 0]
+        if len(ref):
+            self.ref_level = float(ref[-1])
+
+        # Calculate offsets
+        if self.ref_level is None:
+            raise speaker_exceptions.MissingReference
+        offsets = np.round(self.ref_level - levels, 1)
+
+        # Update missing count before marking speakers calibrated
+        new = np.unique(index[~self._calibrated[index]])
+        self.num_missing -= len(new)
+
+        # Update speaker data
+        self._slm_levels[index] = levels
+        self._offsets[index] = offsets
+        self._calibrated[index] = True
 
 
     def check_for_missing_offsets(self):
-        """ Loop through each Speaker object and test whether the .calibrated
-            attribute is set to True.
+        """ Return the channels of speakers without an offset.
         """
-        print(f"\nspeakermodel: Checking for missing offsets...")
-        missing_offsets = []
-        for speaker in self.speaker_list:
-            if not speaker.calibrated:
-                missing_offsets.append(speaker.channel)
-                msg = "Missing offset for speaker "\
-                    f"{speaker.channel}!"
-                print("speakermodel: " + msg)
-        print("speakermodel: Done")
+        missing_offsets = self.channels[~self.calibrated].tolist()
+        if missing_offsets:
+            print(f"\nspeakermodel: Missing offsets for {self.num_missing} "
+                  f"speaker(s): {missing_offsets}")
         return missing_offsets
 
 
     def get_data(self):
-        """ Return a dictionary of channels and offsets. """
-        #channels = range(1, len(self.speaker_list))
-        channels = [speaker.channel for speaker in self.speaker_list]
-        offsets = [speaker.offset for speaker in self.speaker_list]
-        
-        return dict(zip(channels, offsets))
+        """ Return a dictionary of channels and offsets. Missing 
+        offsets are None.
+        """
+        offsets = [None if np.isnan(offset) else offset 
+                   for offset in self.offsets.tolist()]
+        return dict(zip(self.channels.tolist(), offsets))
@@ -11,9 +11,8 @@
 ###########
 # Import data science packages
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-rcParams.update({'figure.autolayout': True})
+# NOTE: matplotlib is imported in plot_data so it is only loaded
+# when plotting
 
 
 ###################
@@ -98,18 +97,20 @@ class Staircase:
 
 
     def _calc_reversals(self):
-        """ Determine whether a reversal has occurred."""
-        # Create variables
-        correct_vals = np.ones(self.nDown)
-        reversal_1 = np.append(correct_vals, -1)
-        reversal_2 = np.insert(correct_vals, 0, -1)
-
-        # Check for reversals
-        if np.array_equal(self.scores[-self._n_back:], reversal_1) or \
-        np.array_equal(self.scores[-self._n_back:], reversal_2):
-            return True
-        else:
+        """ Determine whether a reversal has occurred. Only the last
+            _n_back scores are compared, so no arrays are created.
+        """
+        # Reversal 1: nDown correct, then incorrect
+        # Reversal 2: incorrect, then nDown correct
+        n = self._n_back
+        if len(self.scores) < n:
             return False
+        first = self.scores[-n]
+        last = self.scores[-1]
+        for ii in range(-n + 1, -1):
+            if self.scores[ii] != 1:
+                return False
+        return (first == 1 and last == -1) or (first == -1 and last == 1)
 
 
     def _calc_next_step_size(self):
@@ -118,7 +119,7 @@ class Staircase:
             be selected on each reversal. 
         """
         # Grab the step_sizes value where index == number of reversals
-        self._step_index = len(self.dw._get_reversals())
+        self._step_index = self.dw.num_reversals
 
         # Use last step_sizes value if the number of reversals exceed
         # the number of available step sizes
@@ -159,12 +160,12 @@ class Staircase:
             first reversal, if rapid_descend == True.
         """
         # Provide feedback to console
-        revs = self.dw._get_reversals()
-        print(f"staircase: Total # of reversals: {len(revs)}")
+        num_reversals = self.dw.num_reversals
+        print(f"staircase: Total # of reversals: {num_reversals}")
 
         # Update up/down rule after first reversal
         if self.rapid_descend:
-            if len(revs) >= 1:
+            if num_reversals >= 1:
                 self.nUp = self.up_arg
                 self.nDown = self.down_arg
                 self._n_back = self.nDown + 1
@@ -177,7 +178,7 @@ class Staircase:
         # Trial stopping rule reached?
         if self._trial_num >= self.nTrials:
             # Reversal stopping rule reached?
-            if len(self.dw._get_reversals()) >= self.nReversals:
+            if self.dw.num_reversals >= self.nReversals:
                 self.status = False
                 print(f"\n\nstaircase: Task complete!\n")
 
@@ -208,7 +209,7 @@ class Staircase:
         self._calc_level()
 
         # Display DataPoint trial parameters
-        print(f"staircase: {dp.__dict__}")
+        print(f"staircase: {dp.as_dict()}")
 
         # Check that up/down values update after rapid descend
         if self.rapid_descend:
@@ -241,29 +242,31 @@ class Staircase:
             Plot color-coded data and return average of
             last n reversals.
         """
+        import matplotlib.pyplot as plt
+        from matplotlib import rcParams
+        rcParams.update({'figure.autolayout': True})
+
         # ALL DATA
-        x_all = self._make_attribute_list(self.dw.datapoints, 'trial_number')
-        y_all = self._make_attribute_list(self.dw.datapoints, 'level')
-        plt.plot(x_all, y_all, color='k', linestyle='dashed')
+        cols = self.dw.columns()
+        plt.plot(cols['trial_number'], cols['level'], color='k', 
+                 linestyle='dashed')
 
         # CORRECT RESPONSES
-        correct = self.dw._get_correct()
-        x_correct = self._make_attribute_list(correct, 'trial_number')
-        y_correct = self._make_attribute_list(correct, 'level')
-        plt.plot(x_correct, y_correct, color="green", linestyle="none", 
-                 marker='o', label="Correct")
+        correct = self.dw.mask('correct')
+        plt.plot(cols['trial_number'][correct], cols['level'][correct], 
+                 color="green", linestyle="none", marker='o', 
+                 label="Correct")
 
         # INCORRECT RESPONSES
-        incorrect = self.dw._get_incorrect()
-        x_incorrect = self._make_attribute_list(incorrect, 'trial_number')
-        y_incorrect = self._make_attribute_list(incorrect, 'level')
-        plt.plot(x_incorrect, y_incorrect, color='red', linestyle='none',
-                 marker='o', label="Incorrect")
+        incorrect = self.dw.mask('incorrect')
+        plt.plot(cols['trial_number'][incorrect], cols['level'][incorrect], 
+                 color='red', linestyle='none', marker='o', 
+                 label="Incorrect")
 
         # REVERSALS
-        reversals = self.dw._get_reversals()
-        x_rev = self._make_attribute_list(reversals, 'trial_number')
-        y_rev = self._make_attribute_list(reversals, 'level')
+        reversals = self.dw.mask('reversal')
+        x_rev = cols['trial_number'][reversals]
+        y_rev = cols['level'][reversals]
         plt.plot(x_rev, y_rev, marker='o', ms=15, markeredgewidth=3, 
                  linestyle='none', color='k', fillstyle='none', 
                  label="Reversal")
@@ -271,8 +274,8 @@ class Staircase:
         # Plot labels
         plt.xlabel("Trial Number")
         plt.ylabel("Level (dB SPL)")
-        plt.title(f"Average of last {len(reversals)-1} reversals: " +
-                  f"{np.round(np.mean(y_rev[-(len(reversals)-1):]), 2)}")
+        plt.title(f"Average of last {len(y_rev)-1} reversals: " +
+                  f"{np.round(np.mean(y_rev[-(len(y_rev)-1):]), 2)}")
         plt.legend()
         plt.show()
         plt.close()
@@ -282,42 +285,255 @@ class Staircase:
 # Data Point Classes #
 ######################
 class DataPoint:
-    """ Individual object containing all data for a given trial.
-        Works with DataWrangler class.
+    """ View of a single trial stored in a DataWrangler.
+
+        Values are read from and written to the DataWrangler's
+        columns, so a DataPoint holds no data of its own. Unset
+        values read as None. A DataPoint created without a 
+        DataWrangler gets a private one-row DataWrangler.
     """
-    def __init__(self):
-        self.trial_number = None
-        self.level = None
-        self.response = None
-        self.reversal = None
+    __slots__ = ('_wrangler', '_index')
+
+    def __init__(self, wrangler=None, index=None):
+        if wrangler is None:
+            wrangler = DataWrangler()
+            index = wrangler._append_row()
+        self._wrangler = wrangler
+        self._index = index
+
+
+    @property
+    def trial_number(self):
+        value = self._wrangler._trial_number[self._index]
+        return None if value < 0 else int(value)
+
+    @trial_number.setter
+    def trial_number(self, value):
+        self._wrangler._trial_number[self._index] = \
+            -1 if value is None else value
+
+
+    @property
+    def level(self):
+        value = self._wrangler._level[self._index]
+        return None if np.isnan(value) else float(value)
+
+    @level.setter
+    def level(self, value):
+        self._wrangler._level[self._index] = \
+            np.nan if value is None else value
+
+
+    @property
+    def response(self):
+        value = self._wrangler._response[self._index]
+        return None if value == 0 else int(value)
+
+    @response.setter
+    def response(self, value):
+        self._wrangler._set_response(self._index, value)
+
+
+    @property
+    def reversal(self):
+        value = self._wrangler._reversal[self._index]
+        return None if value < 0 else bool(value)
+
+    @reversal.setter
+    def reversal(self, value):
+        self._wrangler._set_reversal(self._index, value)
+
+
+    def as_dict(self):
+        """ Return the trial data as a dictionary. """
+        return {'trial_number': self.trial_number, 'level': self.level,
+                'response': self.response, 'reversal': self.reversal}
+
+
+    def __repr__(self):
+        return f"DataPoint({self.as_dict()})"
+
+
+class _DataPointList:
+    """ Read-only sequence of DataPoint views over a DataWrangler. """
+    __slots__ = ('_wrangler',)
+
+    def __init__(self, wrangler):
+        self._wrangler = wrangler
+
+
+    def __len__(self):
+        return self._wrangler._size
+
+
+    def __getitem__(self, index):
+        size = self._wrangler._size
+        if isinstance(index, slice):
+            return [DataPoint(self._wrangler, ii) 
+                    for ii in range(*index.indices(size))]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("staircase: DataPoint index out of range")
+        return DataPoint(self._wrangler, index)
+
+
+    def __iter__(self):
+        for ii in range(self._wrangler._size):
+            yield DataPoint(self._wrangler, ii)
 
 
 class DataWrangler:
-    """ Represent a collection of data points that can be searched."""
-    def __init__(self):
-        """Initialize a DataWrangler with an empty list."""
-        self.datapoints = []
+    """ Columnar store of trial data.
+
+        Each trial is a row across four preallocated NumPy columns
+        that double in size when full: trial_number (int64, -1 when
+        unset), level (float64, NaN when unset), response (int8: 1
+        correct, -1 incorrect, 0 unset) and reversal (int8: 1, 0, 
+        or -1 when unset). A trial costs 18 bytes.
+
+        Counts of correct responses, incorrect responses and
+        reversals are kept up to date as values are set. Column
+        views returned by columns() and to_numpy() share memory
+        with the store and are valid until the next new_data_point
+        call reallocates it.
+    """
+    COLUMNS = ('trial_number', 'level', 'response', 'reversal')
+    _DTYPES = {'trial_number': np.int64, 'level': np.float64, 
+               'response': np.int8, 'reversal': np.int8}
+    _FILL = {'trial_number': -1, 'level': np.nan, 'response': 0, 
+             'reversal': -1}
+
+    def __init__(self, capacity=64):
+        """Initialize an empty DataWrangler."""
+        self._size = 0
+        for name in self.COLUMNS:
+            setattr(self, '_' + name, 
+                    np.full(capacity, self._FILL[name], self._DTYPES[name]))
+
+        # O(1) counts for each filter
+        self._counts = {'correct': 0, 'incorrect': 0, 'reversal': 0}
+
+
+    @property
+    def datapoints(self):
+        """ Sequence of DataPoint views, one per trial. """
+        return _DataPointList(self)
+
+
+    def _append_row(self):
+        """ Add an unset row, growing the columns if needed. Return
+            the row index.
+        """
+        capacity = len(self._level)
+        if self._size == capacity:
+            for name in self.COLUMNS:
+                old = getattr(self, '_' + name)
+                new = np.full(2 * capacity, self._FILL[name], old.dtype)
+                new[:capacity] = old
+                setattr(self, '_' + name, new)
+        self._size += 1
+        return self._size - 1
 
 
     def new_data_point(self):
-        """ Create new DataPoint object and append to list."""
-        dp = DataPoint()
-        self.datapoints.append(dp)
-        return dp
+        """ Add a new trial row and return a DataPoint view of it."""
+        return DataPoint(self, self._append_row())
+
+
+    def _set_response(self, index, value):
+        """ Store response VALUE for row INDEX and update counts. """
+        keys = {1: 'correct', -1: 'incorrect'}
+        old = int(self._response[index])
+        new = 0 if value is None else int(value)
+        if old in keys:
+            self._counts[keys[old]] -= 1
+        if new in keys:
+            self._counts[keys[new]] += 1
+        self._response[index] = new
+
+
+    def _set_reversal(self, index, value):
+        """ Store reversal VALUE for row INDEX and update counts. """
+        old = int(self._reversal[index] == 1)
+        new = -1 if value is None else int(bool(value))
+        self._counts['reversal'] += int(new == 1) - old
+        self._reversal[index] = new
+
+
+    @property
+    def num_correct(self):
+        return self._counts['correct']
+
+
+    @property
+    def num_incorrect(self):
+        return self._counts['incorrect']
+
+
+    @property
+    def num_reversals(self):
+        return self._counts['reversal']
+
+
+    ###########
+    # Columns #
+    ###########
+    def mask(self, name):
+        """ Return a boolean array selecting trials that match filter
+            NAME: 'correct', 'incorrect' or 'reversal'.
+        """
+        if name == 'correct':
+            return self._response[:self._size] == 1
+        elif name == 'incorrect':
+            return self._response[:self._size] == -1
+        elif name == 'reversal':
+            return self._reversal[:self._size] == 1
+        raise ValueError(f"staircase: Unknown filter: {name}")
+
+
+    def columns(self, name=None):
+        """ Return a dictionary of column arrays. Without a filter
+            NAME these are views of the store; with one, only the
+            matching trials are returned.
+        """
+        cols = {col: getattr(self, '_' + col)[:self._size] 
+                for col in self.COLUMNS}
+        if name is None:
+            return cols
+        mask = self.mask(name)
+        return {col: values[mask] for col, values in cols.items()}
+
+
+    def to_numpy(self):
+        """ Return the columns as a dictionary of NumPy views. """
+        return self.columns()
+
+
+    def to_dataframe(self):
+        """ Return the trial data as a pandas DataFrame backed by 
+            the column views.
+        """
+        import pandas as pd
+        return pd.DataFrame(self.to_numpy(), copy=False)
+
+
+    def _get_points(self, name):
+        return [DataPoint(self, ii) for ii in np.flatnonzero(self.mask(name))]
 
 
     def _get_correct(self):
         """ Return a list of all DataPoint objects with a correct response."""
-        return [datum for datum in self.datapoints if datum.response == 1]
+        return self._get_points('correct')
 
 
     def _get_incorrect(self):
         """ Return a list of all DataPoint objects with an incorrect 
             response.
         """
-        return [datum for datum in self.datapoints if datum.response == -1]
+        return self._get_points('incorrect')
 
 
     def _get_reversals(self):
         """ Find all data points that match the given filter."""
-        return [datum for datum in self.datapoints if datum.reversal]
+        return self._get_points('reversal')
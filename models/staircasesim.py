@@ -0,0 +1,217 @@
+""" Batch simulation of adaptive staircases.
+
+    Advances many independent staircases in lockstep with NumPy
+    arrays, following the same rules as staircase.Staircase. Used
+    to compare step sizes, up/down rules and stopping rules against
+    a simulated psychometric function without creating thousands
+    of Staircase objects.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+
+#########
+# Funcs #
+#########
+def logistic(levels, thresholds, slope=2.0, guess=0.0, lapse=0.0):
+    """ Return the probability of a correct response at LEVELS for
+        listeners with THRESHOLDS (the 50% point before guess and
+        lapse rates are applied). SLOPE is the spread in dB.
+    """
+    p = 1 / (1 + np.exp(-(np.asarray(levels) - thresholds) / slope))
+    return guess + (1 - guess - lapse) * p
+
+
+###########
+# Classes #
+###########
+class BatchStaircase:
+    """ NUM_STAIRCASES independent staircases sharing one set of
+        parameters. Arguments after the first match Staircase.
+
+        Each call to add_responses presents one trial on every
+        staircase that is still running. Finished staircases are
+        frozen. With RECORD, levels, responses and reversals are
+        kept for every trial as arrays of shape (trials, staircases).
+    """
+    def __init__(self, num_staircases, start_val, step_sizes, nUp, nDown,
+                 nTrials, nReversals, rapid_descend, min_val, max_val,
+                 record=True):
+        # Same check as Staircase
+        if nReversals < len(step_sizes):
+            msg = f"The number of reversals must be equal to or greater "\
+                f"than the number of step sizes.\nFound {len(step_sizes)} "\
+                f"step sizes, but {nReversals} reversal(s)."
+            print(msg)
+            raise ValueError(msg)
+
+        # Assign arguments to attributes
+        self.num_staircases = num_staircases
+        self.step_sizes = np.asarray(step_sizes, dtype=np.float64)
+        # NOTE: Staircase steps up after any incorrect response, so
+        # nUp is kept for reference only
+        self.up_arg = nUp
+        self.down_arg = nDown
+        self.nTrials = nTrials
+        self.nReversals = nReversals
+        self.rapid_descend = rapid_descend
+        self.min_val = min_val
+        self.max_val = max_val
+        self.record = record
+
+        # Per-staircase state
+        n = num_staircases
+        self.current_level = np.full(n, start_val, dtype=np.float64)
+        self.nDown = np.full(n, 1 if rapid_descend else nDown)
+        self._n_back = self.nDown + 1
+        self.num_reversals = np.zeros(n, dtype=np.int64)
+        self.num_trials = np.zeros(n, dtype=np.int64)
+        self.status = np.ones(n, dtype=bool)
+
+        # Last scores (newest in the last column), 0 before any trial
+        self._width = max(nDown, 1) + 1
+        self._scores = np.zeros((n, self._width), dtype=np.int8)
+        # Consecutive correct responses since the last level change
+        self._run = np.zeros(n, dtype=np.int64)
+
+        # Running sums for threshold estimates
+        self._rev_sum = np.zeros(n)
+        self._first_rev = np.full(n, np.nan)
+
+        # Per-trial records
+        self._levels = []
+        self._responses = []
+        self._reversals = []
+
+
+    def _calc_reversals(self, active):
+        """ Return a boolean array of staircases whose last _n_back
+            scores are a reversal (see Staircase._calc_reversals).
+        """
+        scores = self._scores
+        rows = np.arange(self.num_staircases)
+        start = self._width - self._n_back
+        first = scores[rows, start]
+        last = scores[:, -1]
+
+        # Scores between first and last must all be correct
+        cols = np.arange(self._width)
+        middle = (cols >= start[:, None] + 1) & (cols < self._width - 1)
+        middle_ok = np.all((scores == 1) | ~middle, axis=1)
+
+        flip = ((first == 1) & (last == -1)) | ((first == -1) & (last == 1))
+        return active & middle_ok & flip
+
+
+    def add_responses(self, responses):
+        """ Score one trial on every running staircase. RESPONSES is
+            an array of 1 (correct) or -1 (incorrect) per staircase;
+            entries for finished staircases are ignored.
+        """
+        active = self.status.copy()
+        responses = np.where(active, np.asarray(responses, dtype=np.int8), 0)
+        if self.record:
+            self._levels.append(np.where(active, self.current_level, np.nan))
+            self._responses.append(responses)
+
+        # Log scores
+        self._scores[active, :-1] = self._scores[active, 1:]
+        self._scores[active, -1] = responses[active]
+
+        # Check for reversal
+        reversal = self._calc_reversals(active)
+        self.num_reversals += reversal
+        first = reversal & np.isnan(self._first_rev)
+        self._first_rev[first] = self.current_level[first]
+        self._rev_sum[reversal] += self.current_level[reversal]
+        if self.record:
+            self._reversals.append(reversal)
+
+        # Step size: must precede level change
+        step_index = np.minimum(self.num_reversals, len(self.step_sizes) - 1)
+        step = self.step_sizes[step_index]
+
+        # Level change: down after nDown correct, up after incorrect
+        correct = active & (responses == 1)
+        incorrect = active & (responses == -1)
+        self._run[correct] += 1
+        down = correct & (self._run == self.nDown)
+        self.current_level[down] -= step[down]
+        self.current_level[incorrect] += step[incorrect]
+        self._run[down | incorrect] = 0
+        self.current_level[active] = np.clip(
+            self.current_level[active], self.min_val, self.max_val)
+
+        # Switch to the provided up/down rule after the first reversal
+        if self.rapid_descend:
+            switch = active & (self.num_reversals >= 1)
+            self.nDown[switch] = self.down_arg
+            self._n_back[switch] = self.down_arg + 1
+
+        # Check for end of staircase, then increase trial counter
+        done = active & (self.num_trials >= self.nTrials) & \
+            (self.num_reversals >= self.nReversals)
+        self.status[done] = False
+        self.num_trials[active] += 1
+
+
+    def simulate(self, thresholds, psychometric=logistic, max_trials=1000,
+                 seed=None, **kwargs):
+        """ Run every staircase to completion against simulated
+            listeners with THRESHOLDS (scalar or one per staircase).
+            PSYCHOMETRIC(levels, thresholds, **KWARGS) returns the
+            probability of a correct response. Staircases still
+            running after MAX_TRIALS trials are left running.
+            Returns the threshold estimates.
+        """
+        rng = np.random.default_rng(seed)
+        thresholds = np.broadcast_to(thresholds, (self.num_staircases,))
+        for _ in range(max_trials):
+            if not self.status.any():
+                break
+            p = psychometric(self.current_level, thresholds, **kwargs)
+            draws = rng.random(self.num_staircases)
+            self.add_responses(np.where(draws < p, 1, -1))
+        return self.thresholds()
+
+
+    def thresholds(self):
+        """ Return the threshold estimate of each staircase: the
+            mean level of all reversals after the first, as in
+            Staircase.plot_data. A single reversal is its own
+            estimate; NaN if there are none.
+        """
+        n = self.num_reversals
+        total = self._rev_sum - np.where(n > 1, self._first_rev, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(n > 0, total / np.maximum(n - 1, 1), np.nan)
+
+
+    ###########
+    # Records #
+    ###########
+    def _stack(self, records, dtype):
+        if not records:
+            return np.empty((0, self.num_staircases), dtype=dtype)
+        return np.stack(records)
+
+
+    @property
+    def levels(self):
+        """ Presentation levels, NaN after a staircase finished. """
+        return self._stack(self._levels, np.float64)
+
+
+    @property
+    def responses(self):
+        """ Responses, 0 after a staircase finished. """
+        return self._stack(self._responses, np.int8)
+
+
+    @property
+    def reversals(self):
+        return self._stack(self._reversals, bool)
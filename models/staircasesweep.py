@@ -0,0 +1,208 @@
+""" Monte Carlo parameter sweeps of adaptive staircases.
+
+    Evaluates a grid of staircase configurations against simulated
+    listeners. Each configuration is split into tasks of CHUNK_SIZE
+    listeners that run as BatchStaircases in a process pool. Every
+    task is seeded from (seed, configuration, chunk), so results do
+    not depend on the number of workers or the order tasks finish.
+    Task summaries are merged into each configuration's summary as
+    they arrive.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import itertools
+import os
+
+# Import custom modules
+from models import staircasesim
+
+
+#########
+# Funcs #
+#########
+def make_grid(base, **options):
+    """ Return a list of staircase configurations: BASE (a dict of
+        Staircase arguments) updated with every combination of the
+        lists in OPTIONS, e.g. make_grid(base, nDown=[2, 3]).
+    """
+    names = list(options)
+    return [dict(base, **dict(zip(names, values)))
+            for values in itertools.product(*options.values())]
+
+
+def _run_task(task):
+    """ Simulate one chunk of listeners. Returns (config index,
+        Summary). Runs in a worker process.
+    """
+    index, config, num_listeners, seed, listener = task
+    rng = np.random.default_rng(seed)
+    thresholds = listener['threshold'] + \
+        listener['spread'] * rng.standard_normal(num_listeners)
+
+    batch = staircasesim.BatchStaircase(num_listeners, record=False,
+                                        **config)
+    estimates = batch.simulate(thresholds, max_trials=listener['max_trials'],
+                               seed=rng, slope=listener['slope'])
+
+    summary = Summary()
+    summary.add(estimates - thresholds, batch.num_trials,
+                unfinished=int(batch.status.sum()))
+    return index, summary
+
+
+def run_sweep(configs, num_listeners, threshold=50.0, spread=0.0,
+              slope=2.0, max_trials=1000, chunk_size=1000, seed=0,
+              max_workers=None, progress=None):
+    """ Simulate NUM_LISTENERS listeners on each staircase
+        configuration in CONFIGS. Listener thresholds are drawn
+        from a normal distribution (THRESHOLD, SPREAD) and respond
+        according to staircasesim.logistic with SLOPE.
+
+        MAX_WORKERS defaults to all cores; 1 runs in this process.
+        PROGRESS(done, total) is called as tasks finish.
+
+        Returns a list of Summary objects, one per configuration.
+    """
+    listener = {'threshold': threshold, 'spread': spread, 'slope': slope,
+                'max_trials': max_trials}
+
+    # One task per chunk of listeners, seeded by its position
+    tasks = []
+    for index, config in enumerate(configs):
+        for chunk, start in enumerate(range(0, num_listeners, chunk_size)):
+            seed_seq = np.random.SeedSequence(seed, spawn_key=(index, chunk))
+            count = min(chunk_size, num_listeners - start)
+            tasks.append((index, config, count, seed_seq, listener))
+
+    summaries = [Summary() for _ in configs]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers == 1:
+        results = map(_run_task, tasks)
+        for done, (index, summary) in enumerate(results, start=1):
+            summaries[index].merge(summary)
+            if progress:
+                progress(done, len(tasks))
+        return summaries
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_task, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), start=1):
+            index, summary = future.result()
+            summaries[index].merge(summary)
+            if progress:
+                progress(done, len(tasks))
+    return summaries
+
+
+###########
+# Classes #
+###########
+class Summary:
+    """ Mergeable running statistics of threshold errors (estimate
+        minus true threshold) and trial counts.
+
+        Means and sums of squared deviations are combined with the
+        pairwise update of Chan et al., so summaries from any number
+        of tasks can be merged in any order without keeping the
+        individual estimates. Listeners without a reversal have no
+        estimate and are counted in `missing`.
+    """
+    def __init__(self):
+        self.count = 0
+        self.error_mean = 0.0
+        self._error_m2 = 0.0
+        self.trials_mean = 0.0
+        self._trials_m2 = 0.0
+        self.missing = 0
+        self.unfinished = 0
+
+
+    @staticmethod
+    def _combine(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+        n = n_a + n_b
+        if n == 0:
+            return 0.0, 0.0
+        delta = mean_b - mean_a
+        mean = mean_a + delta * n_b / n
+        m2 = m2_a + m2_b + delta**2 * n_a * n_b / n
+        return mean, m2
+
+
+    def add(self, errors, trials, unfinished=0):
+        """ Add threshold ERRORS and trial counts TRIALS (arrays with
+            one value per listener).
+        """
+        errors = np.asarray(errors, dtype=np.float64)
+        trials = np.asarray(trials, dtype=np.float64)
+        valid = ~np.isnan(errors)
+        errors, trials = errors[valid], trials[valid]
+
+        other = Summary()
+        other.count = len(errors)
+        if other.count:
+            other.error_mean = errors.mean()
+            other._error_m2 = np.sum((errors - other.error_mean)**2)
+            other.trials_mean = trials.mean()
+            other._trials_m2 = np.sum((trials - other.trials_mean)**2)
+        other.missing = int((~valid).sum())
+        other.unfinished = unfinished
+        self.merge(other)
+
+
+    def merge(self, other):
+        """ Fold summary OTHER into this one. """
+        self.error_mean, self._error_m2 = self._combine(
+            self.count, self.error_mean, self._error_m2,
+            other.count, other.error_mean, other._error_m2)
+        self.trials_mean, self._trials_m2 = self._combine(
+            self.count, self.trials_mean, self._trials_m2,
+            other.count, other.trials_mean, other._trials_m2)
+        self.count += other.count
+        self.missing += other.missing
+        self.unfinished += other.unfinished
+        return self
+
+
+    @property
+    def bias(self):
+        """ Mean threshold error (dB). """
+        return self.error_mean if self.count else np.nan
+
+
+    @property
+    def variance(self):
+        """ Sample variance of threshold errors (dB^2). """
+        if self.count < 2:
+            return np.nan
+        return self._error_m2 / (self.count - 1)
+
+
+    @property
+    def rmse(self):
+        if not self.count:
+            return np.nan
+        return np.sqrt(self.error_mean**2 + self._error_m2 / self.count)
+
+
+    @property
+    def trials_variance(self):
+        if self.count < 2:
+            return np.nan
+        return self._trials_m2 / (self.count - 1)
+
+
+    def as_dict(self):
+        return {'count': self.count, 'bias': self.bias,
+                'variance': self.variance, 'rmse': self.rmse,
+                'trials_mean': self.trials_mean,
+                'trials_variance': self.trials_variance,
+                'missing': self.missing, 'unfinished': self.unfinished}
@@ -0,0 +1,117 @@
+""" Class for caching generated stimuli between presentations.
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+from collections import OrderedDict
+import threading
+
+# Import custom modules
+from models import noisemodel
+
+
+#########
+# BEGIN #
+#########
+class StimulusBank:
+    """ Least-recently-used cache of generated stimulus arrays.
+
+        Stimuli are keyed by (signal type, duration, sampling rate,
+        seed, number of channels). Cached arrays are returned
+        read-only because the same buffer is shared between
+        presentations.
+    """
+    def __init__(self, max_bytes=256 * 1024**2):
+        # Memory budget for all cached stimuli
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+        # Counters for tuning the budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Signal type: function(dur, fs, seed, num_channels)
+        self.generators = {
+            'wgn': self._make_wgn,
+        }
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def _make_wgn(self, dur, fs, seed, num_channels):
+        """ Generate white Gaussian noise. """
+        gen = noisemodel.NoiseGenerator(seed=seed)
+        return gen.wgn(dur=dur, fs=fs, num_channels=num_channels)
+
+
+    def get(self, signal_type, dur, fs, seed=4, num_channels=1):
+        """ Return the requested stimulus, generating it on a miss.
+        """
+        key = (signal_type, float(dur), int(fs), seed, int(num_channels))
+
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                print(f"stimulusbank: Cache hit {key} " +
+                      f"(hits: {self.hits}, misses: {self.misses})")
+                return self._cache[key]
+
+        try:
+            make = self.generators[signal_type]
+        except KeyError:
+            raise ValueError(
+                f"stimulusbank: Unknown signal type: {signal_type}")
+        signal = make(dur, fs, seed, num_channels)
+        signal.setflags(write=False)
+
+        with self._lock:
+            self.misses += 1
+            print(f"stimulusbank: Cache miss {key} " +
+                  f"(hits: {self.hits}, misses: {self.misses})")
+            self._store(key, signal)
+        return signal
+
+
+    def _store(self, key, signal):
+        """ Add signal to the cache and evict least recently used
+            entries until the cache fits within the budget.
+        """
+        # Signals larger than the whole budget are never cached
+        if signal.nbytes > self.max_bytes:
+            return
+
+        if key in self._cache:
+            self.nbytes -= self._cache.pop(key).nbytes
+        self._cache[key] = signal
+        self.nbytes += signal.nbytes
+
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+
+    def clear(self):
+        """ Remove all cached stimuli. Counters are preserved.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.nbytes = 0
+
+
+    def stats(self):
+        """ Return a dictionary of cache counters. """
+        with self._lock:
+            return {
+                'entries': len(self._cache),
+                'nbytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
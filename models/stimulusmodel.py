@@ -5,6 +5,7 @@
 import pandas as pd
 
 # Import system packages
+from dataclasses import dataclass
 import random
 import os
 from pathlib import Path
@@ -13,11 +14,20 @@ from pathlib import Path
 #########
 # BEGIN #
 #########
+@dataclass(slots=True)
+class StimulusParams:
+    """ Parameters read by StimulusModel. """
+    matrix_file_path: str = ''
+    audio_files_dir: str = ''
+    repetitions: int = 1
+    randomize: int = 0
+
+
 class StimulusModel:
-    def __init__(self, sessionpars):
-        
+    def __init__(self, params):
+        """ PARAMS: a StimulusParams object """
         # Assign variables
-        self.sessionpars = sessionpars
+        self.params = params
 
         #####################
         # Sequence of Funcs #
@@ -30,7 +40,7 @@ class StimulusModel:
         self._do_reps()
 
         # If specified, randomize trials
-        if self.sessionpars['randomize'].get() == 1:
+        if self.params.randomize == 1:
             self._randomize()
 
 
@@ -39,7 +49,7 @@ class StimulusModel:
             print('\nstimulusmodel: Reading matrix file')
             # Create private attribute of raw matrix file
             self._matrix_file = pd.read_csv(
-                self.sessionpars['matrix_file_path'].get()
+                self.params.matrix_file_path
             )
         except FileNotFoundError:
             print('stimulusmodel: File not found!')
@@ -47,11 +57,11 @@ class StimulusModel:
 
 
     def _add_full_audio_paths(self):
-        """ Add the audiodir from sessionpars to audio file 
+        """ Add the audio directory from params to audio file 
             names in raw matrix file.
         """
         # Get audio files directory
-        audio_dir = Path(self.sessionpars['audio_files_dir'].get())
+        audio_dir = Path(self.params.audio_files_dir)
 
         for row in self._matrix_file.index:
             # Create full path to audio file
@@ -72,14 +82,14 @@ class StimulusModel:
         self.matrix = self._matrix_file.copy()
 
         # Make sure there is at least 1 'repetition'
-        if (self.sessionpars['repetitions'].get() == 0) or \
-            (self.sessionpars['repetitions'].get() == None):
-            self.sessionpars['repetitions'].set(1)
+        if (self.params.repetitions == 0) or \
+            (self.params.repetitions == None):
+            self.params.repetitions = 1
 
         # Create repeated trials
         print('stimulusmodel: Creating trial repetitions')        
         self.matrix = pd.concat(
-            [self.matrix] * self.sessionpars['repetitions'].get(), 
+            [self.matrix] * self.params.repetitions, 
             ignore_index=True
         )
 
@@ -0,0 +1,648 @@
+""" Long-lived audio output stream for presenting signals without
+    reopening the audio device on every presentation.
+"""
+
+###########
+# Imports #
+###########
+# Import data science packages
+import numpy as np
+
+# Import system packages
+from collections import deque
+import os
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+# Import audio packages
+import soundfile as sf
+
+# Import custom modules
+from exceptions import audio_exceptions
+
+
+#################
+# Audio Sources #
+#################
+class ArraySource:
+    """ Present an in-memory signal block by block.
+    """
+    def __init__(self, signal):
+        if signal.ndim == 1:
+            signal = signal.reshape(-1, 1)
+        self.signal = signal
+        self.num_channels = signal.shape[1]
+        self.shape = signal.shape
+        self.pos = 0
+
+
+    def start(self):
+        self.pos = 0
+
+
+    def read(self, frames):
+        """ Return a view of the next FRAMES samples. """
+        block = self.signal[self.pos:self.pos + frames]
+        self.pos += len(block)
+        return block
+
+
+    @property
+    def done(self):
+        return self.pos >= len(self.signal)
+
+
+    def stop(self):
+        pass
+
+
+class SequenceSource:
+    """ Present a mono signal on one channel after another as a
+        single continuous stream.
+
+        Slot k plays SIGNAL on column k, followed by GAP seconds of
+        silence, so NUM_SLOTS slots last exactly NUM_SLOTS x 
+        (duration + GAP). Raised-cosine onset and offset ramps of
+        RAMP seconds are applied once. Blocks are rendered into a
+        reused buffer, so memory does not grow with the number of
+        slots or their length.
+
+        start() begins at slot START_SLOT, so a paused sequence can
+        be restarted from the slot it was interrupted in.
+    """
+    def __init__(self, signal, fs, num_slots, gap=0.0, ramp=0.0):
+        signal = np.array(signal, dtype=np.float32).ravel()
+        n_ramp = min(int(round(ramp * fs)), len(signal) // 2)
+        if n_ramp > 0:
+            window = 0.5 - 0.5 * np.cos(np.pi * np.arange(n_ramp) / n_ramp)
+            signal[:n_ramp] *= window
+            signal[len(signal) - n_ramp:] *= window[::-1]
+        self.signal = signal
+        self.fs = fs
+        self.num_channels = num_slots
+        self.slot_frames = len(signal) + int(round(gap * fs))
+        self.frames = num_slots * self.slot_frames
+        self.shape = (self.frames, num_slots)
+        self.pos = 0
+        self.start_slot = 0
+
+        # Reused output buffer and the columns written into it
+        self._block = np.zeros((0, num_slots), dtype=np.float32)
+        self._dirty = []
+
+
+    def start(self):
+        self.pos = self.start_slot * self.slot_frames
+
+
+    @property
+    def remaining(self):
+        """ Seconds from START_SLOT to the end of the sequence. """
+        return (self.frames - self.start_slot * self.slot_frames) / self.fs
+
+
+    def read(self, frames):
+        """ Return the next FRAMES samples. The returned array is 
+            overwritten by the next read.
+        """
+        frames = min(frames, self.frames - self.pos)
+        if len(self._block) < frames:
+            self._block = np.zeros((frames, self.num_channels),
+                                   dtype=np.float32)
+            self._dirty = []
+        for col in self._dirty:
+            self._block[:, col] = 0
+        self._dirty = []
+
+        block = self._block[:frames]
+        end = self.pos + frames
+        t = self.pos
+        while t < end:
+            slot, offset = divmod(t, self.slot_frames)
+            n = min(end, (slot + 1) * self.slot_frames) - t
+            if offset < len(self.signal):
+                k = min(n, len(self.signal) - offset)
+                block[t - self.pos:t - self.pos + k, slot] = \
+                    self.signal[offset:offset + k]
+                self._dirty.append(slot)
+            t += n
+        self.pos = end
+        return block
+
+
+    @property
+    def done(self):
+        return self.pos >= self.frames
+
+
+    @property
+    def current_slot(self):
+        """ Slot of the next sample to be read. """
+        return min(self.pos // self.slot_frames, self.num_channels - 1)
+
+
+    def peak(self):
+        if self.signal.size == 0:
+            return 0.0
+        return float(np.abs(self.signal).max())
+
+
+    def load(self):
+        """ Return the whole sequence as an array. """
+        out = np.zeros((self.frames, self.num_channels), dtype=np.float32)
+        for slot in range(self.num_channels):
+            start = slot * self.slot_frames
+            out[start:start + len(self.signal), slot] = self.signal
+        return out
+
+
+    def stop(self):
+        pass
+
+
+    def close(self):
+        pass
+
+
+# Path: (mtime_ns, size, peak), shared by every FileSource so a
+# new source for an unchanged file does not scan it again
+_peaks = {}
+_peaks_lock = threading.Lock()
+
+
+class FileSource:
+    """ Stream a sound file from disk block by block. 
+
+        A reader thread decodes blocks with SoundFile.blocks into a
+        bounded queue, so memory use depends on BLOCKSIZE and 
+        NUM_BLOCKS, not on the file length. The file is only open 
+        while the reader thread is decoding it.
+    """
+    def __init__(self, path, blocksize=4096, num_blocks=16):
+        self.path = path
+        self.blocksize = blocksize
+        self.num_blocks = num_blocks
+
+        # File details
+        with sf.SoundFile(path) as f:
+            self.fs = f.samplerate
+            self.num_channels = f.channels
+            self.frames = f.frames
+        self.shape = (self.frames, self.num_channels)
+
+        # Reader state
+        self._queue = None
+        self._thread = None
+        self._halt = threading.Event()
+
+        # Callback state
+        self._out = np.zeros((blocksize, self.num_channels), dtype=np.float32)
+        self._block = None
+        self._offset = 0
+        self._done = True
+        self.underruns = 0
+
+
+    def start(self):
+        """ Start (or restart) reading from the beginning of the file.
+        """
+        self.stop()
+        file = sf.SoundFile(self.path)
+        self._queue = queue.Queue(maxsize=self.num_blocks)
+        self._block = None
+        self._offset = 0
+        self._done = False
+        self.underruns = 0
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._reader, args=(file,),
+                                        daemon=True)
+        self._thread.start()
+
+
+    def _put(self, item):
+        """ Put ITEM in the queue unless the reader is halted. """
+        while not self._halt.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+    def _reader(self, file):
+        """ Decode FILE into the block queue, then close it. """
+        with file:
+            for block in file.blocks(blocksize=self.blocksize, 
+                                     dtype='float32', always_2d=True):
+                if not self._put(block):
+                    return
+        # End of file marker
+        self._put(None)
+
+
+    def read(self, frames):
+        """ Return the next FRAMES samples. If the reader has fallen
+            behind, the remainder of the block is filled with zeros.
+            Fewer than FRAMES samples are returned only at the end 
+            of the file.
+        """
+        if len(self._out) < frames:
+            self._out = np.zeros((frames, self.num_channels), 
+                                 dtype=np.float32)
+
+        filled = 0
+        while (filled < frames) and (not self._done):
+            if self._block is None:
+                try:
+                    self._block = self._queue.get_nowait()
+                except queue.Empty:
+                    self.underruns += 1
+                    self._out[filled:frames] = 0
+                    filled = frames
+                    break
+                self._offset = 0
+                if self._block is None:
+                    self._done = True
+                    break
+
+            n = min(frames - filled, len(self._block) - self._offset)
+            self._out[filled:filled + n] = \
+                self._block[self._offset:self._offset + n]
+            filled += n
+            self._offset += n
+            if self._offset >= len(self._block):
+                self._block = None
+
+        return self._out[:filled]
+
+
+    @property
+    def done(self):
+        return self._done
+
+
+    def peak(self):
+        """ Return the largest absolute sample value in the file.
+            Scanned block by block the first time a file is used, 
+            and cached until the file changes.
+        """
+        path = os.path.abspath(self.path)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with _peaks_lock:
+            entry = _peaks.get(path)
+        if (entry is not None) and (entry[:2] == key):
+            return entry[2]
+
+        peak = 0.0
+        with sf.SoundFile(path) as f:
+            for block in f.blocks(blocksize=65536, dtype='float32'):
+                peak = max(peak, float(block.max()), -float(block.min()))
+        with _peaks_lock:
+            _peaks[path] = key + (peak,)
+        return peak
+
+
+    def load(self):
+        """ Read the whole file into memory and return the signal. """
+        signal, _ = sf.read(self.path, dtype='float32')
+        return signal
+
+
+    def stop(self):
+        """ Stop the reader thread. """
+        self._halt.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def close(self):
+        """ Stop the reader thread, which closes the file. """
+        self.stop()
+
+
+##################
+# Output Streams #
+##################
+class NullOutputStream:
+    """ Stand-in for sounddevice.OutputStream that calls the stream
+        callback from a background thread instead of an audio device.
+        Written blocks are discarded unless CAPTURE is True.
+    """
+    def __init__(self, samplerate, channels, callback, blocksize=512,
+                 realtime=True, capture=False, **kwargs):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.blocksize = blocksize or 512
+        self.realtime = realtime
+        self.latency = self.blocksize / self.samplerate
+        self.capture = capture
+        self.captured = []
+        self.active = False
+        self.closed = False
+        self._thread = None
+
+
+    def start(self):
+        if self.active:
+            return
+        self.active = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def _run(self):
+        outdata = np.zeros((self.blocksize, self.channels), dtype=np.float32)
+        period = self.blocksize / self.samplerate
+        next_time = time.perf_counter()
+        while self.active:
+            now = time.perf_counter()
+            time_info = SimpleNamespace(
+                currentTime=now,
+                outputBufferDacTime=now + self.latency
+            )
+            self.callback(outdata, self.blocksize, time_info, None)
+            if self.capture:
+                self.captured.append(outdata.copy())
+            if self.realtime:
+                next_time += period
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+
+    def stop(self):
+        self.active = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def close(self):
+        self.stop()
+        self.closed = True
+
+
+#################
+# Stream Engine #
+#################
+class StreamEngine:
+    """ Persistent output stream with a callback that presents the
+        current signal. Signal, gain and channel routing can be
+        changed between presentations without closing the stream.
+        The stream is only reopened when the device or sampling
+        rate changes.
+
+        backend: 'sounddevice' for hardware or 'null' for testing
+    """
+    # Number of recent start-to-sound latencies kept
+    MAX_LATENCIES = 1000
+
+    def __init__(self, backend='sounddevice', blocksize=0,
+                 latency='low', null_outputs=2, realtime=True):
+        self.backend = backend
+        self.blocksize = blocksize
+        self.latency = latency
+        self.null_outputs = null_outputs
+        self.realtime = realtime
+
+        # Stream state
+        self.stream = None
+        self.device_id = None
+        self.fs = None
+        self.num_outputs = None
+
+        # Playback state (shared with the callback thread)
+        self._lock = threading.Lock()
+        self._source = None
+        self._mapping = None
+        self._gain = 1.0
+        self._col_gains = None
+        self._out_cols = None
+        self._playing = False
+
+        # Per-output-channel gains (e.g., speaker offsets)
+        self.channel_gains = None
+        self._request_time = None
+        self.finished = threading.Event()
+        self.finished.set()
+
+        # Start-to-sound latency (s) of recent presentations
+        self.latencies = deque(maxlen=self.MAX_LATENCIES)
+
+
+    def _make_stream(self, device_id, fs):
+        """ Create an output stream for the selected backend. """
+        if self.backend == 'null':
+            return NullOutputStream(
+                samplerate=fs,
+                channels=self.null_outputs,
+                callback=self._callback,
+                blocksize=self.blocksize,
+                realtime=self.realtime
+            ), self.null_outputs
+
+        import sounddevice as sd
+        try:
+            num_outputs = sd.query_devices(device_id)['max_output_channels']
+            stream = sd.OutputStream(
+                samplerate=fs,
+                device=device_id,
+                channels=num_outputs,
+                dtype='float32',
+                blocksize=self.blocksize,
+                latency=self.latency,
+                callback=self._callback
+            )
+        except (sd.PortAudioError, ValueError):
+            print("streammodel: Invalid audio device!")
+            raise audio_exceptions.InvalidAudioDevice(device_id)
+        return stream, num_outputs
+
+
+    def open(self, device_id, fs):
+        """ Open and start the stream, unless a stream with the same
+            device and sampling rate is already running.
+        """
+        if (self.stream is not None) and (self.device_id == device_id) \
+            and (self.fs == fs):
+            return
+
+        self.close()
+        print(f"streammodel: Opening {self.backend} stream " +
+              f"(device: {device_id}, fs: {fs})")
+        self.stream, self.num_outputs = self._make_stream(device_id, fs)
+        self.device_id = device_id
+        self.fs = fs
+        self.stream.start()
+
+
+    def close(self):
+        """ Stop playback and close the stream. """
+        self.stop()
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+    def play(self, signal, fs, device_id, routing, gain=1.0):
+        """ Present SIGNAL on the channels in ROUTING (1-based).
+            Replaces any signal that is currently playing.
+
+            SIGNAL is an array or a source (e.g., FileSource). If 
+            ROUTING has fewer channels than SIGNAL, the remaining 
+            signal channels are dropped.
+        """
+        self.open(device_id, fs)
+
+        if isinstance(signal, np.ndarray):
+            source = ArraySource(signal)
+        else:
+            source = signal
+        mapping = self._check_mapping(source.num_channels, routing)
+
+        self.stop()
+        source.start()
+        with self._lock:
+            self._source = source
+            self._mapping = mapping
+            self._gain = gain
+            self._update_gains()
+            self._request_time = time.perf_counter()
+            self.finished.clear()
+            self._playing = True
+
+
+    def set_gain(self, gain):
+        """ Change the gain of the current presentation. """
+        with self._lock:
+            self._gain = gain
+            self._update_gains()
+
+
+    def set_routing(self, routing):
+        """ Change the output channels of the current presentation. """
+        with self._lock:
+            if self._source is None:
+                return
+            self._mapping = self._check_mapping(
+                self._source.num_channels, routing)
+            self._update_gains()
+
+
+    def set_channel_gains(self, gains):
+        """ Apply GAINS (linear, one per output channel starting at
+            channel 1) to every presentation. Channels beyond the end
+            of GAINS have a gain of 1. None removes the gains.
+        """
+        with self._lock:
+            self.channel_gains = gains
+            self._update_gains()
+
+
+    def routing_gains(self, routing):
+        """ Return the channel gains for 1-based ROUTING. """
+        gains = np.ones(len(routing), dtype=np.float32)
+        if self.channel_gains is not None:
+            for ii, chan in enumerate(routing):
+                if chan - 1 < len(self.channel_gains):
+                    gains[ii] = self.channel_gains[chan - 1]
+        return gains
+
+
+    def applied_db(self, routing):
+        """ Return the channel gains for 1-based ROUTING in dB. """
+        return 20 * np.log10(self.routing_gains(routing))
+
+
+    def _update_gains(self):
+        """ Combine the presentation gain and channel gains into one
+            gain per mapped column, so the callback needs a single 
+            multiply. Must be called with the lock held.
+        """
+        if self._mapping is None:
+            return
+        routing = [chan + 1 for chan in self._mapping]
+        self._col_gains = (self._gain * self.routing_gains(routing)).astype(
+            np.float32)
+
+        # Consecutive outputs are written as one slice
+        first = self._mapping[0]
+        if self._mapping == list(range(first, first + len(self._mapping))):
+            self._out_cols = slice(first, first + len(self._mapping))
+        else:
+            self._out_cols = None
+
+
+    def _check_mapping(self, num_channels, routing):
+        """ Convert 1-based routing to 0-based output columns. """
+        if (not routing) or (len(routing) > num_channels) or \
+            (max(routing) > self.num_outputs) or (min(routing) < 1):
+            print(f"streammodel: Cannot route to: {routing}!")
+            raise audio_exceptions.InvalidRouting(num_channels, routing)
+        return [chan - 1 for chan in routing]
+
+
+    def stop(self):
+        """ Stop the current presentation. The stream stays open. """
+        with self._lock:
+            self._playing = False
+            source = self._source
+            self._source = None
+        if source is not None:
+            source.stop()
+        self.finished.set()
+
+
+    def wait(self, timeout=None):
+        """ Block until the current presentation ends. Returns False
+            if TIMEOUT expired first.
+        """
+        return self.finished.wait(timeout)
+
+
+    @property
+    def last_latency(self):
+        """ Start-to-sound latency of the latest presentation. """
+        try:
+            return self.latencies[-1]
+        except IndexError:
+            return None
+
+
+    def _callback(self, outdata, frames, time_info, status):
+        """ Write the next block of the current signal to OUTDATA. """
+        outdata.fill(0)
+        with self._lock:
+            if not self._playing:
+                return
+
+            # Time from play() to the first sample reaching the DAC
+            if self._request_time is not None:
+                now = time.perf_counter()
+                dac_delay = time_info.outputBufferDacTime - \
+                    time_info.currentTime
+                self.latencies.append(
+                    (now - self._request_time) + max(dac_delay, 0))
+                self._request_time = None
+
+            block = self._source.read(frames)
+            n = len(block)
+            k = len(self._mapping)
+            if self._out_cols is not None:
+                np.multiply(block[:, :k], self._col_gains,
+                            out=outdata[:n, self._out_cols])
+            else:
+                for col, out_chan in enumerate(self._mapping):
+                    np.multiply(block[:, col], self._col_gains[col],
+                                out=outdata[:n, out_chan])
+
+            if self._source.done:
+                self._playing = False
+                self._source = None
+                self.finished.set()
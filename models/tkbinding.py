@@ -0,0 +1,81 @@
+""" Tk variables bound to a plain-Python parameter object.
+
+    Views need tk.Variable objects for their widgets, but models read
+    parameters from a dataclass (e.g., sessionmodel.SessionParams).
+    TkParams creates one Tk variable per dataclass field and keeps
+    the two in step: writes to a variable (e.g., typing in an entry)
+    are copied to the parameter object right away, and refresh()
+    copies values a model changed back to the variables.
+"""
+
+###########
+# Imports #
+###########
+# Import GUI packages
+import tkinter as tk
+
+# Import system packages
+from collections.abc import Mapping
+import dataclasses
+
+
+#########
+# BEGIN #
+#########
+class TkParams(Mapping):
+    """ Read-only mapping of field name: tk.Variable for PARAMS.
+        Used wherever a dictionary of Tk variables was used before.
+    """
+    VARTYPES = {
+        bool: tk.BooleanVar,
+        str: tk.StringVar,
+        int: tk.IntVar,
+        float: tk.DoubleVar
+    }
+
+    def __init__(self, params, master=None):
+        self.params = params
+        self._vars = {}
+        self._refreshing = False
+        for field in dataclasses.fields(params):
+            vartype = self.VARTYPES.get(field.type, tk.StringVar)
+            var = vartype(master=master, value=getattr(params, field.name))
+            var.trace_add(
+                'write', lambda *_, name=field.name: self._pull(name))
+            self._vars[field.name] = var
+
+
+    def __getitem__(self, key):
+        return self._vars[key]
+
+
+    def __iter__(self):
+        return iter(self._vars)
+
+
+    def __len__(self):
+        return len(self._vars)
+
+
+    def _pull(self, name):
+        """ Copy variable NAME to the parameter object. """
+        if self._refreshing:
+            return
+        try:
+            value = self._vars[name].get()
+        except tk.TclError:
+            # Incomplete entry text (e.g., ""): keep the last value
+            return
+        setattr(self.params, name, value)
+
+
+    def refresh(self, *names):
+        """ Copy NAMES (default: all fields) from the parameter 
+            object to the Tk variables.
+        """
+        self._refreshing = True
+        try:
+            for name in (names or self._vars):
+                self._vars[name].set(getattr(self.params, name))
+        finally:
+            self._refreshing = False
@@ -0,0 +1,81 @@
+""" Queue for posting Tk updates from worker threads.
+
+    Tk is not thread-safe, so worker threads must not touch widgets,
+    variables or messageboxes. Instead they post calls to a
+    UIDispatcher, and the Tk main loop runs them with after(). At
+    most MAX_PER_TICK calls run every INTERVAL ms, so a busy worker
+    cannot starve the event loop.
+"""
+
+###########
+# Imports #
+###########
+# Import system packages
+from concurrent.futures import Future
+import queue
+import threading
+import traceback
+
+
+#########
+# BEGIN #
+#########
+class UIDispatcher:
+    """ Run posted calls on the Tk main loop of ROOT. """
+    def __init__(self, root, interval=50, max_per_tick=100):
+        self.root = root
+        self.interval = interval
+        self.max_per_tick = max_per_tick
+        self._queue = queue.SimpleQueue()
+        self._main_thread = threading.get_ident()
+        self._after_id = None
+
+
+    def start(self):
+        """ Begin draining the queue. Call from the Tk thread. """
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval, self._drain)
+
+
+    def stop(self):
+        """ Stop draining the queue. Pending calls are dropped. """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+
+    def post(self, func, *args, **kwargs):
+        """ Queue FUNC(*ARGS, **KWARGS) to run on the Tk thread.
+            Returns a Future holding the result.
+        """
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+
+    def call(self, func, *args, timeout=None, **kwargs):
+        """ Run FUNC on the Tk thread and return its result. Blocks
+            a worker thread until the call has run; runs directly
+            when called from the Tk thread.
+        """
+        if threading.get_ident() == self._main_thread:
+            return func(*args, **kwargs)
+        return self.post(func, *args, **kwargs).result(timeout)
+
+
+    def _drain(self):
+        """ Run up to max_per_tick queued calls, then reschedule. """
+        for _ in range(self.max_per_tick):
+            try:
+                future, func, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                print("uidispatcher: Posted call failed:")
+                traceback.print_exc()
+                future.set_exception(e)
+        self._after_id = self.root.after(self.interval, self._drain)
@@ -10,8 +10,13 @@
 ###########
 # Imports #
 ###########
-# Data science
-import pandas as pd
+# System
+import json
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
 
 
 #########
@@ -74,8 +79,129 @@ class VersionChecker:
     def import_version_library(self, lib_path):
         """ Load version library
         """
+        # Imported here to keep pandas out of the startup path
+        import pandas as pd
+
         # Download version library for crossreferencing
         try:
             self.version_library = pd.read_csv(lib_path)
         except FileNotFoundError:
             raise FileNotFoundError
+
+
+class BackgroundVersionCheck:
+    """ Run VersionChecker on a worker thread so a slow or unreachable
+        version library cannot block the UI. 
+
+        Results are cached in CACHE_PATH for TTL seconds. Call poll()
+        from the UI thread: it returns None while the check is 
+        running, and a result with status, app_version and 
+        new_version attributes once it has finished or TIMEOUT 
+        seconds have passed (status 'timeout').
+    """
+    # Statuses that depend only on the library contents
+    CACHEABLE = ('current', 'optional', 'mandatory', 'app_not_found')
+
+    def __init__(self, lib_path, app_name, app_version, cache_path,
+                 timeout=5.0, ttl=24*60*60):
+        self.lib_path = lib_path
+        self.app_name = app_name
+        self.app_version = app_version
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.ttl = ttl
+
+        self.result = None
+        self._done = threading.Event()
+        self._thread = None
+        self._start_time = None
+
+
+    def start(self):
+        """ Use a fresh cached result, or start the worker thread.
+        """
+        self._start_time = time.monotonic()
+        cached = self._read_cache()
+        if cached is not None:
+            print("versionmodel: Using cached version check")
+            self.result = cached
+            self._done.set()
+            return
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def poll(self):
+        """ Return the result, or None if the check is still running.
+        """
+        if self._done.is_set():
+            return self.result
+        if time.monotonic() - self._start_time > self.timeout:
+            print(f"versionmodel: Version check timed out after " +
+                  f"{self.timeout} s")
+            return self._make_result('timeout')
+        return None
+
+
+    def _make_result(self, status, new_version=None):
+        return SimpleNamespace(
+            status=status,
+            app_version=self.app_version,
+            new_version=new_version
+        )
+
+
+    def _run(self):
+        """ Worker thread: run the version check and cache it. """
+        try:
+            u = VersionChecker(self.lib_path, self.app_name, 
+                               self.app_version)
+            result = self._make_result(
+                u.status, getattr(u, 'new_version', None))
+        except Exception as e:
+            print(f"versionmodel: Version check failed: {e}")
+            result = self._make_result('library_inaccessible')
+
+        if result.status in self.CACHEABLE:
+            self._write_cache(result)
+        self.result = result
+        self._done.set()
+
+
+    def _read_cache(self):
+        """ Return the cached result if it is still valid. """
+        try:
+            with open(self.cache_path, 'r') as fh:
+                cached = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        if (cached.get('lib_path') != self.lib_path) or \
+            (cached.get('app_version') != self.app_version) or \
+            (time.time() - cached.get('checked', 0) > self.ttl):
+            return None
+        return self._make_result(cached['status'], cached['new_version'])
+
+
+    def _write_cache(self, result):
+        """ Save RESULT with a timestamp (temp file and rename). """
+        # Library values may be numpy types
+        new_version = result.new_version
+        if new_version is not None:
+            new_version = str(new_version)
+        cached = {
+            'lib_path': self.lib_path,
+            'app_version': self.app_version,
+            'checked': time.time(),
+            'status': result.status,
+            'new_version': new_version,
+        }
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.cache_path), suffix='.tmp')
+            with os.fdopen(fd, 'w') as fh:
+                json.dump(cached, fh)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"versionmodel: Could not cache version check: {e}")
@@ -0,0 +1,90 @@
+""" Unit tests for audiocache.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+from unittest import mock
+
+# Import data science packages
+import numpy as np
+
+# Import audio packages
+import soundfile as sf
+
+# Import system packages
+import os
+import tempfile
+
+# Import custom modules
+from models import audiocache
+
+
+#########
+# Begin #
+#########
+class TestDecodedAudioCache(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cal.wav')
+        self.data = np.linspace(-0.5, 0.5, 4800, dtype=np.float32)
+        sf.write(self.path, self.data, 48000, subtype='FLOAT')
+        self.cache = audiocache.DecodedAudioCache()
+
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        del self.cache
+
+
+    def test_first_get_decodes_file(self):
+        signal, fs = self.cache.get(self.path)
+        self.assertEqual(fs, 48000)
+        self.assertEqual(signal.dtype, np.float32)
+        np.testing.assert_array_equal(signal, self.data)
+        self.assertEqual(self.cache.misses, 1)
+
+
+    def test_repeat_get_skips_decoding(self):
+        first, _ = self.cache.get(self.path)
+        with mock.patch('models.audiocache.sf.read') as fake_read:
+            second, _ = self.cache.get(self.path)
+            fake_read.assert_not_called()
+        self.assertIs(first, second)
+        self.assertEqual(self.cache.hits, 1)
+
+
+    def test_changed_file_is_decoded_again(self):
+        self.cache.get(self.path)
+        sf.write(self.path, self.data[:2400], 48000, subtype='FLOAT')
+        # Make sure the modification time differs
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        signal, _ = self.cache.get(self.path)
+        self.assertEqual(len(signal), 2400)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(self.cache.nbytes, signal.nbytes)
+
+
+    def test_cached_signal_is_read_only(self):
+        signal, _ = self.cache.get(self.path)
+        with self.assertRaises(ValueError):
+            signal[0] = 0
+
+
+    def test_file_larger_than_budget_is_not_cached(self):
+        self.cache.max_bytes = 100
+        self.assertIsNone(self.cache.get(self.path))
+        self.assertEqual(self.cache.nbytes, 0)
+
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.get(os.path.join(self.tmpdir.name, 'missing.wav'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,13 +18,15 @@ import numpy as np
 import pandas as pd
 
 # Import audio packages
-#import soundfile as sf
+import soundfile as sf
 
 # Import system packages
 from pathlib import Path
+import tempfile
 
 # Import custom modules
 from models import audiomodel
+from models import streammodel
 from exceptions import audio_exceptions
 
 
@@ -68,6 +70,14 @@ class TestAudioModel(TestCase):
         del self.eightchan_array
 
 
+    def fake_device(self, num_outputs=2):
+        """ Stand in for an audio device, so sd.play tests do not
+            need real hardware.
+        """
+        return mock.patch('models.audiomodel.sd.query_devices',
+            return_value={'name': 'test', 'max_output_channels': num_outputs})
+
+
     # Import numpy arrays #
     def test_import_valid_mono_array(self):
         # Create audio object
@@ -91,6 +101,13 @@ class TestAudioModel(TestCase):
         # Number of channels
         self.assertEqual(self.a_eightchan.num_channels, 8)
 
+    def test_time_base_is_lazy(self):
+        self.a_mono = audiomodel.Audio(self.mono_array, sampling_rate=48000)
+        self.assertNotIn('t', self.a_mono.__dict__)
+        self.assertEqual(len(self.a_mono.t), 48000)
+        self.assertAlmostEqual(self.a_mono.t[-1], 47999 / 48000)
+        self.assertIs(self.a_mono.t, self.a_mono.t)
+
     def test_missing_sampling_rate(self):
         with self.assertRaises(audio_exceptions.MissingSamplingRate):
             self.a_mono = audiomodel.Audio(self.mono_array)
@@ -144,6 +161,94 @@ class TestAudioModel(TestCase):
             self.audio.play(level=-30, device_id=2, routing=[1,2])
             self.assertEqual(self.audio.temp.shape, (48000,2))
 
+    def test_play_with_engine_does_not_call_sd_play(self):
+        engine = streammodel.StreamEngine(backend='null', null_outputs=2)
+        with mock.patch('models.audiomodel.sd.play') as fake_play:
+            self.audio = audiomodel.Audio(self.stereo_array, sampling_rate=48000)
+            self.audio.play(level=-30, device_id=2, routing=[1,2], 
+                            engine=engine)
+            fake_play.assert_not_called()
+        self.assertTrue(engine.wait(5))
+        engine.close()
+
+
+    def test_play_with_engine_float32_is_not_copied(self):
+        engine = streammodel.StreamEngine(backend='null', null_outputs=2)
+        sig = self.stereo_array.astype(np.float32)
+        self.audio = audiomodel.Audio(sig, sampling_rate=48000)
+        self.audio.play(level=-20, device_id=2, routing=[1,2], engine=engine)
+        self.assertIs(self.audio.temp, sig)
+        self.assertAlmostEqual(self.audio.gain, 0.1)
+        engine.close()
+
+
+    def test_play_reuses_working_buffer(self):
+        with mock.patch('models.audiomodel.sd.play') as fake_play, \
+            self.fake_device():
+            self.audio = audiomodel.Audio(self.stereo_array, sampling_rate=48000)
+            self.audio.play(level=-30, device_id=2, routing=[1,2])
+            first = self.audio.temp
+            self.audio.play(level=-20, device_id=2, routing=[1,2])
+            self.assertIs(self.audio.temp, first)
+            self.assertEqual(self.audio.temp.dtype, np.float32)
+            np.testing.assert_allclose(self.audio.temp, 
+                self.stereo_array * 0.1, atol=1e-6)
+
+
+    def test_play_no_level_normalizes_each_channel(self):
+        with mock.patch('models.audiomodel.sd.play') as fake_play, \
+            self.fake_device():
+            self.audio = audiomodel.Audio(self.stereo_array * 0.2, 
+                                          sampling_rate=48000)
+            self.audio.play(level=None, device_id=2, routing=[1,2])
+            np.testing.assert_allclose(
+                np.max(np.abs(self.audio.temp), axis=0), 0.5, rtol=1e-5)
+
+
+    def test_stream_wav_with_engine(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'stereo.wav'
+            sf.write(path, self.stereo_array * 0.5, 48000, subtype='FLOAT')
+            self.audio = audiomodel.Audio(path, stream=True)
+            self.assertIsNone(self.audio.signal)
+            self.assertEqual(self.audio.num_channels, 2)
+            self.assertEqual(self.audio.dur, 1)
+
+            engine = streammodel.StreamEngine(backend='null', null_outputs=2)
+            self.audio.play(level=0, device_id=2, routing=[1,2], 
+                            engine=engine)
+            self.assertIs(self.audio.temp, self.audio.source)
+            self.assertTrue(engine.wait(5))
+            engine.close()
+            self.audio.source.close()
+
+    def test_stream_wav_without_engine_loads_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'stereo.wav'
+            sf.write(path, self.stereo_array * 0.5, 48000, subtype='FLOAT')
+            self.audio = audiomodel.Audio(path, stream=True)
+            with mock.patch('models.audiomodel.sd.play') as fake_play, \
+                self.fake_device():
+                self.audio.play(level=0, device_id=2, routing=[1,2])
+            self.assertIsNone(self.audio.source)
+            self.assertEqual(self.audio.signal.shape, (48000, 2))
+
+
+    def test_play_sequence_with_engine(self):
+        sequence = streammodel.SequenceSource(
+            self.stereo_array[:4800, 0] * 0.5, fs=48000, num_slots=3, 
+            gap=0.05)
+        self.audio = audiomodel.Audio(sequence)
+        self.assertEqual(self.audio.num_channels, 3)
+        self.assertAlmostEqual(self.audio.dur, 3 * 0.15)
+
+        engine = streammodel.StreamEngine(backend='null', null_outputs=3)
+        self.audio.play(level=0, device_id=2, routing=[1, 2, 3],
+                        engine=engine)
+        self.assertIs(self.audio.temp, sequence)
+        self.assertTrue(engine.wait(5))
+        engine.close()
+
 
 if __name__ == '__main__':
     unittest.main()
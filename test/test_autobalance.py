@@ -0,0 +1,243 @@
+""" Unit tests for autobalance.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import os
+import tempfile
+
+# Import custom modules
+from exceptions import audio_exceptions
+from exceptions import speaker_exceptions
+from models import autobalance
+from models import bandanalysis
+from models import noisemodel
+from models import offsetmodel
+from models import speakermodel
+
+
+#########
+# Begin #
+#########
+class TestAutoBalance(TestCase):
+    def setUp(self):
+        self.fs = 48000
+        self.gains_db = [0.0, -3.0, 2.5, -10.0]
+        self.speakers = speakermodel.SpeakerWrangler()
+        for ii in range(0, len(self.gains_db)):
+            self.speakers.add_speaker(ii)
+        self.room = autobalance.SimulatedRoom(gains_db=self.gains_db,
+                                              delay=480)
+        self.balancer = autobalance.AutoBalancer(
+            backend=self.room,
+            speakers=self.speakers,
+            slm_offset=100.0,
+            fs=self.fs
+        )
+        self.signal = noisemodel.NoiseGenerator().wgn(dur=1, fs=self.fs)
+
+
+    def tearDown(self):
+        del self.balancer
+
+
+    def test_simulated_room_delay(self):
+        impulse = np.zeros(1000, dtype=np.float32)
+        impulse[0] = 1
+        rec = self.room.playrec(impulse, self.fs, [1], 1)
+        self.assertEqual(len(rec), 1000)
+        self.assertEqual(np.argmax(rec), 480)
+
+
+    def test_simulated_room_gain(self):
+        rec = self.room.playrec(self.signal, self.fs, [2], 1)
+        level = 20 * np.log10(np.std(rec[480:]) / np.std(self.signal))
+        self.assertAlmostEqual(level, -3.0, places=1)
+
+
+    def test_measure_level_adds_slm_offset(self):
+        rec = np.full(self.fs, 0.1)
+        self.assertAlmostEqual(self.balancer.measure_level(rec), 80.0)
+
+
+    def test_offsets_match_room_gains(self):
+        self.balancer.run(self.signal, level=-20,
+                          num_speakers=len(self.gains_db))
+        offsets = [spkr.offset for spkr in self.speakers.speaker_list]
+        expected = [-g for g in self.gains_db]
+        np.testing.assert_allclose(offsets, expected, atol=0.15)
+        self.assertEqual(self.speakers.check_for_missing_offsets(), [])
+
+
+    def test_offsets_with_background_noise(self):
+        self.balancer.backend = autobalance.SimulatedRoom(
+            gains_db=self.gains_db, noise_db=-70, seed=1)
+        self.balancer.run(self.signal, level=-20,
+                          num_speakers=len(self.gains_db))
+        offsets = [spkr.offset for spkr in self.speakers.speaker_list]
+        expected = [-g for g in self.gains_db]
+        np.testing.assert_allclose(offsets, expected, atol=0.2)
+
+
+    def test_progress_callback(self):
+        calls = []
+        self.balancer.run(self.signal, level=-20, num_speakers=2,
+            progress=lambda *args: calls.append(args))
+        self.assertEqual([call[0] for call in calls], [0, 1])
+        self.assertEqual(calls[0][2], 0)
+
+
+    def test_clipping_raises(self):
+        with self.assertRaises(audio_exceptions.Clipping):
+            self.balancer.run(self.signal, level=6, num_speakers=1)
+
+
+    def test_band_offsets(self):
+        self.balancer = autobalance.AutoBalancer(
+            backend=self.room,
+            speakers=self.speakers,
+            slm_offset=100.0,
+            fs=self.fs,
+            analyzer=bandanalysis.BandAnalyzer(self.fs, fraction=1)
+        )
+        self.balancer.run(self.signal, level=-20,
+                          num_speakers=len(self.gains_db))
+        offsets = self.balancer.band_offsets()
+        self.assertEqual(offsets.shape, 
+            (len(self.gains_db), len(self.balancer.analyzer.centers)))
+        # The simulated room is flat, so every band has the same offset
+        expected = np.repeat(-np.array(self.gains_db)[:, None], 
+                             offsets.shape[1], axis=1)
+        np.testing.assert_allclose(offsets, expected, atol=0.15)
+        self.assertIn("1000", self.balancer.band_report())
+
+
+    def test_saved_offsets_balance_the_room(self):
+        self.balancer.run(self.signal, level=-20,
+                          num_speakers=len(self.gains_db))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'offsets.csv')
+            with open(path, 'w', newline='') as f:
+                f.write("Channel,Offset\n")
+                for channel, offset in self.speakers.get_data().items():
+                    f.write(f"{channel},{offset}\n")
+            gains = offsetmodel.OffsetGains().load(path)
+
+        # Measuring again with the offsets applied finds no difference
+        # and still reports absolute offsets, ready to be saved
+        self.balancer.channel_gains = gains
+        self.balancer.run(self.signal, level=-20,
+                          num_speakers=len(self.gains_db))
+        residuals = [self.balancer.residuals[ii] 
+                     for ii in range(len(self.gains_db))]
+        np.testing.assert_allclose(residuals, 0, atol=0.15)
+        np.testing.assert_allclose(self.speakers.offsets,
+                                   -np.array(self.gains_db), atol=0.15)
+
+
+    def test_band_offsets_need_reference(self):
+        with self.assertRaises(speaker_exceptions.MissingReference):
+            self.balancer.band_offsets()
+
+
+class TestParallelBalance(TestCase):
+    def setUp(self):
+        self.fs = 48000
+        self.gains_db = [0.0, -3.0, 2.5, -10.0, -6.2, 1.1, -0.4, 4.0]
+        self.speakers = speakermodel.SpeakerWrangler()
+        for ii in range(0, len(self.gains_db)):
+            self.speakers.add_speaker(ii)
+        self.room = autobalance.SimulatedRoom(
+            gains_db=self.gains_db,
+            delay=[0, 100, 300, 480, 900, 1500, 2000, 4000]
+        )
+        self.balancer = autobalance.AutoBalancer(
+            backend=self.room,
+            speakers=self.speakers,
+            slm_offset=100.0,
+            fs=self.fs
+        )
+
+
+    def tearDown(self):
+        del self.balancer
+
+
+    def test_channels_use_disjoint_bins(self):
+        excitation = autobalance.MultitoneExcitation(4, fs=self.fs)
+        bins = np.concatenate(excitation.bins)
+        self.assertEqual(len(bins), len(np.unique(bins)))
+        spectrum = np.abs(np.fft.rfft(excitation.signal, axis=0))
+        for ii, k in enumerate(excitation.bins):
+            others = np.setdiff1d(np.arange(len(spectrum)), k)
+            self.assertLess(spectrum[others, ii].max(), 1e-9)
+
+
+    def test_make_adds_cyclic_prefix(self):
+        excitation = autobalance.MultitoneExcitation(2, fs=self.fs)
+        sig = excitation.make(prefix=100)
+        self.assertEqual(len(sig), excitation.N + 100)
+        np.testing.assert_allclose(sig[:100], sig[-100:])
+
+
+    def test_too_many_channels_raises(self):
+        with self.assertRaises(ValueError):
+            autobalance.MultitoneExcitation(64, fs=self.fs, dur=0.001)
+
+
+    def test_parallel_offsets_match_room_gains(self):
+        self.balancer.run_parallel(level=-20,
+                                   num_speakers=len(self.gains_db))
+        offsets = [spkr.offset for spkr in self.speakers.speaker_list]
+        expected = [-g for g in self.gains_db]
+        np.testing.assert_allclose(offsets, expected, atol=0.15)
+
+
+    def test_parallel_with_background_noise(self):
+        self.balancer.backend = autobalance.SimulatedRoom(
+            gains_db=self.gains_db, delay=480, noise_db=-60, seed=1)
+        self.balancer.run_parallel(level=-20,
+                                   num_speakers=len(self.gains_db))
+        offsets = [spkr.offset for spkr in self.speakers.speaker_list]
+        expected = [-g for g in self.gains_db]
+        np.testing.assert_allclose(offsets, expected, atol=0.3)
+
+
+    def test_parallel_with_saved_offsets(self):
+        offsets = -np.array(self.gains_db)
+        self.balancer.channel_gains = (10**(offsets / 20)).astype(np.float32)
+        self.balancer.run_parallel(level=-30,
+                                   num_speakers=len(self.gains_db))
+        np.testing.assert_allclose(self.speakers.offsets, offsets, atol=0.15)
+        residuals = [self.balancer.residuals[ii] 
+                     for ii in range(len(self.gains_db))]
+        np.testing.assert_allclose(residuals, 0, atol=0.15)
+
+
+    def test_parallel_plays_once(self):
+        calls = []
+        playrec = self.room.playrec
+        def _playrec(*args):
+            calls.append(args[2])
+            return playrec(*args)
+        self.room.playrec = _playrec
+        self.balancer.run_parallel(level=-20, num_speakers=4)
+        self.assertEqual(calls, [[1, 2, 3, 4]])
+
+
+    def test_parallel_clipping_raises(self):
+        with self.assertRaises(audio_exceptions.Clipping):
+            self.balancer.run_parallel(level=6, num_speakers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+""" Unit tests for bandanalysis.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import bandanalysis
+
+
+#########
+# Begin #
+#########
+class TestWeighting(TestCase):
+    def test_unity_at_1k(self):
+        for curve in ['A', 'C', 'Z']:
+            self.assertAlmostEqual(
+                float(bandanalysis.weighting_db(1000, curve)), 0, places=2)
+
+
+    def test_a_weighting_table_values(self):
+        # IEC 61672-1 nominal values
+        freqs = [31.5, 100, 500, 4000, 10000]
+        expected = [-39.4, -19.1, -3.2, 1.0, -2.5]
+        np.testing.assert_allclose(
+            bandanalysis.weighting_db(freqs, 'A'), expected, atol=0.15)
+
+
+    def test_c_weighting_table_values(self):
+        freqs = [31.5, 100, 4000, 10000]
+        expected = [-3.0, -0.3, -0.8, -4.4]
+        np.testing.assert_allclose(
+            bandanalysis.weighting_db(freqs, 'C'), expected, atol=0.1)
+
+
+    def test_unknown_weighting_raises(self):
+        with self.assertRaises(ValueError):
+            bandanalysis.weighting_db(1000, 'B')
+
+
+    def test_band_centers(self):
+        octaves = bandanalysis.band_centers(1, 20, 20000)
+        np.testing.assert_allclose(
+            octaves, 1000 * 2.0**np.arange(-5, 5), rtol=0.03)
+        self.assertEqual(len(bandanalysis.band_centers(3, 20, 20000)), 30)
+
+
+class TestBandAnalyzer(TestCase):
+    def setUp(self):
+        self.fs = 48000
+        self.t = np.arange(self.fs) / self.fs
+
+
+    def test_sine_level(self):
+        analyzer = bandanalysis.BandAnalyzer(self.fs, weighting='Z')
+        sine = np.sin(2 * np.pi * 1000 * self.t)
+        self.assertAlmostEqual(float(analyzer.level(sine)[0]), -3.01, 
+                               places=2)
+
+
+    def test_sine_falls_in_its_band(self):
+        analyzer = bandanalysis.BandAnalyzer(self.fs, fraction=1)
+        sine = np.sin(2 * np.pi * 250 * self.t)
+        bands = analyzer.bands(sine)[:, 0]
+        idx = np.argmin(np.abs(analyzer.centers - 250))
+        self.assertEqual(np.argmax(bands), idx)
+        self.assertAlmostEqual(bands[idx], -3.01, places=2)
+
+
+    def test_weighting_applied(self):
+        analyzer = bandanalysis.BandAnalyzer(self.fs, weighting='A')
+        sine = np.sin(2 * np.pi * 100 * self.t)
+        self.assertAlmostEqual(float(analyzer.level(sine)[0]), 
+                               -3.01 - 19.1, places=1)
+
+
+    def test_bands_sum_to_broadband(self):
+        tones = sum(np.sin(2 * np.pi * f * self.t) for f in [63, 1000, 5000])
+        analyzer = bandanalysis.BandAnalyzer(self.fs, fraction=3)
+        level, bands = analyzer.analyze(tones)
+        band_total = 10 * np.log10(np.sum(10**(bands / 10), axis=0))
+        np.testing.assert_allclose(band_total, level, atol=0.01)
+        np.testing.assert_allclose(level, -3.01 + 10 * np.log10(3), 
+                                   atol=0.01)
+
+
+    def test_channels_analyzed_independently(self):
+        rng = np.random.default_rng(1)
+        noise = rng.standard_normal((self.fs, 20)).astype(np.float32)
+        noise *= np.arange(1, 21, dtype=np.float32)
+        analyzer = bandanalysis.BandAnalyzer(self.fs)
+        levels = analyzer.level(noise)
+        one = [float(analyzer.level(noise[:, ii])[0]) for ii in range(20)]
+        np.testing.assert_allclose(levels, one, atol=1e-4)
+
+
+    def test_slm_offset(self):
+        analyzer = bandanalysis.BandAnalyzer(self.fs, slm_offset=100)
+        sine = np.sin(2 * np.pi * 1000 * self.t)
+        self.assertAlmostEqual(float(analyzer.level(sine)[0]), 96.99, 
+                               places=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,11 +8,19 @@
 import unittest
 from unittest.mock import patch
 
-# Import GUI packages
-import tkinter as tk
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import os
+import tempfile
+
+# Import audio packages
+import soundfile as sf
 
 # Import custom modules
 from models.calmodel import CalModel
+from models.sessionmodel import SessionParams
 
 
 #########
@@ -23,51 +31,63 @@ class TestCalModel(unittest.TestCase):
     """
 
     def setUp(self):
-        self.root = tk.Tk()
-        # Fake sessionpars
-        self.fake_sessionpars = {
-            'cal_file': tk.StringVar(value='cal_stim.wav'),
-            'slm_reading': tk.DoubleVar(value=75.5),
-            'cal_level_dB': tk.DoubleVar(value=-30),
-            'slm_offset': tk.DoubleVar(value=1.0),
-            'adjusted_level_dB': tk.DoubleVar(value=1.0),
-            'desired_level_dB': tk.DoubleVar(value=1.0)
-        }
+        # Parameters
+        self.params = SessionParams(
+            cal_file='cal_stim.wav',
+            slm_reading=75.5,
+            cal_level_dB=-30.0,
+            slm_offset=1.0,
+            adjusted_level_dB=1.0,
+            desired_level_dB=1.0
+        )
 
 
     def tearDown(self):
-        del self.root
-        del self.fake_sessionpars
+        del self.params
 
 
     def test_calmodel_init(self):
-        c = CalModel(self.fake_sessionpars)
+        c = CalModel(self.params)
 
 
     def test_get_cal_file_exists(self):
-        c = CalModel(self.fake_sessionpars)
+        c = CalModel(self.params)
         c.get_cal_file()
 
 
     @patch('app_assets.audio.CALSTIM_WAV', 'fake_calstim.wav')
     def test_get_cal_file_not_exists(self):
-        c = CalModel(self.fake_sessionpars)
+        c = CalModel(self.params)
         with self.assertRaises(AttributeError):
             c.get_cal_file()
 
 
+    def test_get_cal_audio_is_cached(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.params.cal_file = os.path.join(tmpdir, 'cal.wav')
+            sf.write(self.params.cal_file, np.zeros(480), 48000)
+            c = CalModel(self.params)
+            with patch('models.audiocache.sf.read', 
+                       wraps=sf.read) as fake_read:
+                signal, fs = c.get_cal_audio()
+                # The second press does not decode the file again
+                self.assertIs(c.get_cal_audio()[0], signal)
+                fake_read.assert_called_once()
+        self.assertEqual(fs, 48000)
+
+
     def test_calc_offset(self):
-        c = CalModel(self.fake_sessionpars)
+        c = CalModel(self.params)
         c.calc_offset()
-        self.assertEqual(self.fake_sessionpars['slm_offset'].get(), 105.5)
+        self.assertEqual(self.params.slm_offset, 105.5)
 
 
     def test_calc_level(self):
-        self.fake_sessionpars['slm_offset'].set(105.5)
-        c = CalModel(self.fake_sessionpars)
+        self.params.slm_offset = 105.5
+        c = CalModel(self.params)
         c.calc_level(80)
         self.assertEqual(
-            self.fake_sessionpars['adjusted_level_dB'].get(), 
+            self.params.adjusted_level_dB, 
             -25.5
         )
 
@@ -0,0 +1,205 @@
+""" Unit tests for the command-line entry point.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+from unittest import mock
+
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import contextlib
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Import custom modules
+import cli
+from exceptions import speaker_exceptions
+from models import sessionmodel
+from models import speakermodel
+
+
+#########
+# Begin #
+#########
+class TestCLI(TestCase):
+    def setUp(self):
+        # Keep config.json out of the real home directory
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.home = mock.patch.object(Path, 'home',
+                                      return_value=Path(self.tmpdir.name))
+        self.home.start()
+        self.defaults = {key: dict(field) for key, field
+                         in sessionmodel.SessionParsModel.fields.items()}
+
+
+    def tearDown(self):
+        # SessionParsModel.fields is shared by all instances
+        sessionmodel.SessionParsModel.fields.update(self.defaults)
+        self.home.stop()
+        self.tmpdir.cleanup()
+
+
+    def parse(self, argv):
+        return cli.build_parser().parse_args(argv)
+
+
+    def test_overrides_are_applied(self):
+        args = self.parse(['--speakers', '8', '--level', '-20', 'balance',
+                           '--mic-channel', '2', '--weighting', 'A'])
+        model, pars = cli.load_sessionpars(args)
+        self.assertEqual(pars.num_speakers, 8)
+        self.assertEqual(pars.level, -20.0)
+        self.assertEqual(pars.mic_channel, 2)
+        self.assertEqual(pars.weighting, 'A')
+        # Not saved without --save-config
+        self.assertFalse(model.filepath.exists())
+
+
+    def test_sessionpars_are_typed(self):
+        _, pars = cli.load_sessionpars(self.parse(['config']))
+        self.assertIsInstance(pars, sessionmodel.SessionParams)
+        # Stored as an int in the defaults
+        self.assertIsInstance(pars.desired_level_dB, float)
+
+
+    def test_options_after_mode(self):
+        path = os.path.join(self.tmpdir.name, 'booth1.csv')
+        args = self.parse(['balance', '--device', '5', '--speakers', '8',
+                           '-o', path, '--no-offsets'])
+        self.assertEqual(args.output, path)
+        self.assertTrue(args.no_offsets)
+        _, pars = cli.load_sessionpars(args)
+        self.assertEqual(pars.audio_device, 5)
+        self.assertEqual(pars.num_speakers, 8)
+        args = self.parse(['manual', '--level', '-30'])
+        self.assertEqual(args.level, -30.0)
+
+
+    def test_options_before_mode_are_kept(self):
+        args = self.parse(['--speakers', '4', '--save-config', 'manual'])
+        self.assertEqual(args.speakers, 4)
+        self.assertTrue(args.save_config)
+        self.assertIsNone(args.output)
+
+
+    def test_save_config(self):
+        args = self.parse(['--speakers', '6', '--save-config', 'config'])
+        model, _ = cli.load_sessionpars(args)
+        self.assertTrue(model.filepath.exists())
+
+
+    def test_no_offsets(self):
+        args = self.parse(['--offsets-file', 'x.csv', '--no-offsets',
+                           'manual'])
+        _, pars = cli.load_sessionpars(args)
+        self.assertEqual(pars.offsets_file, '')
+
+
+    def test_config_mode(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(cli.main(['--speakers', '5', 'config']), 0)
+        self.assertIn('num_speakers: 5', out.getvalue())
+
+
+    def test_manual_removes_applied_offsets(self):
+        from models import streammodel
+        engine = streammodel.StreamEngine(backend='null')
+        # Saved offsets of 0 and -2 dB are applied during playback
+        engine.set_channel_gains(np.array([1.0, 10**(-2 / 20)],
+                                          dtype=np.float32))
+        speakers = speakermodel.SpeakerWrangler(num_speakers=2)
+        args = self.parse(['manual'])
+        _, pars = cli.load_sessionpars(args)
+        pars.num_speakers = 2
+        with mock.patch.object(cli, '_open_engine', return_value=engine), \
+            mock.patch('models.audiomodel.Audio'), \
+            mock.patch('builtins.input', side_effect=['70', '70']), \
+            contextlib.redirect_stdout(io.StringIO()):
+            cli.run_manual(args, pars, speakers)
+        # The balanced speaker keeps its full offset
+        np.testing.assert_allclose(speakers.offsets, [0, -2], atol=1e-4)
+
+
+    def test_missing_offsets_file_exits(self):
+        for text in [None, "not,an\noffsets,file\n"]:
+            path = os.path.join(self.tmpdir.name, 'offsets.csv')
+            if text is not None:
+                with open(path, 'w') as f:
+                    f.write(text)
+            with contextlib.redirect_stderr(io.StringIO()) as err, \
+                contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(
+                    cli.main(['--offsets-file', path, 'sequence']), 1)
+            self.assertIn('Cannot load offsets file', err.getvalue())
+
+
+    def test_manual_asks_for_speaker_1_first(self):
+        from models import streammodel
+        engine = streammodel.StreamEngine(backend='null')
+        speakers = speakermodel.SpeakerWrangler(num_speakers=2)
+        args = self.parse(['manual'])
+        _, pars = cli.load_sessionpars(args)
+        pars.num_speakers = 2
+        # Skip speaker 1, then measure speaker 2 before speaker 1
+        replies = ['s', '72', '70', '71']
+        with mock.patch.object(cli, '_open_engine', return_value=engine), \
+            mock.patch('models.audiomodel.Audio'), \
+            mock.patch('builtins.input', side_effect=replies), \
+            contextlib.redirect_stdout(io.StringIO()) as out:
+            cli.run_manual(args, pars, speakers)
+        self.assertIn('measure it first', out.getvalue())
+        np.testing.assert_allclose(speakers.offsets, [0, -1])
+
+
+    def test_missing_reference_exits(self):
+        error = speaker_exceptions.MissingReference()
+        with mock.patch.object(cli, 'run_manual', side_effect=error), \
+            contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(cli.main(['manual']), 1)
+        self.assertIn('reference', err.getvalue())
+
+
+    def test_programming_errors_are_not_hidden(self):
+        with mock.patch.object(cli, 'run_manual', side_effect=TypeError):
+            with self.assertRaises(TypeError):
+                cli.main(['manual'])
+
+
+    def test_save_offsets(self):
+        speakers = speakermodel.SpeakerWrangler(num_speakers=3)
+        speakers.calc_offset(channel=[0, 1], slm_level=[70, 72])
+        path = os.path.join(self.tmpdir.name, 'offsets.csv')
+        args = self.parse(['-o', path, 'manual'])
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            saved = cli.save_offsets(args, sessionmodel.SessionParams(),
+                                     speakers)
+        self.assertEqual(str(saved), path)
+        self.assertIn('[3]', err.getvalue())
+        with open(path, newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [['Channel', 'Offset'], ['0', '0.0'],
+                                ['1', '-2.0'], ['2', '']])
+
+
+    def test_does_not_import_tkinter(self):
+        code = "import sys, cli; print('tkinter' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code],
+                                cwd=Path(cli.__file__).parent,
+                                capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+""" Unit tests for levelmeter.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import levelmeter
+
+
+#########
+# Begin #
+#########
+class TestLevelMeter(TestCase):
+    def setUp(self):
+        self.fs = 48000
+        self.meter = levelmeter.LevelMeter(num_channels=2, fs=self.fs,
+                                           window=0.5, slm_offset=100)
+
+
+    def tearDown(self):
+        del self.meter
+
+
+    def feed(self, signal, blocksize=1000):
+        for ii in range(0, len(signal), blocksize):
+            self.meter.process(signal[ii:ii + blocksize])
+
+
+    def test_constant_signal_levels(self):
+        sig = np.ones((self.fs, 2), dtype=np.float32)
+        sig[:, 0] *= 0.1
+        sig[:, 1] *= 0.05
+        self.feed(sig)
+        expected = [80.0, 100 + 20 * np.log10(0.05)]
+        np.testing.assert_allclose(self.meter.rms, expected, atol=1e-4)
+        np.testing.assert_allclose(self.meter.leq, expected, atol=1e-4)
+        np.testing.assert_allclose(self.meter.peak, expected, atol=1e-4)
+        np.testing.assert_allclose(self.meter.fast, expected, atol=0.01)
+
+
+    def test_window_forgets_old_samples(self):
+        self.feed(np.full((self.fs, 2), 0.5, dtype=np.float32))
+        self.feed(np.full((self.fs, 2), 0.1, dtype=np.float32))
+        # Window only holds the quieter signal, Leq holds both
+        np.testing.assert_allclose(self.meter.rms, [80, 80], atol=1e-4)
+        leq = 100 + 10 * np.log10((0.5**2 + 0.1**2) / 2)
+        np.testing.assert_allclose(self.meter.leq, [leq, leq], atol=1e-4)
+
+
+    def test_window_matches_direct_rms(self):
+        rng = np.random.default_rng(1)
+        sig = rng.standard_normal((3 * self.fs + 123, 2)).astype(np.float32)
+        self.feed(sig, blocksize=777)
+        tail = sig[-self.meter.size:].astype(np.float64)
+        expected = 100 + 20 * np.log10(np.sqrt(np.mean(tail**2, axis=0)))
+        np.testing.assert_allclose(self.meter.rms, expected, atol=1e-4)
+
+
+    def test_block_larger_than_window(self):
+        sig = np.full((2 * self.meter.size, 2), 0.1, dtype=np.float32)
+        self.meter.process(sig)
+        np.testing.assert_allclose(self.meter.rms, [80, 80], atol=1e-4)
+
+
+    def test_peak(self):
+        sig = np.zeros((self.fs, 2), dtype=np.float32)
+        sig[100, 0] = -0.5
+        sig[200, 1] = 0.25
+        self.feed(sig)
+        np.testing.assert_allclose(
+            self.meter.peak, 100 + 20 * np.log10([0.5, 0.25]), atol=1e-4)
+
+
+    def test_slow_responds_slower_than_fast(self):
+        self.feed(np.full((self.fs // 4, 2), 0.1, dtype=np.float32))
+        self.assertTrue(np.all(self.meter.fast > self.meter.slow))
+
+
+    def test_silence_is_negative_infinity(self):
+        self.assertTrue(np.all(np.isneginf(self.meter.rms)))
+
+
+    def test_reset(self):
+        self.feed(np.full((self.fs, 2), 0.1, dtype=np.float32))
+        self.meter.reset()
+        self.assertTrue(np.all(np.isneginf(self.meter.leq)))
+
+
+class TestMeterStream(TestCase):
+    def setUp(self):
+        self.meter = levelmeter.LevelMeter(num_channels=2, fs=48000)
+        self.indata = np.zeros((1024, 4), dtype=np.float32)
+        self.indata[:, 0] = 0.1
+        self.indata[:, 2] = 0.01
+
+
+    def test_consecutive_channels_use_a_view(self):
+        stream = levelmeter.MeterStream(self.meter, None, [3, 4])
+        self.assertEqual(stream._cols, slice(2, 4))
+        stream._callback(self.indata, 1024, None, None)
+        np.testing.assert_allclose(self.meter.leq, [-40, -np.inf])
+
+
+    def test_scattered_channels_reuse_a_buffer(self):
+        stream = levelmeter.MeterStream(self.meter, None, [1, 3])
+        gather = stream._gather
+        for _ in range(3):
+            stream._callback(self.indata, 1024, None, None)
+        self.assertIs(stream._gather, gather)
+        np.testing.assert_allclose(self.meter.leq, [-20, -40], atol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+""" Unit tests for noisemodel.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import noisemodel
+
+
+#########
+# Begin #
+#########
+class TestNoiseGenerator(TestCase):
+    def setUp(self):
+        self.gen = noisemodel.NoiseGenerator(seed=4)
+
+
+    def tearDown(self):
+        del self.gen
+
+
+    def test_wgn_mono_shape_and_dtype(self):
+        wgn = self.gen.wgn(dur=1, fs=48000)
+        self.assertEqual(wgn.shape, (48000,))
+        self.assertEqual(wgn.dtype, np.float32)
+
+
+    def test_wgn_multichannel_shape(self):
+        wgn = self.gen.wgn(dur=0.5, fs=48000, num_channels=4)
+        self.assertEqual(wgn.shape, (24000, 4))
+
+
+    def test_wgn_normalized_without_dc(self):
+        wgn = self.gen.wgn(dur=1, fs=48000, num_channels=3)
+        np.testing.assert_allclose(np.max(np.abs(wgn), axis=0), 1, rtol=1e-6)
+        np.testing.assert_allclose(np.mean(wgn, axis=0), 0, atol=1e-6)
+
+
+    def test_wgn_same_seed_is_reproducible(self):
+        a = self.gen.wgn(dur=1, fs=48000)
+        b = noisemodel.NoiseGenerator(seed=4).wgn(dur=1, fs=48000)
+        np.testing.assert_array_equal(a, b)
+
+
+    def test_wgn_different_seed_differs(self):
+        a = self.gen.wgn(dur=1, fs=48000)
+        b = noisemodel.NoiseGenerator(seed=5).wgn(dur=1, fs=48000)
+        self.assertFalse(np.array_equal(a, b))
+
+
+    def test_wgn_channels_are_independent(self):
+        wgn = self.gen.wgn(dur=1, fs=48000, num_channels=2)
+        r = np.corrcoef(wgn[:, 0], wgn[:, 1])[0, 1]
+        self.assertLess(abs(r), 0.05)
+
+
+    def test_wgn_zero_duration(self):
+        wgn = self.gen.wgn(dur=0, fs=48000)
+        self.assertEqual(wgn.shape, (0,))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+""" Unit tests for offsetmodel.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import csv
+import os
+import tempfile
+import time
+
+# Import custom modules
+from models import offsetmodel
+
+
+#########
+# Begin #
+#########
+def write_offsets(path, data):
+    """ Write DATA the same way CSVModel.save_record does. """
+    with open(path, 'w', newline='') as csv_file:
+        csvwriter = csv.writer(csv_file)
+        csvwriter.writerow(["Channel", "Offset"])
+        for key, value in data.items():
+            csvwriter.writerow([key, value])
+
+
+class TestOffsetGains(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'offsets.csv')
+        write_offsets(self.path, {0: 0.0, 1: -6.0, 2: None, 3: 3.5})
+        self.gains = offsetmodel.OffsetGains()
+
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+    def test_read_offsets(self):
+        self.assertEqual(offsetmodel.read_offsets(self.path),
+                         {0: 0.0, 1: -6.0, 2: None, 3: 3.5})
+
+
+    def test_gain_vector(self):
+        gains = self.gains.load(self.path)
+        self.assertEqual(gains.dtype, np.float32)
+        np.testing.assert_allclose(
+            gains, [1, 10**(-6 / 20), 1, 10**(3.5 / 20)], rtol=1e-6)
+        self.assertFalse(gains.flags.writeable)
+
+
+    def test_load_is_cached(self):
+        self.assertIs(self.gains.load(self.path), self.gains.load(self.path))
+
+
+    def test_changed_file_is_reloaded(self):
+        first = self.gains.load(self.path)
+        time.sleep(0.01)
+        write_offsets(self.path, {0: 0.0, 1: -1.0})
+        second = self.gains.load(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(second), 2)
+
+
+    def test_invalid_file_raises(self):
+        with open(self.path, 'w') as f:
+            f.write("a,b\n1,2\n")
+        with self.assertRaises(ValueError):
+            self.gains.load(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
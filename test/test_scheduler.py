@@ -0,0 +1,144 @@
+""" Unit tests for scheduler.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import system packages
+import threading
+import time
+
+# Import custom modules
+from models import scheduler
+
+
+#########
+# Begin #
+#########
+class FakeRoot:
+    """ Stand-in for a Tk root: after() callbacks run when tick()
+        is called.
+    """
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+
+    def after(self, ms, func):
+        self._next_id += 1
+        self.pending[self._next_id] = func
+        return self._next_id
+
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+
+    def tick(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+
+class TestMeasurementScheduler(TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.sched = scheduler.MeasurementScheduler(self.root)
+        self.log = []
+        self.done = []
+
+
+    def tearDown(self):
+        self.sched.close()
+
+
+    def run_loop(self, limit=2.0, until=None):
+        """ Drive the scheduler like the Tk main loop would. """
+        end = time.monotonic() + limit
+        while self.root.pending and time.monotonic() < end:
+            if until is not None and until():
+                return
+            self.root.tick()
+            time.sleep(0.001)
+
+
+    def make_steps(self, num, dur=0.01):
+        async def step(ii):
+            self.log.append(('start', ii))
+            await self.sched.sleep(dur)
+            self.log.append(('end', ii))
+        return [lambda ii=ii: step(ii) for ii in range(num)]
+
+
+    def on_done(self, state, error):
+        self.done.append((state, error))
+
+
+    def test_steps_run_in_order(self):
+        self.sched.start(self.make_steps(3), on_done=self.on_done)
+        self.assertTrue(self.sched.busy)
+        self.run_loop()
+        self.assertEqual(self.log, [('start', 0), ('end', 0), ('start', 1),
+                                    ('end', 1), ('start', 2), ('end', 2)])
+        self.assertEqual(self.done, [('finished', None)])
+        self.assertFalse(self.sched.busy)
+        # The Tk driver stops once the sequence ends
+        self.assertEqual(self.root.pending, {})
+
+
+    def test_cancel(self):
+        self.sched.start(self.make_steps(3, dur=10), on_done=self.on_done)
+        self.run_loop(until=lambda: self.log)
+        self.sched.cancel()
+        self.run_loop()
+        self.assertEqual(self.log, [('start', 0)])
+        self.assertEqual(self.done, [('cancelled', None)])
+
+
+    def test_timeout(self):
+        self.sched.start(self.make_steps(2, dur=10), timeout=0.02,
+                         on_done=self.on_done)
+        self.run_loop()
+        self.assertEqual(self.log, [('start', 0)])
+        self.assertEqual(self.done[0][0], 'failed')
+
+
+    def test_pause_and_resume(self):
+        self.sched.start(self.make_steps(2), on_done=self.on_done)
+        self.sched.pause()
+        self.assertEqual(self.sched.state, 'paused')
+        for _ in range(20):
+            self.root.tick()
+            time.sleep(0.001)
+        self.assertEqual(self.log, [])
+        self.sched.resume()
+        self.run_loop()
+        self.assertEqual(len(self.log), 4)
+        self.assertEqual(self.sched.state, 'finished')
+
+
+    def test_wait_for_event(self):
+        event = threading.Event()
+
+        async def step():
+            await self.sched.wait_for_event(event)
+            self.log.append('set')
+
+        self.sched.start([step], on_done=self.on_done)
+        threading.Timer(0.02, event.set).start()
+        self.run_loop()
+        self.assertEqual(self.log, ['set'])
+
+
+    def test_only_one_sequence(self):
+        self.sched.start(self.make_steps(1, dur=10))
+        with self.assertRaises(RuntimeError):
+            self.sched.start(self.make_steps(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
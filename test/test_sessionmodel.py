@@ -0,0 +1,139 @@
+""" Unit tests for sessionmodel.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+from unittest import mock
+
+# Import system packages
+import copy
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+
+# Import custom modules
+from models import sessionmodel
+
+
+#########
+# Begin #
+#########
+class TestSessionParsModel(TestCase):
+    def setUp(self):
+        # Keep the class-level defaults intact between tests
+        self._fields = copy.deepcopy(sessionmodel.SessionParsModel.fields)
+
+        # Point the config directory at a temporary home
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = mock.patch('models.sessionmodel.Path.home', 
+                             return_value=Path(self.tmpdir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.m = sessionmodel.SessionParsModel({'name': 'TestApp'})
+
+
+    def tearDown(self):
+        self.m._cancel_timer()
+        sessionmodel.SessionParsModel.fields = self._fields
+        self.tmpdir.cleanup()
+
+
+    def _read_file(self):
+        with open(self.m.filepath, 'r') as fh:
+            return json.load(fh)
+
+
+    def test_set_marks_only_changed_keys_dirty(self):
+        self.m.set('duration', 3.0)
+        self.assertEqual(self.m.dirty, set())
+        self.m.set('duration', 5.0)
+        self.m.set('level', -20.0)
+        self.assertEqual(self.m.dirty, {'duration', 'level'})
+
+
+    def test_set_bad_type(self):
+        with self.assertRaises(ValueError):
+            self.m.set('duration', 'long')
+
+
+    def test_first_save_creates_file(self):
+        self.assertTrue(self.m.save())
+        self.assertTrue(self.m.filepath.exists())
+
+
+    def test_save_writes_once_per_batch(self):
+        self.m.save()
+        with mock.patch('models.sessionmodel.os.replace', 
+                        wraps=os.replace) as fake_replace:
+            for key, value in [('duration', 5.0), ('level', -20.0)]:
+                self.m.set(key, value)
+            self.assertTrue(self.m.save())
+            self.assertFalse(self.m.save())
+            self.assertEqual(fake_replace.call_count, 1)
+        self.assertEqual(self._read_file()['duration']['value'], 5.0)
+        self.assertEqual(self.m.dirty, set())
+
+
+    def test_failed_write_keeps_old_file(self):
+        self.m.save()
+        self.m.set('duration', 9.0)
+        with mock.patch('models.sessionmodel.json.dump', 
+                        side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.m.save()
+        self.assertEqual(self._read_file()['duration']['value'], 3.0)
+        self.assertEqual(os.listdir(self.m.filepath.parent), ['config.json'])
+        self.assertEqual(self.m.dirty, {'duration'})
+
+
+    def test_save_later_debounces(self):
+        self.m.save()
+        with mock.patch.object(self.m, 'save', 
+                               wraps=self.m.save) as fake_save:
+            self.m.set('duration', 4.0)
+            self.m.save_later(0.05)
+            self.m.set('duration', 6.0)
+            self.m.save_later(0.05)
+            time.sleep(0.2)
+            self.assertEqual(fake_save.call_count, 1)
+            self.assertEqual(self.m.dirty, set())
+        self.assertEqual(self._read_file()['duration']['value'], 6.0)
+
+
+    def test_flush_writes_pending_changes(self):
+        self.m.save()
+        self.m.set('level', -10.0)
+        self.m.save_later(60)
+        self.assertTrue(self.m.flush())
+        self.assertIsNone(self.m._timer)
+        self.assertEqual(self._read_file()['level']['value'], -10.0)
+
+
+    def test_to_params(self):
+        self.m.set('level', -12.0)
+        params = self.m.to_params()
+        self.assertIsInstance(params, sessionmodel.SessionParams)
+        self.assertEqual(params.level, -12.0)
+        self.assertIsInstance(params.num_speakers, int)
+        # Slots: misspelled parameters fail loudly
+        with self.assertRaises(AttributeError):
+            params.levle = -10.0
+
+
+    def test_update_from_params(self):
+        params = self.m.to_params()
+        params.duration = 4.0
+        self.m.update(params)
+        self.assertEqual(self.m.fields['duration']['value'], 4.0)
+        self.assertEqual(self.m.dirty, {'duration'})
+
+
+if __name__ == '__main__':
+    unittest.main()
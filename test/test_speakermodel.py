@@ -0,0 +1,126 @@
+""" Unit tests for speakermodel.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from exceptions import speaker_exceptions
+from models import speakermodel
+
+
+#########
+# Begin #
+#########
+class TestSpeakerWrangler(TestCase):
+    def setUp(self):
+        self.sw = speakermodel.SpeakerWrangler()
+        for ii in range(0, 4):
+            self.sw.add_speaker(ii)
+
+
+    def tearDown(self):
+        del self.sw
+
+
+    def test_add_speaker_returns_view(self):
+        speaker = self.sw.add_speaker(4)
+        self.assertEqual(speaker.channel, 4)
+        self.assertIsNone(speaker.offset)
+        self.assertIsNone(speaker.slm_level)
+        self.assertFalse(speaker.calibrated)
+        self.assertEqual(len(self.sw.speaker_list), 5)
+
+
+    def test_calc_offset(self):
+        self.sw.calc_offset(channel=0, slm_level=70)
+        self.sw.calc_offset(channel=2, slm_level=72.34)
+        self.assertEqual(self.sw.ref_level, 70)
+        self.assertEqual(self.sw.speaker_list[0].offset, 0)
+        self.assertEqual(self.sw.speaker_list[2].offset, -2.3)
+        self.assertEqual(self.sw.speaker_list[2].slm_level, 72.34)
+        self.assertTrue(self.sw.speaker_list[2].calibrated)
+
+
+    def test_calc_offset_requires_reference(self):
+        with self.assertRaises(speaker_exceptions.MissingReference):
+            self.sw.calc_offset(channel=1, slm_level=70)
+        self.assertFalse(self.sw.speaker_list[1].calibrated)
+
+
+    def test_calc_offset_removes_applied_gain(self):
+        # Measured with saved offsets of 0 and -2 dB applied
+        self.sw.calc_offset(channel=[0, 1], slm_level=[70, 70],
+                            applied_db=[0.0, -2.0])
+        np.testing.assert_allclose(self.sw.offsets[:2], [0, -2])
+        self.assertEqual(self.sw.speaker_list[1].slm_level, 72)
+
+
+    def test_bulk_calc_offset(self):
+        self.sw.calc_offset(channel=np.arange(4),
+                            slm_level=[70, 71, 69.5, 70])
+        np.testing.assert_allclose(self.sw.offsets, [0, -1, 0.5, 0])
+        self.assertTrue(self.sw.calibrated.all())
+        self.assertEqual(self.sw.num_missing, 0)
+
+
+    def test_missing_count_is_incremental(self):
+        self.assertEqual(self.sw.num_missing, 4)
+        self.sw.calc_offset(channel=0, slm_level=70)
+        self.assertEqual(self.sw.num_missing, 3)
+        # Remeasuring a speaker does not change the count
+        self.sw.calc_offset(channel=0, slm_level=71)
+        self.sw.calc_offset(channel=[1, 1], slm_level=[70, 70])
+        self.assertEqual(self.sw.num_missing, 2)
+        self.assertEqual(self.sw.check_for_missing_offsets(), [2, 3])
+
+
+    def test_non_finite_level_raises(self):
+        self.sw.calc_offset(channel=0, slm_level=70)
+        for level in [None, np.nan, [70, np.inf]]:
+            with self.assertRaises(ValueError):
+                self.sw.calc_offset(channel=[1, 2], slm_level=level)
+        self.assertEqual(self.sw.check_for_missing_offsets(), [1, 2, 3])
+        self.assertEqual(self.sw.num_missing, 3)
+        # A bad reference does not replace the good one
+        with self.assertRaises(ValueError):
+            self.sw.calc_offset(channel=0, slm_level=None)
+        self.assertEqual(self.sw.ref_level, 70)
+
+
+    def test_empty_channels_do_nothing(self):
+        self.sw.calc_offset(channel=np.array([], dtype=int), slm_level=[])
+        self.assertIsNone(self.sw.ref_level)
+        self.assertEqual(self.sw.num_missing, 4)
+
+
+    def test_invalid_channel_raises(self):
+        with self.assertRaises(IndexError):
+            self.sw.calc_offset(channel=4, slm_level=70)
+
+
+    def test_get_data(self):
+        self.sw.calc_offset(channel=0, slm_level=70)
+        self.sw.calc_offset(channel=1, slm_level=75)
+        self.assertEqual(self.sw.get_data(),
+                         {0: 0.0, 1: -5.0, 2: None, 3: None})
+
+
+    def test_large_array(self):
+        sw = speakermodel.SpeakerWrangler(num_speakers=512)
+        levels = np.linspace(60, 80, 512)
+        sw.calc_offset(channel=np.arange(512), slm_level=levels)
+        np.testing.assert_allclose(sw.offsets, np.round(60 - levels, 1))
+        self.assertEqual(sw.check_for_missing_offsets(), [])
+        self.assertEqual(len(sw.get_data()), 512)
+
+
+if __name__ == '__main__':
+    unittest.main()
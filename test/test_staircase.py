@@ -10,7 +10,9 @@
 ###########
 # Import testing packages
 from unittest import TestCase
-from unittest import mock
+
+# Import data science packages
+import numpy as np
 
 # Import custom modules
 from models import staircase
@@ -54,6 +56,12 @@ class TestStaircase(TestCase):
         del self.s_rapid
 
 
+    def _add_reversals(self, stair, num):
+        """ Add NUM reversal data points to STAIR's DataWrangler. """
+        for _ in range(num):
+            stair.dw.new_data_point().reversal = True
+
+
     ########################
     # INITIALIZATION TESTS #
     ########################
@@ -134,11 +142,10 @@ class TestStaircase(TestCase):
     #################
     # RAPID DESCEND #
     #################
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__check_up_down_rule_no_reversals(self, mock_reversals):
+    def test__check_up_down_rule_no_reversals(self):
         """ Check that up/down/nBack values == 1/1/2 """
         # Force number of reversals to 0
-        mock_reversals.return_value = []
+        self._add_reversals(self.s_rapid, 0)
 
         # Call function
         self.s_rapid._check_up_down_rule()
@@ -149,11 +156,10 @@ class TestStaircase(TestCase):
         self.assertEqual(self.s_rapid._n_back, 2)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__check_up_down_rule_one_reversal(self, mock_reversals):
+    def test__check_up_down_rule_one_reversal(self):
         """ Check that up/down/nBack values == 1/2/3 """
         # Force number of reversals to 1
-        mock_reversals.return_value = [1]
+        self._add_reversals(self.s_rapid, 1)
 
         # Call function
         self.s_rapid._check_up_down_rule()
@@ -164,11 +170,10 @@ class TestStaircase(TestCase):
         self.assertEqual(self.s_rapid._n_back, 3)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__check_up_down_rule_two_reversals(self, mock_reversals):
+    def test__check_up_down_rule_two_reversals(self):
         """ Check that up/down/nBack values == 1/2/3 """
         # Force number of reversals to 2
-        mock_reversals.return_value = [1, 1]
+        self._add_reversals(self.s_rapid, 2)
 
         # Call function
         self.s_rapid._check_up_down_rule()
@@ -354,10 +359,9 @@ class TestStaircase(TestCase):
     #######################
     # calc_next_step_size #
     #######################
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__calc_next_step_size_no_reversals(self, mock_reversals):
+    def test__calc_next_step_size_no_reversals(self):
          # Force no reversals
-         mock_reversals.return_value = []
+         self._add_reversals(self.s, 0)
 
         # Calculate next step size
          self.s._calc_next_step_size()
@@ -366,10 +370,9 @@ class TestStaircase(TestCase):
          self.assertEqual(self.s._step_index, 0)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__calc_next_step_size_one_reversal(self, mock_reversals):
+    def test__calc_next_step_size_one_reversal(self):
          # Force one reversal
-         mock_reversals.return_value = [1]
+         self._add_reversals(self.s, 1)
 
         # Calculate next step size
          self.s._calc_next_step_size()
@@ -378,10 +381,9 @@ class TestStaircase(TestCase):
          self.assertEqual(self.s._step_index, 1)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__calc_next_step_size_two_reversals(self, mock_reversals):
+    def test__calc_next_step_size_two_reversals(self):
          # Force two reversals
-         mock_reversals.return_value = [1, 1]
+         self._add_reversals(self.s, 2)
 
         # Calculate next step size
          self.s._calc_next_step_size()
@@ -478,10 +480,9 @@ class TestStaircase(TestCase):
         self.assertEqual(self.s._trial_num, 2)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__check_for_end_of_staircase_trials_pass(self, mock_reversals):
+    def test__check_for_end_of_staircase_trials_pass(self):
         # No reversals
-        mock_reversals.return_value = []
+        self._add_reversals(self.s, 0)
 
         # Trials stopping rule met
         self.s._trial_num = 100
@@ -491,10 +492,9 @@ class TestStaircase(TestCase):
         self.assertEqual(self.s.status, True)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__check_for_end_of_staircase_reversals_pass(self, mock_reversals):
+    def test__check_for_end_of_staircase_reversals_pass(self):
         # Reversal stopping rule met
-        mock_reversals.return_value = [1,1,1,1]
+        self._add_reversals(self.s, 4)
 
         # Trials do not meet rule
         self.s._trial_num = 1
@@ -504,10 +504,9 @@ class TestStaircase(TestCase):
         self.assertEqual(self.s.status, True)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__check_for_end_of_staircase_neither_pass(self, mock_reversals):
+    def test__check_for_end_of_staircase_neither_pass(self):
         # Reversal do not meet rule
-        mock_reversals.return_value = [1]
+        self._add_reversals(self.s, 1)
 
         # Trials do not meet rule
         self.s._trial_num = 1
@@ -517,10 +516,9 @@ class TestStaircase(TestCase):
         self.assertEqual(self.s.status, True)
 
 
-    @mock.patch('models.staircase.DataWrangler._get_reversals')
-    def test__check_for_end_of_staircase_both_pass(self, mock_reversals):
+    def test__check_for_end_of_staircase_both_pass(self):
         # Reversal do not meet rule
-        mock_reversals.return_value = [1, 1, 1, 1]
+        self._add_reversals(self.s, 4)
 
         # Trials do not meet rule
         self.s._trial_num = 100
@@ -847,6 +845,75 @@ class TestDataWrangler(TestCase):
         self.assertEqual(len(reversals), 2)
 
 
+    def test_counters_match_filters(self):
+        self.assertEqual(self.dw_full.num_correct, 5)
+        self.assertEqual(self.dw_full.num_incorrect, 2)
+        self.assertEqual(self.dw_full.num_reversals, 2)
+
+
+    def test_counters_follow_changes(self):
+        # Change a response and a reversal after they were set
+        self.dw_full.datapoints[0].response = -1
+        self.dw_full.datapoints[2].reversal = False
+        self.dw_full.datapoints[3].reversal = True
+        self.assertEqual(self.dw_full.num_correct, 4)
+        self.assertEqual(self.dw_full.num_incorrect, 3)
+        self.assertEqual(
+            [dp.trial_number for dp in self.dw_full._get_reversals()], [3, 5])
+        self.assertEqual(
+            [dp.trial_number for dp in self.dw_full._get_incorrect()], 
+            [0, 2, 4])
+
+
+    def test_staircase_counts_reversals(self):
+        stair = staircase.Staircase(start_val=60, step_sizes=[8, 4], nUp=1, 
+            nDown=2, nTrials=10, nReversals=2, rapid_descend=False, 
+            min_val=50, max_val=80)
+        for response in [1, 1, -1, 1, 1, -1, -1]:
+            stair.add_response(response)
+        self.assertEqual(stair.dw.num_reversals, 
+                         len([dp for dp in stair.dw.datapoints 
+                              if dp.reversal]))
+        self.assertEqual(stair.dw.num_correct, 4)
+        self.assertEqual(stair.dw.num_incorrect, 3)
+
+
+    def test_columns_grow(self):
+        dw = staircase.DataWrangler(capacity=2)
+        for ii in range(5):
+            dp = dw.new_data_point()
+            dp.trial_number = ii
+            dp.level = 60 + ii
+        self.assertEqual(len(dw.datapoints), 5)
+        np.testing.assert_array_equal(dw.columns()['level'], 
+                                      [60, 61, 62, 63, 64])
+        self.assertIsNone(dw.datapoints[-1].response)
+
+
+    def test_filtered_columns(self):
+        cols = self.dw_full.columns('reversal')
+        np.testing.assert_array_equal(cols['trial_number'], [2, 5])
+        np.testing.assert_array_equal(cols['level'], [76, 72])
+        np.testing.assert_array_equal(self.dw_full.mask('incorrect'),
+            [False, False, True, False, True, False, False])
+
+
+    def test_to_numpy_shares_memory(self):
+        cols = self.dw_full.to_numpy()
+        self.assertEqual(len(cols['response']), 7)
+        self.assertTrue(np.shares_memory(cols['level'], self.dw_full._level))
+        # Writes through a DataPoint show up in the view
+        self.dw_full.datapoints[0].level = 50
+        self.assertEqual(cols['level'][0], 50)
+
+
+    def test_to_dataframe(self):
+        df = self.dw_full.to_dataframe()
+        self.assertEqual(list(df.columns), list(staircase.DataWrangler.COLUMNS))
+        self.assertEqual(list(df['response']), [1, 1, -1, 1, -1, 1, 1])
+        self.assertEqual(df['reversal'].sum(), 2)
+
+
     #######################
     # make_attribute_list #
     #######################
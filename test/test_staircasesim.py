@@ -0,0 +1,115 @@
+""" Unit tests for staircasesim.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import system packages
+import contextlib
+import io
+
+# Import custom modules
+from models import staircase
+from models import staircasesim
+
+
+#########
+# Begin #
+#########
+PARAMS = [
+    dict(start_val=60, step_sizes=[8, 4], nUp=1, nDown=2, nTrials=20,
+         nReversals=4, rapid_descend=True, min_val=40, max_val=80),
+    dict(start_val=60, step_sizes=[8, 4, 2], nUp=1, nDown=3, nTrials=30,
+         nReversals=6, rapid_descend=False, min_val=0, max_val=100),
+    dict(start_val=50, step_sizes=[5], nUp=1, nDown=1, nTrials=10,
+         nReversals=3, rapid_descend=True, min_val=45, max_val=55),
+    dict(start_val=70, step_sizes=[10, 5, 2], nUp=1, nDown=2, nTrials=15,
+         nReversals=5, rapid_descend=False, min_val=50, max_val=70),
+]
+
+
+class TestBatchStaircase(TestCase):
+    def run_scalar(self, params, responses):
+        """ Run a Staircase on RESPONSES until it stops. """
+        stair = staircase.Staircase(**params)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for response in responses:
+                if not stair.status:
+                    break
+                stair.add_response(int(response))
+        return stair
+
+
+    def test_matches_scalar_staircase(self):
+        rng = np.random.default_rng(1)
+        num, trials = 40, 120
+        for params in PARAMS:
+            with self.subTest(params=params):
+                responses = np.where(rng.random((num, trials)) < 0.7, 1, -1)
+                batch = staircasesim.BatchStaircase(num, **params)
+                for tt in range(trials):
+                    batch.add_responses(responses[:, tt])
+                estimates = batch.thresholds()
+
+                for ii in range(num):
+                    stair = self.run_scalar(params, responses[ii])
+                    cols = stair.dw.columns()
+                    count = len(cols['level'])
+
+                    self.assertEqual(batch.num_trials[ii], count)
+                    self.assertEqual(batch.status[ii], stair.status)
+                    self.assertEqual(batch.current_level[ii],
+                                     stair.current_level)
+                    np.testing.assert_array_equal(
+                        batch.levels[:count, ii], cols['level'])
+                    np.testing.assert_array_equal(
+                        batch.reversals[:count, ii], cols['reversal'] == 1)
+
+                    # Same estimate as plot_data
+                    rev = cols['level'][cols['reversal'] == 1]
+                    if len(rev):
+                        self.assertAlmostEqual(
+                            estimates[ii], np.mean(rev[-(len(rev) - 1):]))
+                    else:
+                        self.assertTrue(np.isnan(estimates[ii]))
+
+
+    def test_finished_staircases_are_frozen(self):
+        batch = staircasesim.BatchStaircase(2, **PARAMS[2])
+        batch.status[1] = False
+        batch.add_responses([1, 1])
+        self.assertEqual(batch.num_trials.tolist(), [1, 0])
+        self.assertEqual(batch.current_level[1], 50)
+        self.assertTrue(np.isnan(batch.levels[0, 1]))
+
+
+    def test_simulate_finds_threshold(self):
+        batch = staircasesim.BatchStaircase(
+            500, start_val=80, step_sizes=[8, 4, 2], nUp=1, nDown=2,
+            nTrials=40, nReversals=8, rapid_descend=True, min_val=0,
+            max_val=100, record=False)
+        estimates = batch.simulate(50, slope=1.0, seed=0)
+        self.assertFalse(batch.status.any())
+        # 1-up 2-down converges on 70.7% correct
+        target = 50 + np.log(0.707 / 0.293)
+        self.assertAlmostEqual(np.mean(estimates), target, delta=1.0)
+
+
+    def test_too_few_reversals_raises(self):
+        with self.assertRaises(ValueError):
+            with contextlib.redirect_stdout(io.StringIO()):
+                staircasesim.BatchStaircase(
+                    3, start_val=60, step_sizes=[8, 4, 2], nUp=1, nDown=2,
+                    nTrials=10, nReversals=2, rapid_descend=True,
+                    min_val=0, max_val=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
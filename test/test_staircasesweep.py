@@ -0,0 +1,89 @@
+""" Unit tests for staircasesweep.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import staircasesweep
+
+
+#########
+# Begin #
+#########
+BASE = dict(start_val=70, step_sizes=[8, 4, 2], nUp=1, nDown=2, nTrials=20,
+            nReversals=6, rapid_descend=True, min_val=0, max_val=100)
+
+
+class TestSummary(TestCase):
+    def test_merge_matches_pooled(self):
+        rng = np.random.default_rng(0)
+        errors = rng.normal(1, 2, 300)
+        trials = rng.integers(20, 60, 300)
+
+        pooled = staircasesweep.Summary()
+        pooled.add(errors, trials)
+        merged = staircasesweep.Summary()
+        for part in np.array_split(np.arange(300), [10, 150, 151]):
+            chunk = staircasesweep.Summary()
+            chunk.add(errors[part], trials[part])
+            merged.merge(chunk)
+
+        self.assertEqual(merged.count, 300)
+        self.assertAlmostEqual(merged.bias, np.mean(errors))
+        self.assertAlmostEqual(merged.variance, np.var(errors, ddof=1))
+        self.assertAlmostEqual(merged.trials_mean, np.mean(trials))
+        self.assertAlmostEqual(merged.trials_variance,
+                               np.var(trials, ddof=1))
+        self.assertAlmostEqual(merged.variance, pooled.variance)
+
+
+    def test_missing_estimates(self):
+        summary = staircasesweep.Summary()
+        summary.add([1.0, np.nan, 3.0], [10, 5, 30])
+        self.assertEqual(summary.count, 2)
+        self.assertEqual(summary.missing, 1)
+        self.assertEqual(summary.bias, 2.0)
+        self.assertEqual(summary.trials_mean, 20.0)
+
+
+class TestRunSweep(TestCase):
+    def test_make_grid(self):
+        grid = staircasesweep.make_grid(BASE, nDown=[2, 3],
+                                        start_val=[60, 70, 80])
+        self.assertEqual(len(grid), 6)
+        self.assertEqual(grid[-1]['nDown'], 3)
+        self.assertEqual(grid[-1]['start_val'], 80)
+        self.assertEqual(grid[-1]['nReversals'], 6)
+
+
+    def test_deterministic_across_workers(self):
+        grid = staircasesweep.make_grid(BASE, nDown=[2, 3])
+        kwargs = dict(num_listeners=250, chunk_size=100, seed=3)
+        serial = staircasesweep.run_sweep(grid, max_workers=1, **kwargs)
+        pooled = staircasesweep.run_sweep(grid, max_workers=2, **kwargs)
+        for a, b in zip(serial, pooled):
+            self.assertEqual(a.count + a.missing, 250)
+            self.assertEqual(a.count, b.count)
+            self.assertAlmostEqual(a.bias, b.bias)
+            self.assertAlmostEqual(a.variance, b.variance)
+            self.assertAlmostEqual(a.trials_mean, b.trials_mean)
+
+
+    def test_progress(self):
+        calls = []
+        staircasesweep.run_sweep([BASE], num_listeners=30, chunk_size=10,
+                                 max_workers=1,
+                                 progress=lambda *args: calls.append(args))
+        self.assertEqual(calls, [(1, 3), (2, 3), (3, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+""" Unit tests for stimulusbank.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import data science packages
+import numpy as np
+
+# Import custom modules
+from models import stimulusbank
+
+
+#########
+# Begin #
+#########
+class TestStimulusBank(TestCase):
+    def setUp(self):
+        self.bank = stimulusbank.StimulusBank()
+
+
+    def tearDown(self):
+        del self.bank
+
+
+    def test_first_request_is_miss(self):
+        self.bank.get('wgn', dur=0.1, fs=48000)
+        self.assertEqual(self.bank.misses, 1)
+        self.assertEqual(self.bank.hits, 0)
+
+
+    def test_repeat_request_is_hit_and_same_buffer(self):
+        a = self.bank.get('wgn', dur=0.1, fs=48000)
+        b = self.bank.get('wgn', dur=0.1, fs=48000)
+        self.assertIs(a, b)
+        self.assertEqual(self.bank.hits, 1)
+        self.assertEqual(self.bank.misses, 1)
+
+
+    def test_key_includes_all_parameters(self):
+        self.bank.get('wgn', dur=0.1, fs=48000)
+        self.bank.get('wgn', dur=0.2, fs=48000)
+        self.bank.get('wgn', dur=0.1, fs=44100)
+        self.bank.get('wgn', dur=0.1, fs=48000, seed=5)
+        self.bank.get('wgn', dur=0.1, fs=48000, num_channels=2)
+        self.assertEqual(self.bank.misses, 5)
+        self.assertEqual(self.bank.hits, 0)
+
+
+    def test_cached_signal_is_read_only(self):
+        sig = self.bank.get('wgn', dur=0.1, fs=48000)
+        with self.assertRaises(ValueError):
+            sig[0] = 0
+
+
+    def test_lru_eviction_within_budget(self):
+        # Each signal is 4800 float32 samples (19,200 bytes)
+        self.bank.max_bytes = 2 * 4800 * 4
+        self.bank.get('wgn', dur=0.1, fs=48000, seed=1)
+        self.bank.get('wgn', dur=0.1, fs=48000, seed=2)
+        # Touch seed 1 so seed 2 becomes least recently used
+        self.bank.get('wgn', dur=0.1, fs=48000, seed=1)
+        self.bank.get('wgn', dur=0.1, fs=48000, seed=3)
+
+        self.assertEqual(self.bank.evictions, 1)
+        self.assertLessEqual(self.bank.nbytes, self.bank.max_bytes)
+        self.bank.get('wgn', dur=0.1, fs=48000, seed=1)
+        self.assertEqual(self.bank.hits, 2)
+        self.bank.get('wgn', dur=0.1, fs=48000, seed=2)
+        self.assertEqual(self.bank.misses, 4)
+
+
+    def test_oversized_signal_not_cached(self):
+        self.bank.max_bytes = 100
+        self.bank.get('wgn', dur=0.1, fs=48000)
+        self.assertEqual(self.bank.stats()['entries'], 0)
+        self.assertEqual(self.bank.nbytes, 0)
+
+
+    def test_unknown_signal_type(self):
+        with self.assertRaises(ValueError):
+            self.bank.get('pink', dur=0.1, fs=48000)
+
+
+    def test_clear_keeps_counters(self):
+        self.bank.get('wgn', dur=0.1, fs=48000)
+        self.bank.clear()
+        stats = self.bank.stats()
+        self.assertEqual(stats['entries'], 0)
+        self.assertEqual(stats['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,14 +7,11 @@
 import unittest
 from unittest.mock import patch, mock_open
 
-# Import GUI packages
-import tkinter as tk
-
 # Import misc packages
 import random
 
 # Import custom modules
-from models.stimulusmodel import StimulusModel
+from models.stimulusmodel import StimulusModel, StimulusParams
 
 
 #########
@@ -28,9 +25,6 @@ class TestStimulusModel(unittest.TestCase):
         """ Create necessary mocks and variables. Automatically 
             runs before each test. 
         """
-        # Need a root for tk variables to work
-        self.root = tk.Tk()
-
         # Mock file with data
         self.fake_data_file = mock_open(
             read_data=(
@@ -40,31 +34,30 @@ class TestStimulusModel(unittest.TestCase):
             )
         )
 
-        # Fake sessionpars
-        self.sessionpars = {
-            'matrix_file_path': tk.StringVar(value='mock_matrix.csv'),
-            'audio_files_dir': tk.StringVar(value='sample_audio_dir'),
-            'repetitions': tk.IntVar(value=2),
-            'randomize': tk.IntVar(value=0)
-        }
+        # Parameters
+        self.params = StimulusParams(
+            matrix_file_path='mock_matrix.csv',
+            audio_files_dir='sample_audio_dir',
+            repetitions=2,
+            randomize=0
+        )
 
 
     def tearDown(self):
         """ Delete objects from setUp. Automatically runs
             after each test.
         """
-        del self.root
         del self.fake_data_file
-        del self.sessionpars
+        del self.params
 
 
     def test_import_matrix_file(self):
         """ Test whether mock matrix file is imported correctly.
         """
-        # Set sessionpars
-        sessionpars = self.sessionpars
+        # Set params
+        params = self.params
         reps = 10
-        sessionpars['repetitions'].set(reps)
+        params.repetitions = reps
 
         # Expected output after adding audio paths
         expected_audio_names = [
@@ -78,7 +71,7 @@ class TestStimulusModel(unittest.TestCase):
         # Create class instance and test
         with patch('builtins.open', self.fake_data_file):
             # Create an instance of StimulusModel
-            stimulus_model = StimulusModel(sessionpars)
+            stimulus_model = StimulusModel(params)
 
             # Make sure '_matrix_file' attribute was created
             self.assertIsNotNone(stimulus_model._matrix_file)
@@ -100,16 +93,16 @@ class TestStimulusModel(unittest.TestCase):
 
     def test__randomize_called(self):
         """ _randomized should be called when 
-            sessionpars['randomize'] == 1
+            params.randomize == 1
         """
-        # Set sessionpars
-        sessionpars = self.sessionpars
-        sessionpars['randomize'].set(1)
+        # Set params
+        params = self.params
+        params.randomize = 1
 
         # Create class instance and test
         with patch('builtins.open', self.fake_data_file):
             with patch('random.shuffle') as fake_shuffle:
-                stimulus_model = StimulusModel(sessionpars)
+                stimulus_model = StimulusModel(params)
 
                 # Test that _randomize was called
                 fake_shuffle.assert_called_once()
@@ -117,16 +110,16 @@ class TestStimulusModel(unittest.TestCase):
 
     def test__randomize_not_called(self):
         """ _randomized should NOT be called when 
-            sessionpars['randomize'] == 0
+            params.randomize == 0
         """
-        # Set sessionpars
-        sessionpars = self.sessionpars
-        sessionpars['randomize'].set(0)
+        # Set params
+        params = self.params
+        params.randomize = 0
 
         # Create class instance and test
         with patch('builtins.open', self.fake_data_file):
             with patch('random.shuffle') as fake_shuffle:
-                stimulus_model = StimulusModel(sessionpars)
+                stimulus_model = StimulusModel(params)
 
                 # Test that _randomize was not called
                 fake_shuffle.assert_not_called()
@@ -136,14 +129,14 @@ class TestStimulusModel(unittest.TestCase):
         """ Test that repetitions of '0' or 'None' are
             converted to '1'.
         """
-        # Set sessionpars
-        sessionpars = self.sessionpars
-        sessionpars['randomize'].set(0)
-        sessionpars['repetitions'].set(0)
+        # Set params
+        params = self.params
+        params.randomize = 0
+        params.repetitions = 0
 
         # Create class instance and test
         with patch('builtins.open', self.fake_data_file):
-            stimulus_model = StimulusModel(sessionpars)
+            stimulus_model = StimulusModel(params)
 
             self.assertEqual(stimulus_model.matrix.shape, (2,2))
 
@@ -152,17 +145,17 @@ class TestStimulusModel(unittest.TestCase):
         """ Test whether the presentation levels are in 
             a given order after randomizing with a set seed.
         """
-        # Modify sessionpars to set repetitions and enable randomization
-        sessionpars = self.sessionpars
-        sessionpars['repetitions'].set(3)
-        sessionpars['randomize'].set(1)
+        # Modify params to set repetitions and enable randomization
+        params = self.params
+        params.repetitions = 3
+        params.randomize = 1
 
         # Create local random number generator with fixed seed
         rng = random.Random(40)
 
         with patch('builtins.open', self.fake_data_file):
             with patch('random.shuffle', side_effect=lambda x, r=rng: r.shuffle(x)):
-                stimulus_model = StimulusModel(sessionpars)
+                stimulus_model = StimulusModel(params)
                 
                 self.assertEqual(stimulus_model.matrix.iloc[:,1].tolist(), [70,70,75,70,75,75])
 
@@ -0,0 +1,378 @@
+""" Unit tests for streammodel.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+from unittest import mock
+
+# Import data science packages
+import numpy as np
+
+# Import audio packages
+import soundfile as sf
+
+# Import system packages
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Import custom modules
+from models import streammodel
+from exceptions import audio_exceptions
+
+
+#########
+# Begin #
+#########
+class TestStreamEngine(TestCase):
+    def setUp(self):
+        self.engine = streammodel.StreamEngine(backend='null', 
+            blocksize=256, null_outputs=8)
+        self.time_info = SimpleNamespace(currentTime=0.0, 
+            outputBufferDacTime=0.005)
+
+
+    def tearDown(self):
+        self.engine.close()
+        del self.engine
+
+
+    def _pause_stream(self):
+        """ Open the stream, then stop its thread so the callback 
+            can be driven manually.
+        """
+        self.engine.open(None, 48000)
+        self.engine.stream.stop()
+
+
+    def _pull(self, frames=256):
+        out = np.full((frames, 8), np.nan, dtype=np.float32)
+        self.engine._callback(out, frames, self.time_info, None)
+        return out
+
+
+    def test_stream_stays_open_between_presentations(self):
+        sig = np.ones(100, dtype=np.float32)
+        self.engine.play(sig, 48000, None, [1])
+        stream = self.engine.stream
+        self.engine.play(sig, 48000, None, [2])
+        self.assertIs(self.engine.stream, stream)
+
+
+    def test_stream_reopens_on_new_sampling_rate(self):
+        sig = np.ones(100, dtype=np.float32)
+        self.engine.play(sig, 48000, None, [1])
+        stream = self.engine.stream
+        self.engine.play(sig, 44100, None, [1])
+        self.assertIsNot(self.engine.stream, stream)
+        self.assertTrue(stream.closed)
+
+
+    def test_idle_callback_writes_silence(self):
+        self._pause_stream()
+        out = self._pull()
+        np.testing.assert_array_equal(out, 0)
+
+
+    def test_routing_and_gain(self):
+        self._pause_stream()
+        sig = np.ones((300, 2), dtype=np.float32)
+        sig[:, 1] = 2
+        self.engine.play(sig, 48000, None, [3, 6], gain=0.5)
+        out = self._pull()
+        np.testing.assert_array_equal(out[:, 2], 0.5)
+        np.testing.assert_array_equal(out[:, 5], 1.0)
+        np.testing.assert_array_equal(out[:, [0, 1, 3, 4, 6, 7]], 0)
+
+
+    def test_last_block_is_zero_padded_and_finishes(self):
+        self._pause_stream()
+        sig = np.ones(300, dtype=np.float32)
+        self.engine.play(sig, 48000, None, [1])
+        self._pull()
+        self.assertFalse(self.engine.finished.is_set())
+        out = self._pull()
+        np.testing.assert_array_equal(out[:44, 0], 1)
+        np.testing.assert_array_equal(out[44:, 0], 0)
+        self.assertTrue(self.engine.finished.is_set())
+
+
+    def test_set_gain_and_routing_while_playing(self):
+        self._pause_stream()
+        sig = np.ones(1000, dtype=np.float32)
+        self.engine.play(sig, 48000, None, [1])
+        self._pull()
+        self.engine.set_gain(0.25)
+        self.engine.set_routing([4])
+        out = self._pull()
+        np.testing.assert_array_equal(out[:, 0], 0)
+        np.testing.assert_array_equal(out[:, 3], 0.25)
+
+
+    def test_stop_silences_output(self):
+        self._pause_stream()
+        self.engine.play(np.ones(1000), 48000, None, [1])
+        self.engine.stop()
+        np.testing.assert_array_equal(self._pull(), 0)
+        self.assertTrue(self.engine.wait(0))
+
+
+    def test_latency_is_measured(self):
+        sig = np.ones(480, dtype=np.float32)
+        self.engine.play(sig, 48000, None, [1])
+        self.assertTrue(self.engine.wait(2))
+        self.assertIsNotNone(self.engine.last_latency)
+        self.assertGreater(self.engine.last_latency, 0)
+
+
+    def test_latency_history_is_bounded(self):
+        with mock.patch.object(streammodel.StreamEngine, 'MAX_LATENCIES', 3):
+            engine = streammodel.StreamEngine(backend='null')
+        engine.latencies.extend(range(10))
+        self.assertEqual(list(engine.latencies), [7, 8, 9])
+        self.assertEqual(engine.last_latency, 9)
+
+
+    def test_channel_gains_on_consecutive_outputs(self):
+        self._pause_stream()
+        self.engine.set_channel_gains(np.array([1, 0.5, 0.25, 2], 
+                                               dtype=np.float32))
+        sig = np.ones((300, 4), dtype=np.float32)
+        self.engine.play(sig, 48000, None, [2, 3, 4], gain=0.5)
+        out = self._pull()
+        np.testing.assert_array_equal(out[:, 1], 0.25)
+        np.testing.assert_array_equal(out[:, 2], 0.125)
+        np.testing.assert_array_equal(out[:, 3], 1.0)
+        np.testing.assert_array_equal(out[:, [0, 4, 5, 6, 7]], 0)
+
+
+    def test_channel_gains_on_scattered_outputs(self):
+        self._pause_stream()
+        self.engine.set_channel_gains(np.array([0.5, 1, 1, 1, 1, 0.1]))
+        sig = np.ones((1000, 2), dtype=np.float32)
+        self.engine.play(sig, 48000, None, [6, 1])
+        out = self._pull()
+        np.testing.assert_allclose(out[:, 5], 0.1)
+        np.testing.assert_array_equal(out[:, 0], 0.5)
+        # Clearing the gains applies to the current presentation
+        self.engine.set_channel_gains(None)
+        out = self._pull()
+        np.testing.assert_array_equal(out[:, [0, 5]], 1)
+
+
+    def test_routing_gains_beyond_vector(self):
+        self.engine.set_channel_gains(np.array([0.5], dtype=np.float32))
+        np.testing.assert_array_equal(
+            self.engine.routing_gains([1, 2, 8]), [0.5, 1, 1])
+
+
+    def test_invalid_routing(self):
+        sig = np.ones((100, 2), dtype=np.float32)
+        with self.assertRaises(audio_exceptions.InvalidRouting):
+            self.engine.play(sig, 48000, None, [1, 2, 3])
+        with self.assertRaises(audio_exceptions.InvalidRouting):
+            self.engine.play(sig, 48000, None, [1, 9])
+
+
+
+class TestFileSource(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'stim.wav')
+        rng = np.random.default_rng(0)
+        self.data = rng.uniform(-0.5, 0.5, (10000, 3)).astype(np.float32)
+        self.data[1234, 2] = -0.75
+        sf.write(self.path, self.data, 48000, subtype='FLOAT')
+        self.source = streammodel.FileSource(self.path, blocksize=1000, 
+                                             num_blocks=16)
+
+
+    def tearDown(self):
+        self.source.close()
+        self.tmpdir.cleanup()
+
+
+    def _read_all(self, frames):
+        """ Read the whole file in FRAMES-sized requests once the 
+            reader thread has queued every block (no underruns).
+        """
+        self.source._thread.join()
+        blocks = []
+        while not self.source.done:
+            blocks.append(self.source.read(frames).copy())
+        self.assertEqual(self.source.underruns, 0)
+        return np.concatenate(blocks)
+
+
+    def test_file_details(self):
+        self.assertEqual(self.source.fs, 48000)
+        self.assertEqual(self.source.num_channels, 3)
+        self.assertEqual(self.source.shape, (10000, 3))
+
+
+    def test_read_returns_file_contents(self):
+        self.source.start()
+        np.testing.assert_array_equal(self._read_all(512), self.data)
+
+
+    def test_restart_reads_from_beginning(self):
+        self.source.start()
+        self.source.read(10)
+        self.source.start()
+        np.testing.assert_array_equal(self._read_all(1500), self.data)
+
+
+    def test_queue_is_bounded(self):
+        self.source.num_blocks = 4
+        self.source.start()
+        time.sleep(0.05)
+        self.assertLessEqual(self.source._queue.qsize(), 4)
+
+
+    def test_peak(self):
+        self.assertAlmostEqual(self.source.peak(), 0.75)
+
+
+    def test_peak_is_cached_by_file(self):
+        self.source.peak()
+        # A new source for the same file does not scan it again
+        source = streammodel.FileSource(self.path)
+        with mock.patch.object(streammodel.sf, 'SoundFile') as fake:
+            self.assertAlmostEqual(source.peak(), 0.75)
+            fake.assert_not_called()
+        # Changing the file invalidates the cached peak
+        self.data[0, 0] = 0.9
+        sf.write(self.path, self.data, 48000, subtype='FLOAT')
+        os.utime(self.path, ns=(0, 0))
+        self.assertAlmostEqual(source.peak(), 0.9)
+
+
+    def test_file_is_closed_after_reading(self):
+        opened = []
+        soundfile = sf.SoundFile
+        def _open(*args, **kwargs):
+            opened.append(soundfile(*args, **kwargs))
+            return opened[-1]
+        with mock.patch.object(streammodel.sf, 'SoundFile', _open):
+            self.source.start()
+            self._read_all(1000)
+            self.assertTrue(opened[-1].closed)
+            # Stopping part way through also closes the file
+            self.source.start()
+            self.source.stop()
+            self.assertTrue(opened[-1].closed)
+
+
+    def test_engine_streams_file(self):
+        engine = streammodel.StreamEngine(backend='null', blocksize=256, 
+                                          null_outputs=3)
+        engine.open(None, 48000)
+        engine.stream.stop()
+        engine.play(self.source, 48000, None, [1, 2, 3], gain=2)
+        time_info = SimpleNamespace(currentTime=0.0, 
+            outputBufferDacTime=0.0)
+        out = []
+        while not engine.finished.is_set():
+            time.sleep(0.001)
+            block = np.zeros((256, 3), dtype=np.float32)
+            engine._callback(block, 256, time_info, None)
+            out.append(block)
+        out = np.concatenate(out)
+        # Drop silent blocks written while waiting for the reader
+        out = out[np.any(out != 0, axis=1)]
+        np.testing.assert_allclose(out[:len(self.data)], self.data * 2)
+        engine.close()
+
+
+class TestSequenceSource(TestCase):
+    def setUp(self):
+        self.signal = np.arange(1, 11, dtype=np.float32)
+        self.source = streammodel.SequenceSource(
+            self.signal, fs=1000, num_slots=3, gap=0.005)
+
+
+    def tearDown(self):
+        del self.source
+
+
+    def _read_all(self, frames):
+        self.source.start()
+        out = []
+        while not self.source.done:
+            out.append(self.source.read(frames).copy())
+        return np.concatenate(out)
+
+
+    def test_length_is_slots_times_duration_plus_gap(self):
+        self.assertEqual(self.source.slot_frames, 15)
+        self.assertEqual(self.source.frames, 45)
+        self.assertEqual(self.source.shape, (45, 3))
+
+
+    def test_blocks_match_full_sequence(self):
+        expected = self.source.load()
+        for slot in range(3):
+            np.testing.assert_array_equal(
+                expected[slot * 15:slot * 15 + 10, slot], self.signal)
+        self.assertEqual(np.count_nonzero(expected), 30)
+        # Block sizes that do and do not line up with slots
+        for frames in [1, 7, 15, 64]:
+            np.testing.assert_array_equal(self._read_all(frames), expected)
+
+
+    def test_current_slot(self):
+        self.source.start()
+        self.assertEqual(self.source.current_slot, 0)
+        self.source.read(16)
+        self.assertEqual(self.source.current_slot, 1)
+        self.source.read(100)
+        self.assertTrue(self.source.done)
+        self.assertEqual(self.source.current_slot, 2)
+
+
+    def test_start_slot(self):
+        self.source.start_slot = 1
+        self.source.start()
+        self.assertEqual(self.source.current_slot, 1)
+        self.assertAlmostEqual(self.source.remaining, 0.03)
+        out = []
+        while not self.source.done:
+            out.append(self.source.read(7).copy())
+        np.testing.assert_array_equal(np.concatenate(out),
+                                      self.source.load()[15:])
+
+
+    def test_ramps(self):
+        source = streammodel.SequenceSource(
+            np.ones(100), fs=1000, num_slots=1, ramp=0.01)
+        self.assertEqual(source.signal[0], 0)
+        self.assertEqual(source.signal[-1], 0)
+        self.assertTrue(np.all(source.signal[10:90] == 1))
+        self.assertAlmostEqual(source.peak(), 1.0)
+
+
+    def test_engine_plays_sequence_continuously(self):
+        engine = streammodel.StreamEngine(backend='null', blocksize=16,
+                                          null_outputs=3)
+        engine.open(None, 1000)
+        engine.stream.stop()
+        engine.play(self.source, 1000, None, [1, 2, 3], gain=2)
+        time_info = SimpleNamespace(currentTime=0.0,
+            outputBufferDacTime=0.0)
+        out = []
+        while not engine.finished.is_set():
+            block = np.zeros((16, 3), dtype=np.float32)
+            engine._callback(block, 16, time_info, None)
+            out.append(block)
+        out = np.concatenate(out)
+        np.testing.assert_array_equal(out[:45], self.source.load() * 2)
+        engine.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+""" Unit tests for uidispatcher.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+
+# Import system packages
+import threading
+
+# Import custom modules
+from models import uidispatcher
+
+
+#########
+# Begin #
+#########
+class FakeRoot:
+    """ Stand-in for a Tk root: after() callbacks run when tick()
+        is called.
+    """
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+
+    def after(self, ms, func):
+        self._next_id += 1
+        self.pending[self._next_id] = func
+        return self._next_id
+
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+
+    def tick(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+
+class TestUIDispatcher(TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.ui = uidispatcher.UIDispatcher(self.root, max_per_tick=3)
+        self.ui.start()
+
+
+    def tearDown(self):
+        del self.ui
+
+
+    def test_posted_calls_run_on_tick(self):
+        calls = []
+        future = self.ui.post(calls.append, 1)
+        self.assertEqual(calls, [])
+        self.root.tick()
+        self.assertEqual(calls, [1])
+        self.assertTrue(future.done())
+
+
+    def test_calls_from_worker_thread_run_in_order(self):
+        calls = []
+        worker = threading.Thread(
+            target=lambda: [self.ui.post(calls.append, ii) for ii in range(5)])
+        worker.start()
+        worker.join()
+        self.root.tick()
+        self.root.tick()
+        self.assertEqual(calls, [0, 1, 2, 3, 4])
+
+
+    def test_rate_is_bounded(self):
+        calls = []
+        for ii in range(7):
+            self.ui.post(calls.append, ii)
+        self.root.tick()
+        self.assertEqual(len(calls), 3)
+        self.root.tick()
+        self.root.tick()
+        self.assertEqual(len(calls), 7)
+
+
+    def test_call_waits_for_result(self):
+        result = []
+        worker = threading.Thread(
+            target=lambda: result.append(self.ui.call(sum, [1, 2, 3])))
+        worker.start()
+        while worker.is_alive():
+            self.root.tick()
+            worker.join(0.01)
+        self.assertEqual(result, [6])
+
+
+    def test_call_on_main_thread_runs_directly(self):
+        self.assertEqual(self.ui.call(len, 'abc'), 3)
+
+
+    def test_exception_is_set_on_future(self):
+        future = self.ui.post(int, 'x')
+        self.root.tick()
+        with self.assertRaises(ValueError):
+            future.result(0)
+        # The queue keeps draining after a failure
+        self.assertEqual(len(self.root.pending), 1)
+
+
+    def test_stop(self):
+        self.ui.stop()
+        self.assertEqual(self.root.pending, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+""" Unit tests for versionmodel.
+"""
+
+###########
+# Imports #
+###########
+# Import testing packages
+import unittest
+from unittest import TestCase
+from unittest import mock
+
+# Import system packages
+import json
+import os
+import tempfile
+import time
+
+# Import custom modules
+from models import versionmodel
+
+
+#########
+# Begin #
+#########
+class TestBackgroundVersionCheck(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.lib_path = os.path.join(self.tmpdir.name, 'library.csv')
+        with open(self.lib_path, 'w') as fh:
+            fh.write("name,version,mandatory\n")
+            fh.write("Speaker Balancer,2.1.0,no\n")
+        self.cache_path = os.path.join(self.tmpdir.name, 'version_check.json')
+
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+    def _make_check(self, **kwargs):
+        return versionmodel.BackgroundVersionCheck(
+            lib_path=self.lib_path,
+            app_name='Speaker Balancer',
+            app_version='2.0.0',
+            cache_path=self.cache_path,
+            **kwargs
+        )
+
+
+    def _wait(self, check):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            result = check.poll()
+            if result is not None:
+                return result
+            time.sleep(0.01)
+        self.fail("Version check did not finish")
+
+
+    def test_optional_update_found(self):
+        check = self._make_check()
+        check.start()
+        result = self._wait(check)
+        self.assertEqual(result.status, 'optional')
+        self.assertEqual(result.new_version, '2.1.0')
+        self.assertEqual(result.app_version, '2.0.0')
+
+
+    def test_result_is_cached(self):
+        check = self._make_check()
+        check.start()
+        self._wait(check)
+
+        with mock.patch('models.versionmodel.VersionChecker') as fake:
+            check = self._make_check()
+            check.start()
+            result = check.poll()
+            fake.assert_not_called()
+        self.assertEqual(result.status, 'optional')
+
+
+    def test_expired_cache_is_ignored(self):
+        check = self._make_check()
+        check.start()
+        self._wait(check)
+        with open(self.cache_path, 'r') as fh:
+            cached = json.load(fh)
+        cached['checked'] -= 10
+        with open(self.cache_path, 'w') as fh:
+            json.dump(cached, fh)
+
+        check = self._make_check(ttl=5)
+        check.start()
+        self.assertIsNotNone(check._thread)
+        self._wait(check)
+
+
+    def test_inaccessible_library_not_cached(self):
+        os.remove(self.lib_path)
+        check = self._make_check()
+        check.start()
+        self.assertEqual(self._wait(check).status, 'library_inaccessible')
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+    def test_unexpected_error_reported_as_inaccessible(self):
+        with mock.patch('models.versionmodel.VersionChecker', 
+                        side_effect=PermissionError("denied")):
+            check = self._make_check()
+            check.start()
+            self.assertEqual(self._wait(check).status, 'library_inaccessible')
+
+
+    def test_timeout(self):
+        def slow_checker(*args):
+            time.sleep(1)
+        with mock.patch('models.versionmodel.VersionChecker', 
+                        side_effect=slow_checker):
+            check = self._make_check(timeout=0.05)
+            check.start()
+            self.assertIsNone(check.poll())
+            time.sleep(0.1)
+            self.assertEqual(check.poll().status, 'timeout')
+
+
+if __name__ == '__main__':
+    unittest.main()
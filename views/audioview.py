@@ -79,6 +79,14 @@ class AudioDialog(tk.Toplevel):
         # Entry
         ttk.Entry(lfrm_routing, textvariable=self.routing_var, width=15
                   ).grid(column=10, row=5, sticky='w')
+
+        # Measurement microphone input (used by Auto Balance)
+        # Label
+        ttk.Label(lfrm_routing, text="Mic Input Channel:").grid(
+            column=5, row=7, padx=5, pady=(0,10), sticky='e')
+        # Entry
+        ttk.Entry(lfrm_routing, textvariable=self.sessionpars['mic_channel'],
+                  width=15).grid(column=10, row=7, pady=(0,10), sticky='w')
         
         # Display current audio device
         # Label
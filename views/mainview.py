@@ -139,6 +139,15 @@ class MainFrame(ttk.Frame):
         ##########################
         # Measured Level Widgets #
         ##########################
+        # Live level meter
+        ttk.Checkbutton(lfrm_slm, text="Live Mic Level",
+            variable=self._vars['live_meter'],
+            command=self._on_meter_toggle).grid(
+            column=5, columnspan=10, row=5, sticky='w', **options_small)
+        ttk.Label(lfrm_slm, textvariable=self._vars['meter_reading'],
+            style='Medium.TLabel').grid(
+            column=5, columnspan=10, row=10, **options_small)
+
         # SLM reading entry box
         ttk.Label(lfrm_slm, text="SLM Reading (dB):").grid(
             column=5, row=15, sticky='e', **options_small)
@@ -271,6 +280,22 @@ class MainFrame(ttk.Frame):
         self.label_list[speaker_num].configure(state=state)
 
 
+    def set_meter_state(self, live):
+        """ Show the live meter reading in the SLM reading entry
+            while the meter is running.
+        """
+        if live:
+            self.ent_slm.configure(state='readonly')
+        else:
+            self.ent_slm.configure(state='normal')
+            self._vars['meter_reading'].set("-- dB SPL")
+
+
+    def _on_meter_toggle(self):
+        """ Send live meter event to controller. """
+        self.event_generate('<<MainMeterToggle>>')
+
+
     def _on_save(self):
         """ Send save event to controller. """
         self.event_generate('<<MainSave>>')
@@ -64,6 +64,32 @@ class SessionDialog(tk.Toplevel):
         ttk.Label(frm_session, text="(Requires restart)"
             ).grid(row=5, column=15, sticky='w', padx=5)
 
+        # Auto balance analysis
+        ttk.Label(frm_session, text="Frequency Weighting:",
+            ).grid(row=10, column=5, sticky='e', **widget_options)
+        ttk.Combobox(frm_session, width=4, state='readonly',
+            values=['A', 'C', 'Z'],
+            textvariable=self.sessionpars['weighting']
+            ).grid(row=10, column=10, sticky='w')
+        ttk.Label(frm_session, text="Bands per Octave:",
+            ).grid(row=15, column=5, sticky='e', **widget_options)
+        ttk.Combobox(frm_session, width=4, state='readonly',
+            values=[1, 3],
+            textvariable=self.sessionpars['band_fraction']
+            ).grid(row=15, column=10, sticky='w')
+
+        # Gapless offset test
+        ttk.Label(frm_session, text="Gap Between Speakers (s):",
+            ).grid(row=20, column=5, sticky='e', **widget_options)
+        ttk.Entry(frm_session, width=6,
+            textvariable=self.sessionpars['test_gap']
+            ).grid(row=20, column=10, sticky='w')
+        ttk.Label(frm_session, text="Onset/Offset Ramp (s):",
+            ).grid(row=25, column=5, sticky='e', **widget_options)
+        ttk.Entry(frm_session, width=6,
+            textvariable=self.sessionpars['test_ramp']
+            ).grid(row=25, column=10, sticky='w')
+
 
         # ###################
         # # Audio Directory #